@@ -4,17 +4,136 @@ import json
 import uuid
 from datetime import datetime, timedelta
 import random
-from openai import OpenAI
+import threading
 from pathlib import Path
+import hashlib
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import calendar_scaffold
+import hashtag_engine
+import json_repair
+import keyword_index
+import metrics
+import prayer_times
+import scheduler
+import schemas
+import telemetry
+import tracing
+from singleflight import SingleFlight, normalize_topic
+
+
+class _LazyClient:
+    """Client OpenAI yang baru dibuat saat panggilan pertama.
+
+    Import `openai` (httpx, pydantic) memakan ratusan milidetik; perintah yang tidak
+    memanggil LLM (list, export, jobs, plan) tidak perlu menunggunya.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    # Dibungkus telemetri: latensi, token, biaya per panggilan
+                    self._client = telemetry.instrument(OpenAI(api_key=os.getenv("OPENAI_API_KEY")))
+        return getattr(self._client, name)
+
+
+# Inisialisasi client OpenAI (lazy, lihat _LazyClient)
+client = _LazyClient()
+
+MODEL = "gpt-4o-mini"
+# Naikkan setiap kali isi prompt berubah agar hasil lama tidak dibagikan ke prompt baru
+PROMPT_VERSION = 6
+
+# Batas output model; batch multi-topik disusun agar perkiraan output tetap di bawah batas ini
+MAX_OUTPUT_TOKENS = 16000
+BATCH_MAX_TOPICS = 10
+BATCH_TOKEN_HEADROOM = 0.75
+DEFAULT_OUTPUT_TOKENS = 2500
+# Perkiraan token output per topik, diperbarui dari usage setiap batch
+_output_token_estimates: Dict[str, float] = {}
+
+# Permintaan identik yang sedang berjalan (riset/produk topik populer) cukup satu panggilan LLM
+_inflight = SingleFlight()
+
+
+# Pengisi schemas.LOCAL_FIELDS per jenis produk, builder(data, topic, PromptSpec.local), dijalankan
+# sebelum validasi
+LOCAL_BUILDERS: Dict[str, Callable[[Dict[str, Any], str, Optional[Dict[str, Any]]], Any]] = {
+    "content_calendar": lambda data, topic, local: calendar_scaffold.build_content_calendar(data),
+    "hashtag_clusterer": hashtag_engine.fill_clusters,
+    "keyword_tracker": keyword_index.fill_keywords,
+    "ramadan_calendar": lambda data, topic, local: prayer_times.fill_ramadan_calendar(data),
+    "yearend_planner": lambda data, topic, local: calendar_scaffold.build_yearend_planner(data),
+}
+
+
+# Pemeriksa jumlah slot LLM terhadap kerangka lokal: jenis produk -> (field LLM, checker(data))
+SLOT_CHECKS: Dict[str, Tuple[str, Callable[[Dict[str, Any]], List[str]]]] = {
+    "content_calendar": ("weeks", calendar_scaffold.slot_errors),
+    "yearend_planner": ("monthly_breakdown", calendar_scaffold.yearend_slot_errors),
+}
+
+
+def slot_errors(product_type: str, data: Dict[str, Any]) -> List[str]:
+    """Slot LLM yang tidak cocok dengan kerangka lokal (mis. minggu/hari kalender atau bulan planner yang hilang)."""
+    check = SLOT_CHECKS.get(product_type)
+    return check[1](data) if check else []
+
+
+def complete_local(product_type: str, data: Dict[str, Any], topic: str,
+                   local: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Lengkapi respons LLM dengan field yang dihitung lokal (jadwal sholat, tanggal, cluster hashtag)."""
+    builder = LOCAL_BUILDERS.get(product_type)
+    if builder is not None:
+        builder(data, topic, local)
+    return data
+
+
+def unfilled_local(product_type: str, data: Dict[str, Any]) -> List[str]:
+    """Field lokal yang tidak bisa dihitung (mis. korpus hashtag belum menutupi topik)."""
+    return [f for f in schemas.LOCAL_FIELDS.get(product_type, ()) if f not in data]
+
+
+class SchemaError(ValueError):
+    """Respons LLM tidak sesuai schema produk."""
+
+    def __init__(self, product_type: str, errors: List[str]):
+        super().__init__(f"{product_type}: " + "; ".join(errors[:5]))
+        self.product_type = product_type
+        self.errors = errors
+
+
+class PromptSpec(NamedTuple):
+    system: str
+    user: str
+    temperature: float
+    # Hasil lokal yang dihitung saat prompt dibuat (di luar slot LLM) dan dipakai lagi oleh
+    # LOCAL_BUILDERS, agar data yang diisi sama dengan yang dirujuk prompt
+    local: Optional[Dict[str, Any]] = None
 
-# Inisialisasi client OpenAI
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 class AnalystAgent:
     """Agent untuk menganalisis topik dan mendeteksi sinyal pasar."""
     
+    @tracing.traced("llm.research", "topic")
     def research_topic(self, topic: str) -> str:
         """Melakukan riset mendalam pada sebuah topik menggunakan web search."""
+        key = ("research", normalize_topic(topic), MODEL, PROMPT_VERSION)
+        with telemetry.tags(operation="research", topic=topic):
+            report, shared = _inflight.do(key, lambda: self._research_topic(topic))
+        metrics.CACHE_REQUESTS.inc("llm_inflight", "hit" if shared else "miss")
+        metrics.SIGNALS_SCANNED.inc()
+        if shared:
+            print(f"🔗  AnalystAgent: Riset '{topic}' dibagi dari permintaan yang sedang berjalan.")
+        return report
+
+    def _research_topic(self, topic: str) -> str:
         system_prompt = (
             "You are an elite market research analyst focused on Indonesian digital products market. "
             "Analyze the given topic for business potential, demand signals, competition, and monetization opportunities. "
@@ -23,7 +142,7 @@ class AnalystAgent:
         
         print(f"🕵️  AnalystAgent: Researching '{topic}'...")
         resp = client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=MODEL,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": f"Research Indonesian market potential for: {topic}"}
@@ -34,11 +153,20 @@ class AnalystAgent:
         print("✅  AnalystAgent: Research complete.")
         return report_content
 
+    @tracing.traced("llm.score")
     def score_idea(self, report_content: str) -> int:
         """Memberi skor pada ide berdasarkan laporan riset."""
+        digest = hashlib.sha256(report_content.encode("utf-8")).hexdigest()
+        with telemetry.tags(operation="score"):
+            score, shared = _inflight.do(("score", digest, MODEL, PROMPT_VERSION), lambda: self._score_idea(report_content))
+        metrics.CACHE_REQUESTS.inc("llm_inflight", "hit" if shared else "miss")
+        metrics.IDEA_SCORE.observe(score)
+        return score
+
+    def _score_idea(self, report_content: str) -> int:
         print("⚖️  AnalystAgent: Scoring business idea...")
         resp = client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=MODEL,
             messages=[
                 {"role": "system", "content": "You are a Venture Capitalist evaluating Indonesian digital product ideas. Based on the research report, score the business potential from 0 to 100. Consider: market demand (40%), competition level (20%), monetization potential (20%), and ease of automation (20%). Return ONLY the number."},
                 {"role": "user", "content": report_content},
@@ -56,8 +184,13 @@ class AnalystAgent:
 class BuilderAgent:
     """Enhanced agent untuk membuat berbagai jenis produk digital."""
     
-    def generate_product_suite(self, suite_type: str, topic: str):
-        """Generate complete product suite."""
+    @tracing.traced("llm.suite", "suite_type", "topic")
+    def generate_product_suite(self, suite_type: str, topic: str, checkpoint=None):
+        """Generate complete product suite.
+        
+        Jika `checkpoint` diberikan, setiap produk disimpan begitu selesai dan produk
+        yang datanya sudah valid di checkpoint tidak di-generate ulang.
+        """
         
         suites = {
             "umkm_productivity": {
@@ -89,84 +222,262 @@ class BuilderAgent:
         results = {}
         
         for product_type in suite_config["products"]:
+            if checkpoint is not None:
+                saved = checkpoint.load(product_type)
+                if saved is not None:
+                    print(f"♻️  {product_type} diambil dari checkpoint, dilewati.")
+                    results[product_type] = saved
+                    continue
             print(f"🔨 Generating {product_type}...")
-            results[product_type] = self.generate_product_assets(topic, product_type)
+            with telemetry.tags(suite=suite_type):
+                results[product_type] = self.generate_product_assets(topic, product_type)
+            if checkpoint is not None:
+                checkpoint.save(product_type, results[product_type])
         
         return results, suite_config
 
-    def generate_product_assets(self, topic: str, product_type: str):
-        """Route to specific generator based on product type."""
+    def prompt_spec(self, topic: str, product_type: str) -> PromptSpec:
+        """Prompt (system, user, temperature) untuk satu produk."""
         
         generators = {
             # UMKM Productivity Suite
-            "content_calendar": self._generate_content_calendar,
-            "caption_bank": self._generate_caption_bank,
-            "invoice_macro": self._generate_invoice_macro,
+            "content_calendar": self._prompt_content_calendar,
+            "caption_bank": self._prompt_caption_bank,
+            "invoice_macro": self._prompt_invoice_macro,
             
             # Shopee Toolkit  
-            "keyword_tracker": self._generate_keyword_tracker,
-            "hashtag_clusterer": self._generate_hashtag_clusterer,
-            "copy_swipes": self._generate_copy_swipes,
+            "keyword_tracker": self._prompt_keyword_tracker,
+            "hashtag_clusterer": self._prompt_hashtag_clusterer,
+            "copy_swipes": self._prompt_copy_swipes,
             
             # Canva Assets
-            "batik_patterns": self._generate_batik_patterns,
-            "brand_kit": self._generate_brand_kit,
-            "capcut_templates": self._generate_capcut_templates,
+            "batik_patterns": self._prompt_batik_patterns,
+            "brand_kit": self._prompt_brand_kit,
+            "capcut_templates": self._prompt_capcut_templates,
             
             # Finance Pack
-            "pajak_calculator": self._generate_pajak_calculator,
-            "cash_flow": self._generate_cash_flow,
-            "sop_templates": self._generate_sop_templates,
+            "pajak_calculator": self._prompt_pajak_calculator,
+            "cash_flow": self._prompt_cash_flow,
+            "sop_templates": self._prompt_sop_templates,
             
             # Seasonal
-            "ramadan_calendar": self._generate_ramadan_calendar,
-            "wedding_planner": self._generate_wedding_planner,
-            "yearend_planner": self._generate_yearend_planner,
+            "ramadan_calendar": self._prompt_ramadan_calendar,
+            "wedding_planner": self._prompt_wedding_planner,
+            "yearend_planner": self._prompt_yearend_planner,
         }
         
         if product_type not in generators:
             raise ValueError(f"Unknown product type: {product_type}")
-            
         return generators[product_type](topic)
 
+    @tracing.traced("llm.generate", "product_type", "topic")
+    def generate_product_assets(self, topic: str, product_type: str):
+        """Route to specific generator based on product type."""
+        
+        spec = self.prompt_spec(topic, product_type)
+        key = ("product", normalize_topic(topic), product_type, MODEL, PROMPT_VERSION)
+        def request():
+            # Hanya pemimpin single-flight yang memakai slot LLM dari penjadwal
+            with scheduler.slot("llm"):
+                return self._request_json(spec, product_type, topic)
+        
+        with telemetry.tags(operation="generate", product_type=product_type, topic=topic):
+            try:
+                assets, shared = _inflight.do(key, request)
+            except Exception:
+                metrics.PRODUCT_ASSETS.inc(product_type, "error")
+                raise
+        metrics.PRODUCT_ASSETS.inc(product_type, "ok")
+        metrics.CACHE_REQUESTS.inc("llm_inflight", "hit" if shared else "miss")
+        if shared:
+            print(f"🔗  BuilderAgent: {product_type} '{topic}' dibagi dari permintaan yang sedang berjalan.")
+        return assets
+
+    def _request_json(self, spec: PromptSpec, product_type: str, topic: str):
+        resp = client.chat.completions.create(
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": spec.system},
+                {"role": "user", "content": spec.user}
+            ],
+            response_format=schemas.response_format(product_type),
+            temperature=spec.temperature
+        )
+        parsed = json_repair.loads(resp.choices[0].message.content)
+        if not isinstance(parsed.value, dict):
+            raise SchemaError(product_type, ["data: harus objek"])
+        data = parsed.value
+        
+        # Bagian yang terpotong/hilang saja yang diminta ulang, sisanya dipakai apa adanya
+        missing = [f for f in schemas.llm_fields(product_type) if f not in data]
+        if slot_errors(product_type, data):
+            missing.append(SLOT_CHECKS[product_type][0])
+        sections = list(dict.fromkeys(parsed.truncated_sections() + missing))
+        if sections:
+            print(f"🩹 BuilderAgent: {product_type} terpotong, meminta ulang: {', '.join(sections)}")
+            for section in sections:
+                data.pop(section, None)
+            data.update(self._request_sections(spec, product_type, sections))
+            short = slot_errors(product_type, data)
+            if short:
+                raise SchemaError(product_type, short)
+        
+        complete_local(product_type, data, topic, spec.local)
+        unfilled = unfilled_local(product_type, data)
+        if unfilled:
+            print(f"🧮 BuilderAgent: {product_type} '{topic}' belum bisa dihitung lokal, meminta LLM: {', '.join(unfilled)}")
+            data.update(self._request_sections(spec, product_type, unfilled))
+        errors = schemas.validate_template_data(product_type, data)
+        if errors:
+            raise SchemaError(product_type, errors)
+        return data
+
+    @tracing.traced("llm.repair_sections", "product_type", "sections")
+    def _request_sections(self, spec: PromptSpec, product_type: str, sections: List[str]) -> Dict[str, Any]:
+        """Minta ulang hanya field level teratas tertentu dari produk."""
+        system_prompt = spec.system + (
+            f"\n\nReturn ONLY these fields of the JSON described above: {', '.join(sections)}. "
+            "Each field must be complete."
+        )
+        with telemetry.tags(operation="repair_sections", sections=sections):
+            resp = client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": spec.user}
+                ],
+                response_format=schemas.response_format(product_type, sections),
+                temperature=spec.temperature
+            )
+        parsed = json_repair.loads(resp.choices[0].message.content)
+        if not isinstance(parsed.value, dict):
+            return {}
+        truncated = set(parsed.truncated_sections())
+        return {key: value for key, value in parsed.value.items() if key in sections and key not in truncated}
+
+    # ============== BATCH (BANYAK TOPIK, SATU PROMPT) ==============
+
+    def batch_size(self, product_type: str) -> int:
+        """Jumlah topik per request agar output muat dalam batas token output model."""
+        per_topic = _output_token_estimates.get(product_type, DEFAULT_OUTPUT_TOKENS)
+        return max(1, min(BATCH_MAX_TOPICS, int(MAX_OUTPUT_TOKENS * BATCH_TOKEN_HEADROOM // per_topic)))
+
+    def generate_product_assets_batch(self, topics: List[str], product_type: str
+                                      ) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+        """Generate satu jenis produk untuk banyak topik dengan system prompt yang dikirim sekali per batch.
+        
+        Return (assets per topik, error per topik). Topik yang hilang, terpotong, atau
+        tidak lolos `validate_template_data` diulang dengan request tunggal.
+        """
+        validate = schemas.validate_template_data
+        pending = list(dict.fromkeys(topics))
+        results: Dict[str, Dict] = {}
+        retry: List[str] = []
+        
+        while pending:
+            size = self.batch_size(product_type)
+            batch, pending = pending[:size], pending[size:]
+            if len(batch) == 1:
+                retry.extend(batch)
+                continue
+            print(f"📦 Generating {product_type} untuk {len(batch)} topik dalam satu request...")
+            try:
+                # Prompt (termasuk hasil lokal seperti graf hashtag) disiapkan sebelum mengambil slot LLM
+                specs = [self.prompt_spec(topic, product_type) for topic in batch]
+                with scheduler.slot("llm", cost=len(batch)):
+                    items = self._request_batch(specs, product_type)
+            except Exception as e:
+                print(f"⚠️ Batch gagal ({e}), topik diulang satu per satu.")
+                retry.extend(batch)
+                continue
+            for key, topic, spec in zip(self._batch_keys(batch), batch, specs):
+                data = items.get(key)
+                if isinstance(data, dict) and not slot_errors(product_type, data) \
+                        and not validate(product_type, complete_local(product_type, data, topic, spec.local)):
+                    results[topic] = data
+                    metrics.PRODUCT_ASSETS.inc(product_type, "ok")
+                else:
+                    retry.append(topic)
+        
+        errors: Dict[str, str] = {}
+        for topic in retry:
+            try:
+                results[topic] = self.generate_product_assets(topic, product_type)
+            except Exception as e:
+                errors[topic] = str(e)
+        return results, errors
+
+    @staticmethod
+    def _batch_keys(batch: List) -> List[str]:
+        return [f"t{i}" for i in range(1, len(batch) + 1)]
+
+    @tracing.traced("llm.batch", "product_type")
+    def _request_batch(self, specs: List[PromptSpec], product_type: str) -> Dict[str, Any]:
+        keys = self._batch_keys(specs)
+        system_prompt = specs[0].system + (
+            "\n\nYou will receive several requests, each prefixed with a key (t1, t2, ...). "
+            "Return ONE JSON object whose keys are exactly those keys; each value must be the complete "
+            "JSON object described above for that request, written independently."
+        )
+        user_prompt = "\n".join(f"{key}: {spec.user}" for key, spec in zip(keys, specs))
+        
+        with telemetry.tags(operation="batch", product_type=product_type, batch_size=len(specs)):
+            resp = client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format=schemas.batch_response_format(product_type, keys),
+                temperature=specs[0].temperature,
+                max_tokens=MAX_OUTPUT_TOKENS
+            )
+        
+        choice = resp.choices[0]
+        usage = getattr(resp, "usage", None)
+        per_topic = _output_token_estimates.get(product_type, DEFAULT_OUTPUT_TOKENS)
+        if choice.finish_reason == "length":
+            # Output terpotong: perkecil batch berikutnya
+            _output_token_estimates[product_type] = per_topic * 2
+        elif usage is not None and usage.completion_tokens:
+            observed = usage.completion_tokens / len(specs)
+            _output_token_estimates[product_type] = 0.7 * per_topic + 0.3 * observed
+        
+        # Topik yang selesai sebelum batas token tetap dipakai; yang terpotong diulang sendiri
+        parsed = json_repair.loads(choice.message.content)
+        if not isinstance(parsed.value, dict):
+            raise ValueError("respons batch bukan objek")
+        truncated = set(parsed.truncated_sections())
+        return {key: value for key, value in parsed.value.items() if key not in truncated}
+
+
     # ============== UMKM PRODUCTIVITY SUITE ==============
     
-    def _generate_content_calendar(self, topic: str):
+    def _prompt_content_calendar(self, topic: str) -> PromptSpec:
         """Generate 30-day content calendar."""
         
         system_prompt = """
         You are a social media strategist for Indonesian UMKM.
-        Create a comprehensive 30-day content calendar.
+        Create a 4-week content calendar. Dates and posting times are filled in separately;
+        write only the content slots, one week per line of the outline given by the user,
+        and use the special days listed there.
         
         Return JSON with:
         - name: catchy product name in Indonesian
         - description: compelling description
-        - month: target month name
-        - year: 2025
-        - calendar_weeks: array of 4 week objects, each containing:
-          - week_number: 1-4
+        - weeks: array of 4 week objects, each containing:
           - theme: weekly theme
-          - days: array of 7 days with:
-            - date: "Senin, 1 Jan"
+          - days: array of 7 days (Monday to Sunday) with:
             - content_type: "Educational" / "Promotional" / "Engagement" / "Behind the Scene"
             - idea: specific post idea in Indonesian (50-100 chars)
-            - best_time: optimal posting time like "19:00"
           - hashtags: array of 10 relevant Indonesian hashtags
         """
+        user_prompt = (f"Create content calendar for: {topic}\n"
+                       f"Outline:\n{calendar_scaffold.content_calendar_outline()}")
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create content calendar for: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.8
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        return PromptSpec(system_prompt, user_prompt, 0.8)
 
-    def _generate_caption_bank(self, topic: str):
+    def _prompt_caption_bank(self, topic: str) -> PromptSpec:
         """Generate caption bank with 30 captions."""
         
         system_prompt = """
@@ -185,19 +496,9 @@ class BuilderAgent:
         Use conversational Indonesian with occasional English terms where natural.
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create caption bank for: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.8
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        return PromptSpec(system_prompt, f"Create caption bank for: {topic}", 0.8)
 
-    def _generate_invoice_macro(self, topic: str):
+    def _prompt_invoice_macro(self, topic: str) -> PromptSpec:
         """Generate invoice templates with macro calculations."""
         
         system_prompt = """
@@ -226,21 +527,11 @@ class BuilderAgent:
           - notes: payment instructions in Indonesian
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create invoice templates for business type: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        return PromptSpec(system_prompt, f"Create invoice templates for business type: {topic}", 0.7)
 
     # ============== SHOPEE TOOLKIT ==============
     
-    def _generate_keyword_tracker(self, topic: str):
+    def _prompt_keyword_tracker(self, topic: str) -> PromptSpec:
         """Generate keyword tracking report."""
         
         system_prompt = """
@@ -250,9 +541,12 @@ class BuilderAgent:
         Return JSON with:
         - name: product name
         - description: product description
-        - report_date: today's date
         - shop_name: sample shop name related to topic
-        - keywords: array of 50 keywords with:
+        - keyword_notes: one entry per keyword in the provided keyword list (empty array if no list is given):
+          - keyword: exactly as listed
+          - cpc_estimate: cost per click in IDR (500-5000)
+          - recommended_action: actionable advice in Indonesian
+        - keywords (only when requested): array of 50 keywords with:
           - keyword: Indonesian keyword
           - search_volume: realistic monthly searches (100-50000)
           - competition: "Low" / "Medium" / "High"
@@ -262,22 +556,18 @@ class BuilderAgent:
           - cpc_estimate: cost per click in IDR (500-5000)
           - recommended_action: actionable advice in Indonesian
         - summary: executive summary in Indonesian
-        - recommendations: array of 5 strategic recommendations
+        - recommendations: array of 5 strategic recommendations, grounded in the keyword list when given
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create keyword report for Shopee seller in: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        user_prompt = f"Create keyword report for Shopee seller in: {topic}"
+        # Kata kunci, volume & persaingan dari index laporan riset/produk, bukan karangan model
+        keywords = keyword_index.prompt_keywords(topic)
+        outline = keyword_index.outline(keywords)
+        if outline:
+            user_prompt += f"\nKeywords from our research corpus (keyword | relevance | co-occurrence with topic | documents):\n{outline}"
+        return PromptSpec(system_prompt, user_prompt, 0.7, {"keywords": keywords})
 
-    def _generate_hashtag_clusterer(self, topic: str):
+    def _prompt_hashtag_clusterer(self, topic: str) -> PromptSpec:
         """Generate clustered hashtags for maximum reach."""
         
         system_prompt = """
@@ -287,7 +577,7 @@ class BuilderAgent:
         Return JSON with:
         - name: product name  
         - description: product description
-        - clusters: array of 5 clusters:
+        - clusters (only when requested): array of 5 clusters:
           - cluster_name: "High Competition" / "Medium Competition" / "Low Competition" / "Branded" / "Community"
           - hashtags: array of 20 hashtags with:
             - tag: hashtag with # symbol
@@ -298,19 +588,15 @@ class BuilderAgent:
         - monthly_calendar: object with days as keys, cluster recommendations as values
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create hashtag clusters for: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        user_prompt = f"Create hashtag clusters for: {topic}"
+        # Cluster dihitung lokal dari korpus produk; LLM cukup menulis panduan & kalender untuknya
+        clusters = hashtag_engine.topic_clusters(topic)
+        outline = hashtag_engine.outline(clusters)
+        if outline:
+            user_prompt += f"\nClusters from our hashtag corpus (base usage_guide and monthly_calendar on these):\n{outline}"
+        return PromptSpec(system_prompt, user_prompt, 0.7, {"clusters": clusters})
 
-    def _generate_copy_swipes(self, topic: str):
+    def _prompt_copy_swipes(self, topic: str) -> PromptSpec:
         """Generate copywriting swipe file."""
         
         system_prompt = """
@@ -335,21 +621,11 @@ class BuilderAgent:
           - content: tip description in Indonesian
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create copy swipes for: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.8
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        return PromptSpec(system_prompt, f"Create copy swipes for: {topic}", 0.8)
 
     # ============== CANVA ASSETS ==============
     
-    def _generate_batik_patterns(self, topic: str):
+    def _prompt_batik_patterns(self, topic: str) -> PromptSpec:
         """Generate batik pattern collection."""
         
         system_prompt = """
@@ -374,19 +650,9 @@ class BuilderAgent:
         - license_terms: licensing information in Indonesian
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create batik pattern collection for: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.8
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        return PromptSpec(system_prompt, f"Create batik pattern collection for: {topic}", 0.8)
 
-    def _generate_brand_kit(self, topic: str):
+    def _prompt_brand_kit(self, topic: str) -> PromptSpec:
         """Generate complete brand kit."""
         
         system_prompt = """
@@ -426,19 +692,9 @@ class BuilderAgent:
           - donts: array of 3 don'ts
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create brand kit for: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        return PromptSpec(system_prompt, f"Create brand kit for: {topic}", 0.7)
 
-    def _generate_capcut_templates(self, topic: str):
+    def _prompt_capcut_templates(self, topic: str) -> PromptSpec:
         """Generate CapCut video templates."""
         
         system_prompt = """
@@ -462,21 +718,11 @@ class BuilderAgent:
           - description: how to do it in Indonesian
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create CapCut templates for: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.8
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        return PromptSpec(system_prompt, f"Create CapCut templates for: {topic}", 0.8)
 
     # ============== FINANCE PACK ==============
     
-    def _generate_pajak_calculator(self, topic: str):
+    def _prompt_pajak_calculator(self, topic: str) -> PromptSpec:
         """Generate tax calculator for UMKM."""
         
         system_prompt = """
@@ -507,19 +753,9 @@ class BuilderAgent:
           - description: what's due
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create tax calculator for UMKM in: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        return PromptSpec(system_prompt, f"Create tax calculator for UMKM in: {topic}", 0.7)
 
-    def _generate_cash_flow(self, topic: str):
+    def _prompt_cash_flow(self, topic: str) -> PromptSpec:
         """Generate cash flow tracker."""
         
         system_prompt = """
@@ -560,19 +796,9 @@ class BuilderAgent:
           - value: projected cash flow
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create cash flow tracker for: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        return PromptSpec(system_prompt, f"Create cash flow tracker for: {topic}", 0.7)
 
-    def _generate_sop_templates(self, topic: str):
+    def _prompt_sop_templates(self, topic: str) -> PromptSpec:
         """Generate SOP templates."""
         
         system_prompt = """
@@ -608,69 +834,35 @@ class BuilderAgent:
             - action: what they do
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create SOP templates for: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        return PromptSpec(system_prompt, f"Create SOP templates for: {topic}", 0.7)
 
     # ============== SEASONAL ==============
     
-    def _generate_ramadan_calendar(self, topic: str):
+    def _prompt_ramadan_calendar(self, topic: str) -> PromptSpec:
         """Generate Ramadan content calendar."""
         
         system_prompt = """
-        Create a comprehensive Ramadan calendar for Indonesian Muslims.
-        Include prayer times, content ideas, and special days.
+        Create the content for a Ramadan calendar for Indonesian Muslims.
+        Prayer times, dates and the day grid are computed separately; write only the content.
         
         Return JSON with:
         - name: product name
         - description: product description
-        - location: "Jakarta" or other Indonesian city
-        - current_date: formatted date
-        - month_name: "Ramadan"
-        - year: 2025
-        - hijri_month: Hijri month name
-        - hijri_year: Hijri year
-        - weekdays: array of 7 weekday names in Indonesian
-        - prayer_times: array of 5 prayers with:
-          - name: prayer name
-          - time: time like "04:30"
-        - calendar_days: array of 30 days with:
-          - number: day number
-          - hijri: Hijri date
-          - is_today: boolean
-          - event: special event if any
+        - location: the Indonesian city (kota/kabupaten) the calendar is for, "Jakarta" if not specified
         - content_categories: array of 4 categories with:
           - icon: emoji
           - title: category title
           - ideas: array of 5 content ideas
         - popular_hashtags: array of 20 Ramadan hashtags
         - special_days: array of special days with:
-          - date: date
+          - date: day of Ramadan like "17 Ramadan" (or "1 Syawal")
           - name: day name
           - description: significance
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create Ramadan calendar for: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        return PromptSpec(system_prompt, f"Create Ramadan calendar for: {topic}", 0.7)
 
-    def _generate_wedding_planner(self, topic: str):
+    def _prompt_wedding_planner(self, topic: str) -> PromptSpec:
         """Generate wedding planner."""
         
         system_prompt = """
@@ -721,29 +913,19 @@ class BuilderAgent:
           - content: note content
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create wedding planner for: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
-        )
-        
-        return json.loads(resp.choices[0].message.content)
+        return PromptSpec(system_prompt, f"Create wedding planner for: {topic}", 0.7)
 
-    def _generate_yearend_planner(self, topic: str):
+    def _prompt_yearend_planner(self, topic: str) -> PromptSpec:
         """Generate year-end planner."""
         
         system_prompt = """
         Create a comprehensive year-end planner for Indonesian professionals.
-        Include reflection, goals, and monthly planning.
+        Include reflection, goals, and monthly planning. The years and month names are
+        given in the user's outline; keep monthly plans consistent with the holidays listed.
         
         Return JSON with:
         - name: product name
         - description: product description
-        - year: 2025
         - achievements: array of 6 achievements with:
           - icon: emoji
           - title: achievement title
@@ -755,8 +937,7 @@ class BuilderAgent:
           - goals: array of 5 goals with:
             - text: goal description
             - priority: "High" / "Medium" / "Low"
-        - monthly_breakdown: array of 12 months with:
-          - name: month name
+        - monthly_breakdown: array of 12 months, January to December, with:
           - focus: monthly focus area
           - tasks: array of 3 key tasks
         - habits: array of 6 habits with:
@@ -774,14 +955,6 @@ class BuilderAgent:
           - placeholder: sample answer or guidance
         """
         
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Create year-end planner for: {topic}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
-        )
-        
-        return json.loads(resp.choices[0].message.content)
\ No newline at end of file
+        user_prompt = (f"Create year-end planner for: {topic}\n"
+                       f"Outline:\n{calendar_scaffold.yearend_outline()}")
+        return PromptSpec(system_prompt, user_prompt, 0.7)
\ No newline at end of file
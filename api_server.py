@@ -0,0 +1,562 @@
+# api_server.py
+"""HTTP API asinkron untuk memicu scan/generate dari storefront.
+
+    python api_server.py --port 8080 --concurrency 4
+
+Endpoint:
+    POST /scans                 {"topic": "...", "on_duplicate": "reuse|fork|scan"}
+    POST /products              {"signal_id": "..." | "topic": "...", "product_type": "caption_bank"}
+    POST /suites                {"signal_id": "..." | "topic": "...", "suite": "umkm_productivity"}
+                                (semua POST opsional: "tenant", "priority": "interactive|batch")
+    GET  /jobs/{id}             status & hasil job
+    GET  /jobs/{id}/events      progres job (Server-Sent Events)
+    GET  /jobs/{id}/download    file produk dalam satu zip
+    GET  /health                kedalaman antrian, job berjalan & statistik per tenant
+    GET  /metrics               metrik format Prometheus (lihat metrics.py)
+
+Setiap POST langsung dibalas 202 + job_id. Job menunggu di antrian fair-share per
+tenant (lihat scheduler.py) berkapasitas terbatas; jika antrian penuh, atau satu tenant
+sudah memakai bagiannya, server membalas 429 dengan header Retry-After.
+Panggilan LLM berjalan di thread pool, render PDF di process pool, sehingga
+event loop tidak pernah terblokir.
+"""
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import io
+import json
+import math
+import multiprocessing as mp
+import os
+import signal
+import sys
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import main as app
+import metrics
+import pregen
+import scheduler
+from agents import AnalystAgent, BuilderAgent
+from template_renderer import TemplateRenderer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_CONCURRENCY = 4
+DEFAULT_QUEUE_SIZE = 32
+MAX_BODY_BYTES = 64 * 1024
+FINISHED_JOB_TTL = 3600.0
+PROGRESS_POLL_INTERVAL = 1.0
+# Bagian antrian maksimal untuk satu tenant, agar tenant lain tetap bisa masuk
+TENANT_QUEUE_SHARE = 0.5
+DEFAULT_API_PRIORITY = "interactive"
+
+STATUS_TEXT = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 429: "Too Many Requests",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class ApiJob:
+    """Satu permintaan API beserta riwayat progresnya (disimpan di memori)."""
+
+    def __init__(self, kind: str, payload: Dict[str, Any]):
+        self.id = f"api_{uuid.uuid4().hex[:12]}"
+        self.kind = kind
+        self.payload = payload
+        self.status = "queued"
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.events: List[Dict[str, Any]] = []
+        self.changed = asyncio.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    async def emit(self, stage: str, status: Optional[str] = None, **fields):
+        async with self.changed:
+            if status:
+                self.status = status
+            self.updated_at = time.time()
+            self.events.append({"stage": stage, "status": self.status, "at": self.updated_at, **fields})
+            self.changed.notify_all()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "payload": self.payload,
+            "status": self.status,
+            "stage": self.events[-1]["stage"] if self.events else None,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+def build_zip(paths: List[Path], root: Path) -> bytes:
+    """Zip semua file produk; path di dalam zip relatif terhadap folder produk."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for path in paths:
+            if path.is_file():
+                try:
+                    arcname = path.resolve().relative_to(root.resolve())
+                except ValueError:
+                    arcname = Path(path.name)
+                zf.write(path, str(arcname))
+    return buffer.getvalue()
+
+
+class GenerationService:
+    """Antrian job fair-share terbatas + sejumlah consumer yang membatasi job berjalan bersamaan."""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 render_workers: Optional[int] = None):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.tenant_queue_size = max(1, int(queue_size * TENANT_QUEUE_SHARE))
+        self.pending = scheduler.FairQueue()
+        self.available = asyncio.Semaphore(0)
+        self.jobs: Dict[str, ApiJob] = {}
+        self.running = 0
+        # Rata-rata durasi job (EMA) untuk memperkirakan Retry-After
+        self.avg_duration = 60.0
+        self.io_pool = ThreadPoolExecutor(max_workers=concurrency * 2, thread_name_prefix="api-io")
+        # spawn: proses render tidak mewarisi thread/lock milik event loop
+        self.render_pool = ProcessPoolExecutor(max_workers=render_workers or min(concurrency, os.cpu_count() or 1),
+                                               mp_context=mp.get_context("spawn"))
+        self.consumers: List[asyncio.Task] = []
+        metrics.API_QUEUE_DEPTH.set_function(lambda: len(self.pending))
+        metrics.API_JOBS_RUNNING.set_function(lambda: self.running)
+
+    def start(self):
+        self.consumers = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for task in self.consumers:
+            task.cancel()
+        await asyncio.gather(*self.consumers, return_exceptions=True)
+        self.io_pool.shutdown(wait=False, cancel_futures=True)
+        self.render_pool.shutdown(wait=False, cancel_futures=True)
+
+    def retry_after(self) -> int:
+        waves = (len(self.pending) + self.running) / self.concurrency
+        return max(1, math.ceil(waves * self.avg_duration))
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> ApiJob:
+        self._prune()
+        tenant = payload.get("tenant", scheduler.DEFAULT_TENANT)
+        if len(self.pending) >= self.queue_size or self.pending.queued(tenant) >= self.tenant_queue_size:
+            metrics.API_REJECTED.inc()
+            raise HttpError(429, "Antrian penuh, coba lagi nanti.", {"Retry-After": str(self.retry_after())})
+        job = ApiJob(kind, payload)
+        self.pending.push(job, tenant, payload.get("priority", DEFAULT_API_PRIORITY))
+        self.available.release()
+        self.jobs[job.id] = job
+        job.events.append({"stage": "queued", "status": "queued", "at": job.created_at,
+                           "position": len(self.pending)})
+        return job
+
+    def _prune(self):
+        cutoff = time.time() - FINISHED_JOB_TTL
+        for job_id in [j.id for j in self.jobs.values() if j.finished and j.updated_at < cutoff]:
+            del self.jobs[job_id]
+
+    async def _consume(self):
+        while True:
+            await self.available.acquire()
+            job = self.pending.pop()
+            self.running += 1
+            started = time.monotonic()
+            try:
+                await job.emit("started", status="running")
+                handler = getattr(self, f"_run_{job.kind}")
+                with scheduler.context(job.payload.get("tenant"), job.payload.get("priority", DEFAULT_API_PRIORITY)):
+                    job.result = await handler(job)
+                await job.emit("done", status="done")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.error = str(e)
+                await job.emit("failed", status="failed", error=str(e))
+            finally:
+                self.running -= 1
+                self.avg_duration = 0.8 * self.avg_duration + 0.2 * (time.monotonic() - started)
+
+    def _io(self, func, *args):
+        # Context (tenant penjadwal, tag telemetri, span trace) ikut ke thread pool
+        return asyncio.get_running_loop().run_in_executor(self.io_pool, contextvars.copy_context().run, func, *args)
+
+    def _render(self, func, *args, product_type: Optional[str] = None):
+        return self._io(self._render_scheduled, func, args, product_type)
+
+    def _render_scheduled(self, func, args: tuple, product_type: Optional[str]):
+        # Slot render diambil di proses ini karena penjadwal & registry metrik proses pool terpisah
+        timer = metrics.RENDER_SECONDS.time(product_type) if product_type else contextlib.nullcontext()
+        with scheduler.slot("render"), timer:
+            return self.render_pool.submit(func, *args).result()
+
+    async def _resolve_signal(self, job: ApiJob) -> Dict[str, Any]:
+        """Signal dari DB, atau sumber ad-hoc (id None, tidak disimpan) untuk topik personal dari pembeli."""
+        signal_id = job.payload.get("signal_id")
+        if signal_id:
+            target = await self._io(app.signals_repo.get, signal_id)
+            if target is None:
+                raise ValueError(f"Signal tidak ditemukan: {signal_id}")
+            return target.to_dict()
+        return {"id": None, "topic": job.payload["topic"]}
+
+    @staticmethod
+    def _record_extra(job: ApiJob, target: Dict[str, Any]) -> Dict[str, Any]:
+        # Produk ad-hoc tidak punya signal, jadi topiknya dicatat langsung di record
+        return {"api_job_id": job.id, **({} if target['id'] else {"topic": target['topic']})}
+
+    async def _run_scan(self, job: ApiJob) -> Dict[str, Any]:
+        topic = job.payload["topic"]
+        on_duplicate = job.payload.get("on_duplicate", "reuse")
+        if on_duplicate != "scan":
+            matches = await self._io(app.find_duplicates, topic)
+            if matches:
+                source = await self._io(app.signals_repo.get, matches[0]['signal_id'])
+                if on_duplicate == "reuse":
+                    return {"action": "reused", "signal_id": source['id'], "similarity": matches[0]['similarity']}
+                forked = await self._io(app.fork_signal, topic, source)
+                return {"action": "forked", "signal_id": forked['id'], "similarity": matches[0]['similarity']}
+
+        analyst = AnalystAgent()
+        await job.emit("researching")
+        report_text = await self._io(analyst.research_topic, topic)
+        await job.emit("scoring")
+        score = await self._io(analyst.score_idea, report_text)
+        created = await self._io(app.create_signal, topic, report_text, score)
+        return {"action": "scanned", "signal_id": created['id'], "score": score}
+
+    async def _run_product(self, job: ApiJob) -> Dict[str, Any]:
+        target = await self._resolve_signal(job)
+        product_type = job.payload.get("product_type", "caption_bank")
+
+        product_id = f"prod_{uuid.uuid4().hex[:12]}"
+        product_folder = app.PRODUCTS_DIR / product_id
+        claimed = target['id'] and await self._io(pregen.claim, target, product_type, product_folder)
+        if claimed:
+            await job.emit("pregenerated", product_type=product_type)
+            assets, files = claimed
+        else:
+            await job.emit("generating", product_type=product_type)
+            assets = await self._io(BuilderAgent().generate_product_assets, target['topic'], product_type)
+            if not assets:
+                raise RuntimeError("Gagal membuat aset produk.")
+            product_folder.mkdir(parents=True)
+            await job.emit("rendering", product_type=product_type)
+            files = await self._render(app.render_product_files, product_type, assets, product_folder,
+                                       product_type=product_type)
+
+        await job.emit("saving")
+        product = app.product_record(target, product_type, assets, files, product_id,
+                                     self._record_extra(job, target))
+        await self._io(app.save_product, product, target['id'])
+        return {"product_id": product_id, "signal_id": target['id'], "name": product['name'], "files": files}
+
+    async def _run_suite(self, job: ApiJob) -> Dict[str, Any]:
+        target = await self._resolve_signal(job)
+        suite_type = job.payload["suite"]
+        checkpoint = await self._io(app.open_suite_checkpoint, target, suite_type, job.id)
+        await self._io(checkpoint.claim)
+        total = len(TemplateRenderer.SUITES[suite_type])
+
+        await job.emit("generating", completed=0, total=total)
+        generation = self._io(BuilderAgent().generate_product_suite, suite_type, target['topic'], checkpoint)
+        reported = 0
+        while not generation.done():
+            await asyncio.wait([generation], timeout=PROGRESS_POLL_INTERVAL)
+            completed = await self._io(checkpoint.completed_products)
+            if len(completed) != reported:
+                reported = len(completed)
+                await job.emit("generating", completed=reported, total=total, products=completed)
+        try:
+            suite_data, suite_config = generation.result()
+        except Exception as e:
+            await self._io(lambda: checkpoint.mark("failed", error=str(e)))
+            raise
+
+        await job.emit("rendering", total=total)
+        product_folder = app.PRODUCTS_DIR / checkpoint.meta["product_id"]
+        try:
+            files = await self._render(app.render_suite_files, suite_type, suite_data, product_folder)
+        except Exception as e:
+            await self._io(lambda: checkpoint.mark("failed", error=str(e)))
+            raise
+
+        await job.emit("saving")
+        product = app.suite_record(target, suite_type, suite_config, suite_data, files, checkpoint,
+                                   self._record_extra(job, target))
+        await self._io(app.save_product, product, target['id'])
+        await self._io(checkpoint.mark, "complete")
+        return {"product_id": product['id'], "signal_id": target['id'], "name": product['name'],
+                "run_id": checkpoint.run_id, "files": files}
+
+    async def download(self, job: ApiJob) -> Tuple[str, bytes]:
+        if job.status != "done" or not job.result or "files" not in job.result:
+            raise HttpError(409, "Job belum selesai atau tidak menghasilkan file.")
+        product_id = job.result["product_id"]
+        paths = [Path(p) for p in job.result["files"].values()]
+        data = await self._io(build_zip, paths, app.PRODUCTS_DIR / product_id)
+        return f"{product_id}.zip", data
+
+
+# --- HTTP ---
+def validate_submission(kind: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(body, dict):
+        raise HttpError(400, "Body harus berupa objek JSON.")
+    topic = body.get("topic")
+    if topic is not None and (not isinstance(topic, str) or not topic.strip()):
+        raise HttpError(400, "'topic' harus berupa teks.")
+
+    tenant = body.get("tenant", scheduler.DEFAULT_TENANT)
+    if not isinstance(tenant, str) or not tenant.strip():
+        raise HttpError(400, "'tenant' harus berupa teks.")
+    priority = body.get("priority", DEFAULT_API_PRIORITY)
+    if priority not in scheduler.PRIORITIES:
+        raise HttpError(400, f"'priority' harus salah satu dari: {', '.join(scheduler.PRIORITIES)}")
+    scheduling = {"tenant": tenant.strip(), "priority": priority}
+
+    if kind == "scan":
+        if not topic:
+            raise HttpError(400, "'topic' wajib diisi.")
+        on_duplicate = body.get("on_duplicate", "reuse")
+        if on_duplicate not in ("reuse", "fork", "scan"):
+            raise HttpError(400, "'on_duplicate' harus reuse, fork, atau scan.")
+        return {"topic": topic.strip(), "on_duplicate": on_duplicate, **scheduling}
+
+    if not topic and not body.get("signal_id"):
+        raise HttpError(400, "Isi 'signal_id' atau 'topic'.")
+    payload = {"signal_id": body["signal_id"]} if body.get("signal_id") else {"topic": topic.strip()}
+    payload.update(scheduling)
+    if kind == "suite":
+        if body.get("suite") not in TemplateRenderer.SUITES:
+            raise HttpError(400, f"'suite' harus salah satu dari: {', '.join(TemplateRenderer.SUITES)}")
+        payload["suite"] = body["suite"]
+    else:
+        product_types = [t for types in TemplateRenderer.SUITES.values() for t in types]
+        product_type = body.get("product_type", "caption_bank")
+        if product_type not in product_types:
+            raise HttpError(400, f"'product_type' tidak dikenal: {product_type}")
+        payload["product_type"] = product_type
+    return payload
+
+
+class ApiServer:
+    """Server HTTP/1.1 minimal di atas asyncio.start_server (satu request per koneksi)."""
+
+    SUBMIT_ROUTES = {"/scans": "scan", "/products": "product", "/suites": "suite"}
+
+    def __init__(self, service: GenerationService, token: Optional[str] = None):
+        self.service = service
+        self.token = token
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                method, path, headers, body = await self._read_request(reader)
+                await self._dispatch(method, path, headers, body, writer)
+            except HttpError as e:
+                await self._send_json(writer, e.status, {"error": str(e)}, e.headers)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            except Exception as e:
+                await self._send_json(writer, 500, {"error": str(e)})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, "Header terlalu besar.")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Request line tidak valid.")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "Content-Length tidak valid.")
+        if length < 0:
+            raise HttpError(400, "Content-Length tidak valid.")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "Body terlalu besar.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), urlsplit(target).path.rstrip("/") or "/", headers, body
+
+    async def _dispatch(self, method: str, path: str, headers: Dict[str, str], body: bytes,
+                        writer: asyncio.StreamWriter):
+        if path == "/health":
+            return await self._send_json(writer, 200, {
+                "status": "ok",
+                "queued": len(self.service.pending),
+                "queue_capacity": self.service.queue_size,
+                "tenant_queue_capacity": self.service.tenant_queue_size,
+                "running": self.service.running,
+                "concurrency": self.service.concurrency,
+                "tenants": scheduler.SCHEDULER.stats(),
+            })
+        if path == "/metrics":
+            return await self._send(writer, 200, metrics.REGISTRY.expose().encode("utf-8"), metrics.CONTENT_TYPE)
+
+        if self.token and headers.get("authorization") != f"Bearer {self.token}":
+            raise HttpError(401, "Token tidak valid.")
+
+        if path in self.SUBMIT_ROUTES:
+            if method != "POST":
+                raise HttpError(405, "Gunakan POST.")
+            try:
+                data = json.loads(body or b"{}")
+            except json.JSONDecodeError:
+                raise HttpError(400, "Body bukan JSON yang valid.")
+            kind = self.SUBMIT_ROUTES[path]
+            job = self.service.submit(kind, validate_submission(kind, data))
+            return await self._send_json(writer, 202, {
+                "job_id": job.id,
+                "status": job.status,
+                "links": {"self": f"/jobs/{job.id}", "events": f"/jobs/{job.id}/events",
+                          "download": f"/jobs/{job.id}/download"},
+            }, {"Location": f"/jobs/{job.id}"})
+
+        parts = path.strip("/").split("/")
+        if parts[0] == "jobs" and len(parts) in (2, 3):
+            if method != "GET":
+                raise HttpError(405, "Gunakan GET.")
+            job = self.service.jobs.get(parts[1])
+            if job is None:
+                raise HttpError(404, "Job tidak ditemukan.")
+            if len(parts) == 2:
+                return await self._send_json(writer, 200, job.to_dict())
+            if parts[2] == "events":
+                return await self._stream_events(job, headers, writer)
+            if parts[2] == "download":
+                filename, data = await self.service.download(job)
+                return await self._send(writer, 200, data, "application/zip",
+                                        {"Content-Disposition": f'attachment; filename="{filename}"'})
+        raise HttpError(404, "Endpoint tidak ditemukan.")
+
+    async def _stream_events(self, job: ApiJob, headers: Dict[str, str], writer: asyncio.StreamWriter):
+        try:
+            sent = int(headers.get("last-event-id", -1)) + 1
+        except ValueError:
+            raise HttpError(400, "Last-Event-ID tidak valid.")
+        writer.write(self._head(200, "text/event-stream", {"Cache-Control": "no-cache"}))
+        while True:
+            async with job.changed:
+                await job.changed.wait_for(lambda: len(job.events) > sent or job.finished)
+                pending = job.events[sent:]
+            for event in pending:
+                writer.write(f"id: {sent}\nevent: {event['stage']}\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+                sent += 1
+            await writer.drain()
+            if job.finished and sent >= len(job.events):
+                return
+
+    @staticmethod
+    def _head(status: int, content_type: str, headers: Optional[Dict[str, str]] = None,
+              length: Optional[int] = None) -> bytes:
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}", f"Content-Type: {content_type}",
+                 "Connection: close"]
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, body: bytes, content_type: str,
+                    headers: Optional[Dict[str, str]] = None):
+        writer.write(self._head(status, content_type, headers, len(body)) + body)
+        await writer.drain()
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, data: Any,
+                         headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        await self._send(writer, status, body, "application/json; charset=utf-8", headers)
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, concurrency: int = DEFAULT_CONCURRENCY,
+                queue_size: int = DEFAULT_QUEUE_SIZE, token: Optional[str] = None):
+    """Jalankan API sampai SIGINT/SIGTERM."""
+    app.ensure_setup()
+    service = GenerationService(concurrency, queue_size)
+    service.start()
+    api = ApiServer(service, token)
+    server = await asyncio.start_server(api.handle, host, port)
+    exporter = metrics.TextfileExporter("api").start()
+    speculator = pregen.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    print(f"🚀 API berjalan di http://{host}:{port} (concurrency {concurrency}, antrian {queue_size})")
+    try:
+        await stop.wait()
+    finally:
+        print("\n🛑 Menghentikan API...")
+        server.close()
+        await server.wait_closed()
+        await service.stop()
+        exporter.stop()
+        if speculator is not None:
+            speculator.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Autopreneur HTTP API")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Maksimal job berjalan bersamaan")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Kapasitas antrian sebelum membalas 429")
+    args = parser.parse_args(argv)
+
+    if not os.getenv("OPENAI_API_KEY"):
+        print("❌ ERROR: OpenAI API Key tidak ditemukan (OPENAI_API_KEY).", file=sys.stderr)
+        return 3
+    try:
+        asyncio.run(serve(args.host, args.port, args.concurrency, args.queue_size,
+                          os.getenv("AUTOPRENEUR_API_TOKEN")))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
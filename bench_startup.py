@@ -0,0 +1,225 @@
+# bench_startup.py
+"""Benchmark cold start CLI per jalur perintah, dengan ambang regresi.
+
+Setiap jalur dijalankan sebagai proses Python baru (start interpreter + import modul
+aplikasi) di direktori kerja sementara, beberapa kali, lalu waktu tercepatnya
+dibandingkan dengan baseline tersimpan (gangguan mesin hanya menambah waktu, jadi
+minimum lebih stabil daripada median). Satu proses tambahan dengan `-X importtime`
+memeriksa bahwa pustaka berat (openai, jinja2, weasyprint, asyncio) tidak ikut dimuat
+di jalur yang tidak memakainya; pustaka itu seharusnya baru dimuat saat pertama dipakai.
+
+    python bench_startup.py --save-baseline     # catat baseline untuk mesin ini
+    python bench_startup.py --threshold 1.25     # exit 1 jika ada jalur >25% lebih lambat
+    python bench_startup.py --only cli_help plan --imports
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parent
+BASELINE_PATH = ROOT / "db" / "startup_baseline.json"
+DEFAULT_RUNS = int(os.getenv("AUTOPRENEUR_STARTUP_RUNS", "7"))
+# Regresi jika minimum > baseline × ambang DAN selisihnya > slack (jitter di jalur cepat)
+DEFAULT_THRESHOLD = float(os.getenv("AUTOPRENEUR_STARTUP_THRESHOLD", "1.25"))
+DEFAULT_SLACK_MS = float(os.getenv("AUTOPRENEUR_STARTUP_SLACK_MS", "15"))
+
+HEAVY_MODULES = ("openai", "jinja2", "weasyprint", "asyncio", "http.server")
+
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+
+# Nama jalur → (argumen interpreter, pustaka berat yang memang boleh dimuat).
+# Perintah yang butuh API/LLM diukur lewat --help: import-nya sama, tanpa panggilan jaringan.
+PATHS: Dict[str, Tuple[List[str], Tuple[str, ...]]] = {
+    "interpreter": (["-c", "pass"], HEAVY_MODULES),
+    "import_main": (["-c", "import main"], ()),
+    "cli_help": (["cli.py", "--help"], ()),
+    "scan": (["cli.py", "scan", "--help"], ()),
+    "generate": (["cli.py", "generate", "--help"], ()),
+    "plan": (["cli.py", "plan", "--top", "5"], ()),
+    "render": (["cli.py", "render", "--help"], ()),
+    "export": (["cli.py", "export", "signals"], ()),
+    "jobs": (["cli.py", "jobs", "stats"], ()),
+    "telemetry": (["cli.py", "telemetry"], ()),
+    "pregen": (["cli.py", "pregen", "--help"], ()),
+    "worker": (["cli.py", "worker", "--help"], ()),
+    "serve": (["cli.py", "serve", "--help"], ()),
+    "keywords": (["cli.py", "keywords", "--help"], ()),
+    "invoices": (["cli.py", "invoices", "--help"], ()),
+}
+
+
+def _command(args: List[str], importtime: bool = False) -> List[str]:
+    args = [str(ROOT / a) if a.endswith(".py") else a for a in args]
+    return [sys.executable] + (["-X", "importtime"] if importtime else []) + args
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    # Jangan membuka port metrik atau thread pre-generate selama benchmark
+    for name in ("AUTOPRENEUR_METRICS_PORT", "AUTOPRENEUR_PREGEN"):
+        env.pop(name, None)
+    return env
+
+
+def time_path(args: List[str], runs: int, cwd: Path) -> List[float]:
+    """Wall time (ms) `runs` kali proses baru; satu run pemanasan untuk bytecode cache."""
+    env = _env()
+    subprocess.run(_command(args), cwd=cwd, env=env, capture_output=True)
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(_command(args), cwd=cwd, env=env, capture_output=True)
+        samples.append((time.perf_counter() - started) * 1000)
+        if result.returncode not in (0, 1):
+            raise RuntimeError(f"{' '.join(args)} gagal (exit {result.returncode}): "
+                               f"{result.stderr.decode(errors='replace').strip()[-300:]}")
+    return samples
+
+
+def import_profile(args: List[str], cwd: Path) -> Dict[str, int]:
+    """Waktu import kumulatif (µs) per modul top-level dari `-X importtime`."""
+    result = subprocess.run(_command(args, importtime=True), cwd=cwd, env=_env(), capture_output=True)
+    modules: Dict[str, int] = {}
+    for line in result.stderr.decode(errors="replace").splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        name = parts[2]
+        modules[name] = max(modules.get(name, 0), int(parts[1]))
+    return modules
+
+
+def heavy_loaded(modules: Dict[str, int]) -> List[str]:
+    return [m for m in HEAVY_MODULES if m in modules]
+
+
+def load_baseline(path: Path) -> Dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_baseline(path: Path, results: Dict[str, Dict]):
+    """Simpan waktu minimum per jalur; jalur yang tidak diukur kali ini tetap memakai baseline lama."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    paths = load_baseline(path).get("paths", {})
+    paths.update({name: r["min_ms"] for name, r in results.items()})
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "saved_at": time.time(),
+        "paths": paths,
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def is_regression(elapsed_ms: float, baseline_ms: Optional[float], threshold: float, slack_ms: float) -> bool:
+    if baseline_ms is None:
+        return False
+    return elapsed_ms > baseline_ms * threshold and elapsed_ms - baseline_ms > slack_ms
+
+
+def run(names: Sequence[str], runs: int, threshold: float, slack_ms: float,
+        baseline: Dict) -> Dict[str, Dict]:
+    results: Dict[str, Dict] = {}
+    floor = None
+    with tempfile.TemporaryDirectory(prefix="autopreneur-startup-") as tmp:
+        cwd = Path(tmp)
+        for name in names:
+            args, allowed = PATHS[name]
+            samples = time_path(args, runs, cwd)
+            modules = import_profile(args, cwd)
+            fastest = min(samples)
+            if name == "interpreter":
+                floor = fastest
+            base = baseline.get("paths", {}).get(name)
+            unexpected = [m for m in heavy_loaded(modules) if m not in allowed]
+            app_modules = {m: us for m, us in modules.items() if (ROOT / f"{m}.py").exists()}
+            results[name] = {
+                "median_ms": round(statistics.median(samples), 1),
+                "min_ms": round(fastest, 1),
+                "app_ms": round(fastest - floor, 1) if floor is not None else None,
+                "baseline_ms": base,
+                "ratio": round(fastest / base, 2) if base else None,
+                "heavy": unexpected,
+                "regression": is_regression(fastest, base, threshold, slack_ms) or bool(unexpected),
+                "slowest_imports": sorted(app_modules.items(), key=lambda kv: -kv[1])[:5],
+            }
+    return results
+
+
+def print_report(results: Dict[str, Dict], show_imports: bool):
+    print(f"{'Jalur':<12} {'min':>8} {'median':>8} {'app':>8} {'baseline':>9} {'rasio':>6}  status")
+    for name, r in results.items():
+        app_ms = f"{r['app_ms']:.1f}" if r["app_ms"] is not None else "-"
+        base = f"{r['baseline_ms']:.1f}" if r["baseline_ms"] else "-"
+        ratio = f"{r['ratio']:.2f}" if r["ratio"] else "-"
+        status = "❌ regresi" if r["regression"] else "✅"
+        if r["heavy"]:
+            status += f" (memuat {', '.join(r['heavy'])})"
+        print(f"{name:<12} {r['min_ms']:>8.1f} {r['median_ms']:>8.1f} {app_ms:>8} {base:>9} {ratio:>6}  {status}")
+        if show_imports:
+            for module, us in r["slowest_imports"]:
+                print(f"{'':<14}↳ {module:<22} {us / 1000:>7.1f} ms")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cold start CLI Autopreneur")
+    parser.add_argument("--only", nargs="+", choices=list(PATHS), metavar="JALUR",
+                        help=f"Jalur yang diukur (default semua: {', '.join(PATHS)})")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Jumlah run per jalur")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Rasio terhadap baseline yang dianggap regresi (default 1.25)")
+    parser.add_argument("--slack-ms", type=float, default=DEFAULT_SLACK_MS,
+                        help="Selisih minimum (ms) sebelum dianggap regresi")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Simpan hasil sebagai baseline baru")
+    parser.add_argument("--imports", action="store_true", help="Tampilkan modul aplikasi paling lambat di-import")
+    parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON")
+    args = parser.parse_args(argv)
+    if args.runs < 1:
+        parser.error("--runs minimal 1")
+
+    names = args.only or list(PATHS)
+    # Lantai interpreter selalu diukur lebih dulu agar kolom app (overhead aplikasi) terisi
+    if "interpreter" not in names:
+        names = ["interpreter"] + names
+    baseline = {} if args.save_baseline else load_baseline(args.baseline)
+    if baseline and baseline.get("python") != platform.python_version():
+        print(f"⚠️ Baseline dibuat dengan Python {baseline.get('python')}, sekarang {platform.python_version()}",
+              file=sys.stderr)
+
+    results = run(names, args.runs, args.threshold, args.slack_ms, baseline)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False))
+    else:
+        print_report(results, args.imports)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"💾 Baseline disimpan di {args.baseline}", file=sys.stderr)
+        return EXIT_OK
+    if not baseline and not args.json:
+        print("ℹ️ Belum ada baseline; jalankan dengan --save-baseline untuk mencatatnya.")
+    regressions = [name for name, r in results.items() if r["regression"]]
+    if regressions:
+        print(f"❌ Regresi cold start: {', '.join(regressions)}", file=sys.stderr)
+        return EXIT_REGRESSION
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
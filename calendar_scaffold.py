@@ -0,0 +1,225 @@
+# calendar_scaffold.py
+"""Kerangka kalender yang dihitung lokal untuk content_calendar dan yearend_planner.
+
+Tanggal, nama hari & bulan, nomor minggu, hari libur nasional, dan jam posting tidak lagi
+ditulis LLM. Prompt hanya memuat kerangka ringkas (hari & libur per minggu) dan LLM
+mengisi slot ide/tema/hashtag (lihat `schemas.LLM_SPECS`); `build_content_calendar()` /
+`build_yearend_planner()` menggabungkannya kembali menjadi data template lengkap.
+
+Libur Islam memakai kalender Hijriah tabular (`prayer_times`) sehingga bisa bergeser satu
+hari dari SKB; libur yang tidak bisa dihitung (Imlek di luar tabel, Nyepi, Waisak, cuti
+bersama) ditambahkan lewat file JSON `AUTOPRENEUR_HOLIDAYS` berisi {"2026-03-19": "Nyepi"}.
+"""
+import json
+import os
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from prayer_times import MONTHS, WEEKDAYS, hijri_to_date, to_hijri
+
+CALENDAR_WEEKS = 4
+PLANNER_MONTHS = 12
+MONTHS_SHORT = [m[:3] for m in MONTHS]
+HOLIDAYS_PATH = os.getenv("AUTOPRENEUR_HOLIDAYS")
+
+FIXED_HOLIDAYS = {
+    (1, 1): "Tahun Baru Masehi",
+    (5, 1): "Hari Buruh",
+    (6, 1): "Hari Lahir Pancasila",
+    (8, 17): "Hari Kemerdekaan RI",
+    (12, 25): "Hari Natal",
+}
+# (bulan, tanggal) Hijriah
+HIJRI_HOLIDAYS = {
+    (7, 27): "Isra Mikraj",
+    (10, 1): "Idul Fitri",
+    (10, 2): "Idul Fitri (hari kedua)",
+    (12, 10): "Idul Adha",
+    (1, 1): "Tahun Baru Islam",
+    (3, 12): "Maulid Nabi",
+}
+# Selisih hari dari Minggu Paskah
+EASTER_HOLIDAYS = {-2: "Wafat Isa Almasih", 0: "Paskah", 39: "Kenaikan Isa Almasih"}
+IMLEK = {2025: date(2025, 1, 29), 2026: date(2026, 2, 17), 2027: date(2027, 2, 6), 2028: date(2028, 1, 26)}
+# Momen belanja & konten yang bukan libur tapi relevan untuk UMKM
+SHOPPING_MOMENTS = {
+    (2, 14): "Hari Valentine",
+    (4, 21): "Hari Kartini",
+    (9, 9): "Promo 9.9",
+    (10, 10): "Promo 10.10",
+    (11, 11): "Promo 11.11",
+    (12, 12): "Harbolnas 12.12",
+    (12, 22): "Hari Ibu",
+}
+
+# Jam posting per jenis konten; akhir pekan & libur orang lebih aktif pagi-siang
+WEEKDAY_SLOTS = {"Educational": "19:00", "Promotional": "12:00", "Engagement": "20:00", "Behind the Scene": "16:00"}
+WEEKEND_SLOTS = {"Educational": "10:00", "Promotional": "11:00", "Engagement": "19:00", "Behind the Scene": "09:00"}
+
+
+def easter(year: int) -> date:
+    """Minggu Paskah (algoritma Gregorian anonim)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _extra_holidays() -> Dict[date, str]:
+    if not HOLIDAYS_PATH:
+        return {}
+    with open(HOLIDAYS_PATH, encoding="utf-8") as f:
+        return {date.fromisoformat(day): name for day, name in json.load(f).items()}
+
+
+@lru_cache(maxsize=None)
+def holidays(year: int) -> Dict[date, str]:
+    """Libur nasional dalam satu tahun Masehi (tanggal → nama), diurutkan."""
+    result = {date(year, month, day): name for (month, day), name in FIXED_HOLIDAYS.items()}
+    sunday = easter(year)
+    result.update({sunday + timedelta(days=offset): name for offset, name in EASTER_HOLIDAYS.items()})
+    if year in IMLEK:
+        result[IMLEK[year]] = "Tahun Baru Imlek"
+    first_hijri = to_hijri(date(year, 1, 1))[0]
+    for hijri_year in (first_hijri, first_hijri + 1):
+        for (month, day), name in HIJRI_HOLIDAYS.items():
+            gregorian = hijri_to_date(hijri_year, month, day)
+            if gregorian.year == year:
+                result[gregorian] = name
+    result.update({day: name for day, name in _extra_holidays().items() if day.year == year})
+    return dict(sorted(result.items()))
+
+
+def moments(day: date) -> List[str]:
+    """Libur & momen belanja pada satu tanggal."""
+    found = [holidays(day.year)[day]] if day in holidays(day.year) else []
+    moment = SHOPPING_MOMENTS.get((day.month, day.day))
+    return found + ([moment] if moment else [])
+
+
+def format_day(day: date) -> str:
+    """"Senin, 1 Jan"."""
+    return f"{WEEKDAYS[day.weekday()]}, {day.day} {MONTHS_SHORT[day.month - 1]}"
+
+
+def best_time(day: date, content_type: str) -> str:
+    weekend = day.weekday() >= 5 or day in holidays(day.year)
+    return (WEEKEND_SLOTS if weekend else WEEKDAY_SLOTS).get(content_type, "19:00")
+
+
+# --- CONTENT CALENDAR ---
+def calendar_start(today: Optional[date] = None) -> date:
+    """Kalender dimulai Senin berikutnya."""
+    today = today or date.today()
+    return today + timedelta(days=7 - today.weekday())
+
+
+def content_weeks(start: Optional[date] = None, weeks: int = CALENDAR_WEEKS) -> List[List[date]]:
+    start = start or calendar_start()
+    return [[start + timedelta(days=7 * w + d) for d in range(7)] for w in range(weeks)]
+
+
+def content_calendar_outline(start: Optional[date] = None) -> str:
+    """Kerangka ringkas untuk prompt: satu baris per minggu, libur & momen disebut."""
+    lines = []
+    for number, days in enumerate(content_weeks(start), 1):
+        notes = [f"{format_day(day)}: {', '.join(moments(day))}" for day in days if moments(day)]
+        span = f"{format_day(days[0])} - {format_day(days[-1])}"
+        lines.append(f"Week {number} ({span})" + (f"; special days: {'; '.join(notes)}" if notes else ""))
+    return "\n".join(lines)
+
+
+def slot_errors(data: Dict, weeks: int = CALENDAR_WEEKS) -> List[str]:
+    """Slot `weeks` dari LLM yang kurang dari kerangka (jumlah minggu, 7 hari per minggu)."""
+    llm_weeks = data.get("weeks")
+    if not isinstance(llm_weeks, list):
+        return []
+    errors = []
+    if len(llm_weeks) < weeks:
+        errors.append(f"weeks: harus {weeks} minggu, hanya {len(llm_weeks)}")
+    for i, week in enumerate(llm_weeks[:weeks]):
+        days = week.get("days") if isinstance(week, dict) else None
+        if isinstance(days, list) and len(days) < 7:
+            errors.append(f"weeks[{i}].days: harus 7 hari, hanya {len(days)}")
+    return errors
+
+
+def build_content_calendar(data: Dict, start: Optional[date] = None) -> Dict:
+    """Gabungkan slot LLM (`weeks`: tema, ide per hari, hashtag) dengan kerangka tanggal lokal.
+
+    ValueError jika slot kurang dari kerangka, agar kalender tidak pernah berlubang diam-diam.
+    """
+    if "weeks" not in data:
+        return data
+    errors = slot_errors(data)
+    if errors:
+        raise ValueError("Slot kalender tidak lengkap: " + "; ".join(errors))
+    weeks = content_weeks(start)
+    llm_weeks = data.pop("weeks")
+    calendar_weeks = []
+    for number, (days, week) in enumerate(zip(weeks, llm_weeks), 1):
+        calendar_weeks.append({
+            "week_number": number,
+            "theme": week["theme"],
+            "days": [{
+                "date": format_day(day),
+                "content_type": slot["content_type"],
+                "idea": slot["idea"],
+                "best_time": best_time(day, slot["content_type"]),
+            } for day, slot in zip(days, week["days"])],
+            "hashtags": week["hashtags"],
+        })
+    # Bulan & tahun mengikuti mayoritas hari dalam kalender
+    middle = weeks[len(weeks) // 2][0]
+    data.update({"month": MONTHS[middle.month - 1], "year": middle.year, "calendar_weeks": calendar_weeks})
+    return data
+
+
+# --- YEAR-END PLANNER ---
+def review_year(today: Optional[date] = None) -> int:
+    """Tahun yang direfleksikan: semester pertama masih meninjau tahun lalu."""
+    today = today or date.today()
+    return today.year if today.month >= 7 else today.year - 1
+
+
+def yearend_outline(today: Optional[date] = None) -> str:
+    plan_year = review_year(today) + 1
+    lines = [f"Reflect on {plan_year - 1}; monthly breakdown covers January-December {plan_year}."]
+    for month in range(1, 13):
+        names = [name for day, name in holidays(plan_year).items() if day.month == month]
+        if names:
+            lines.append(f"{MONTHS[month - 1]} {plan_year}: {', '.join(dict.fromkeys(names))}")
+    return "\n".join(lines)
+
+
+def yearend_slot_errors(data: Dict, months: int = PLANNER_MONTHS) -> List[str]:
+    """Slot `monthly_breakdown` dari LLM yang tidak tepat 12 bulan (Januari-Desember)."""
+    breakdown = data.get("monthly_breakdown")
+    if not isinstance(breakdown, list) or len(breakdown) == months:
+        return []
+    return [f"monthly_breakdown: harus {months} bulan, ada {len(breakdown)}"]
+
+
+def build_yearend_planner(data: Dict, today: Optional[date] = None) -> Dict:
+    """Isi tahun dan nama bulan `monthly_breakdown` (urutan Januari-Desember tahun rencana).
+
+    ValueError jika bulan tidak lengkap, agar label bulan tidak bergeser diam-diam.
+    """
+    year = review_year(today)
+    data["year"] = year
+    if "monthly_breakdown" not in data:
+        return data
+    errors = yearend_slot_errors(data)
+    if errors:
+        raise ValueError("Slot planner tidak lengkap: " + "; ".join(errors))
+    data["monthly_breakdown"] = [
+        {"name": f"{MONTHS[i]} {year + 1}", "focus": month["focus"], "tasks": month["tasks"]}
+        for i, month in enumerate(data["monthly_breakdown"])
+    ]
+    return data
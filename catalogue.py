@@ -0,0 +1,198 @@
+# catalogue.py
+import base64
+import bisect
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from records import iter_json_array
+
+# Produk lama (sebelum ada field product_type/suite) selalu berupa caption bank
+LEGACY_PRODUCT_TYPE = "caption_bank"
+LEGACY_SUITE = "umkm_productivity"
+
+SORT_FIELDS = {
+    "terbaru": ("created_at", True),
+    "terlama": ("created_at", False),
+    "nama": ("name", False),
+    "jenis": ("product_type", False),
+}
+
+# Posisi kolom di setiap baris index
+_ID, _NAME, _SUITE, _TYPE, _CREATED, _OFFSET, _LENGTH = range(7)
+
+
+def _file_signature(path: Path) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def _encode_cursor(key: Tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple:
+    return tuple(json.loads(base64.urlsafe_b64decode(cursor.encode("ascii"))))
+
+
+class ProductCatalogue:
+    """Katalog produk berhalaman yang hanya membaca record untuk halaman aktif.
+
+    Index ringkas (id, nama, suite, jenis, tanggal, offset byte) disimpan di samping
+    products.json dan hanya dibangun ulang jika mtime/ukuran products.json berubah.
+    Record lengkap dibaca langsung dari offset-nya, sedangkan ukuran dan keberadaan
+    file dihitung per halaman.
+    """
+
+    def __init__(self, db_path: Path, index_path: Path):
+        self.db_path = db_path
+        self.index_path = index_path
+        self._rows: List[list] = []
+        self._signature = None
+        self._views: Dict[Tuple, Tuple[List[Tuple], List[list]]] = {}
+
+    # --- Index ---
+    def refresh(self):
+        signature = _file_signature(self.db_path)
+        if signature == self._signature and self._signature is not None:
+            return
+        rows = None
+        if self.index_path.exists():
+            try:
+                stored = json.loads(self.index_path.read_text(encoding="utf-8"))
+                if stored.get("source") == signature:
+                    rows = stored["rows"]
+            except (json.JSONDecodeError, KeyError):
+                rows = None
+        if rows is None:
+            rows, complete = self._build_rows()
+            # Index dari file korup hanya dipakai sementara, jangan disimpan sebagai index valid
+            if complete:
+                self.index_path.write_text(json.dumps({"source": signature, "rows": rows}), encoding="utf-8")
+        self._rows = rows
+        self._signature = signature
+        self._views.clear()
+
+    def _build_rows(self) -> Tuple[List[list], bool]:
+        """Satu kali lewat products.json untuk mencatat offset byte setiap record.
+
+        Return (baris, lengkap); lengkap False jika products.json korup di tengah jalan.
+        """
+        if not self.db_path.exists():
+            return [], True
+        text = self.db_path.read_text(encoding="utf-8")
+        rows = []
+        byte_pos = char_pos = 0
+        try:
+            for record, start, end in iter_json_array(text):
+                byte_pos += len(text[char_pos:start].encode("utf-8"))
+                length = len(text[start:end].encode("utf-8"))
+                rows.append(self._row(record, byte_pos, length))
+                byte_pos += length
+                char_pos = end
+        except json.JSONDecodeError as e:
+            print(f"⚠️  Peringatan: {self.db_path.name} korup setelah {len(rows)} produk ({e}); "
+                  "katalog ditampilkan sebagian dan index tidak disimpan.")
+            return rows, False
+        return rows, True
+
+    @staticmethod
+    def _row(product: Dict[str, Any], offset: int, length: int) -> list:
+        product_type = product.get("product_type") or LEGACY_PRODUCT_TYPE
+        suite = product.get("suite") or (LEGACY_SUITE if product_type == LEGACY_PRODUCT_TYPE else "")
+        return [product["id"], product.get("name", ""), suite, product_type,
+                product.get("created_at") or 0, offset, length]
+
+    # --- Query ---
+    def _view(self, suite: Optional[str], product_type: Optional[str],
+              date_from: Optional[str], date_to: Optional[str], sort: str):
+        view_key = (suite, product_type, date_from, date_to, sort)
+        if view_key in self._views:
+            return self._views[view_key]
+
+        ts_from = datetime.strptime(date_from, "%Y-%m-%d").timestamp() if date_from else None
+        ts_to = datetime.strptime(date_to, "%Y-%m-%d").timestamp() + 86400 if date_to else None
+        rows = [
+            r for r in self._rows
+            if (not suite or r[_SUITE] == suite)
+            and (not product_type or r[_TYPE] == product_type)
+            and (ts_from is None or r[_CREATED] >= ts_from)
+            and (ts_to is None or r[_CREATED] < ts_to)
+        ]
+
+        field, descending = SORT_FIELDS[sort]
+        column = {"created_at": _CREATED, "name": _NAME, "product_type": _TYPE}[field]
+
+        def sort_key(r):
+            value = r[column]
+            if isinstance(value, str):
+                value = value.lower()
+            # Urutan menurun untuk angka cukup dengan negasi, sehingga cursor tetap bisa bisect
+            if descending:
+                value = -value
+            return (value, r[_ID])
+
+        rows.sort(key=sort_key)
+        keys = [sort_key(r) for r in rows]
+        self._views[view_key] = (keys, rows)
+        return keys, rows
+
+    def page(self, cursor: Optional[str] = None, page_size: int = 10,
+             suite: Optional[str] = None, product_type: Optional[str] = None,
+             date_from: Optional[str] = None, date_to: Optional[str] = None,
+             sort: str = "terbaru") -> Dict[str, Any]:
+        """Ambil satu halaman produk. `cursor` berasal dari `next_cursor` halaman sebelumnya."""
+        self.refresh()
+        keys, rows = self._view(suite, product_type, date_from, date_to, sort)
+        start = bisect.bisect_right(keys, _decode_cursor(cursor)) if cursor else 0
+        page_rows = rows[start:start + page_size]
+        end = start + len(page_rows)
+        return {
+            "items": self._read_records(page_rows),
+            "total": len(rows),
+            "start": start,
+            "next_cursor": _encode_cursor(keys[end - 1]) if end < len(rows) else None,
+        }
+
+    def _read_records(self, page_rows: List[list]) -> List[Dict[str, Any]]:
+        items = []
+        if not page_rows:
+            return items
+        with self.db_path.open("rb") as f:
+            for row in page_rows:
+                f.seek(row[_OFFSET])
+                record = json.loads(f.read(row[_LENGTH]).decode("utf-8"))
+                record.setdefault("product_type", row[_TYPE])
+                record.setdefault("suite", row[_SUITE])
+                items.append(record)
+        return items
+
+    def suites(self) -> List[str]:
+        self.refresh()
+        return sorted({r[_SUITE] for r in self._rows if r[_SUITE]})
+
+    def product_types(self) -> List[str]:
+        self.refresh()
+        return sorted({r[_TYPE] for r in self._rows})
+
+
+def describe_files(product: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Ukuran & keberadaan file produk, dipanggil hanya untuk produk di halaman aktif."""
+    described = []
+    for file_type, file_path in (product.get("files") or {}).items():
+        if not file_path:
+            continue
+        path = Path(file_path)
+        try:
+            size = path.stat().st_size
+            exists = True
+        except OSError:
+            size = 0
+            exists = False
+        described.append({"type": file_type, "name": path.name, "exists": exists, "size": size})
+    return described
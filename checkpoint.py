@@ -0,0 +1,128 @@
+# checkpoint.py
+import json
+import os
+import socket
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _write_json_atomic(path: Path, data: Any):
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    if os.name == "nt":
+        # os.kill(pid, 0) di Windows mengirim CTRL_C_EVENT, jadi anggap saja masih hidup
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SuiteCheckpoint:
+    """Checkpoint per-run untuk generate suite: data tiap produk disimpan begitu selesai.
+
+    Struktur folder:
+        <root>/<run_id>/checkpoint.json      meta run (suite, signal, product_id, status)
+        <root>/<run_id>/data/<product>.json  hasil LLM per produk
+    """
+
+    def __init__(self, run_dir: Path, validator: Optional[Callable[[str, Dict], List[str]]] = None):
+        self.run_dir = run_dir
+        self.data_dir = run_dir / "data"
+        self.meta_path = run_dir / "checkpoint.json"
+        self.validator = validator
+        self.meta: Dict[str, Any] = json.loads(self.meta_path.read_text(encoding="utf-8"))
+
+    @property
+    def run_id(self) -> str:
+        return self.meta["run_id"]
+
+    @classmethod
+    def create(cls, root: Path, suite_type: str, topic: str, signal_id: str, product_id: str,
+               run_id: Optional[str] = None, validator=None) -> "SuiteCheckpoint":
+        run_id = run_id or f"run_{uuid.uuid4().hex[:12]}"
+        run_dir = root / run_id
+        (run_dir / "data").mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(run_dir / "checkpoint.json", {
+            "run_id": run_id,
+            "suite_type": suite_type,
+            "topic": topic,
+            "signal_id": signal_id,
+            "product_id": product_id,
+            "status": "running",
+            "created_at": time.time(),
+        })
+        return cls(run_dir, validator)
+
+    @classmethod
+    def open(cls, root: Path, run_id: str, validator=None) -> Optional["SuiteCheckpoint"]:
+        run_dir = root / run_id
+        if not (run_dir / "checkpoint.json").exists():
+            return None
+        return cls(run_dir, validator)
+
+    @classmethod
+    def list_incomplete(cls, root: Path, include_active: bool = False) -> List["SuiteCheckpoint"]:
+        """Run yang belum selesai; run yang masih dikerjakan proses hidup dilewati kecuali diminta."""
+        if not root.exists():
+            return []
+        runs = [cls(p.parent) for p in root.glob("*/checkpoint.json")]
+        return sorted((r for r in runs if r.meta.get("status") != "complete"
+                       and (include_active or not r.is_active())),
+                      key=lambda r: r.meta.get("created_at", 0))
+
+    def claim(self):
+        """Tandai run sedang dikerjakan proses ini."""
+        self.mark("running", owner={"host": socket.gethostname(), "pid": os.getpid()})
+
+    def is_active(self) -> bool:
+        """True jika run berstatus running dan proses pemiliknya masih hidup.
+
+        Pemilik di host lain dianggap hidup; run lama tanpa pemilik dianggap terhenti.
+        """
+        owner = self.meta.get("owner")
+        if self.meta.get("status") != "running" or not owner:
+            return False
+        if owner.get("host") != socket.gethostname():
+            return True
+        return _pid_alive(owner.get("pid"))
+
+    def _data_path(self, product_type: str) -> Path:
+        return self.data_dir / f"{product_type}.json"
+
+    def load(self, product_type: str) -> Optional[Dict[str, Any]]:
+        """Data produk tersimpan, atau None jika belum ada / korup / tidak lolos validasi."""
+        path = self._data_path(product_type)
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        if self.validator and self.validator(product_type, data):
+            return None
+        return data
+
+    def save(self, product_type: str, data: Dict[str, Any]):
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(self._data_path(product_type), data)
+
+    def completed_products(self) -> List[str]:
+        return sorted(p.stem for p in self.data_dir.glob("*.json") if self.load(p.stem) is not None)
+
+    def mark(self, status: str, **fields):
+        self.meta.update(status=status, updated_at=time.time(), **fields)
+        _write_json_atomic(self.meta_path, self.meta)
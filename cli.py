@@ -0,0 +1,580 @@
+# cli.py
+"""CLI non-interaktif Autopreneur untuk cron, skrip, dan pipeline.
+
+Contoh:
+    python cli.py scan "caption IG UMKM kuliner" "SOP restoran padang" --jobs 2
+    python cli.py generate --top 5 --type caption_bank --jobs 3 --json
+    python cli.py generate --signal 1a2b3c4d --suite umkm_productivity
+    python cli.py generate --top 50 --type wedding_planner --batch
+    python cli.py render --all
+    python cli.py resume run_1a2b3c4d5e6f
+    python cli.py export products --format csv --output produk.csv
+    python cli.py generate --top 200 --suite seasonal --queue && python cli.py worker --workers 8
+    python cli.py serve --port 8080 --concurrency 4
+    python cli.py telemetry --since 24
+    python cli.py pregen --limit 5
+    python cli.py keywords "kopi susu gula aren" --top 20
+    python cli.py invoices pesanan_oktober.csv --company toko.json --output invoices/oktober --workers 4
+    python cli.py imsakiyah --cities kabupaten_kota.csv --output imsakiyah.csv
+    python cli.py plan --top 200 --suite seasonal --workers 8 --budget 500000
+    python cli.py generate --top 200 --suite seasonal --jobs 8 --budget 500000 --max-hours 2
+    python cli.py --trace --profile-render generate --signal 1a2b3c4d --type wedding_planner
+"""
+import argparse
+import contextlib
+import contextvars
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import invoice_batch
+import keyword_index
+import main as app
+import metrics
+import planner
+import prayer_times
+import pregen
+import scheduler
+import telemetry
+import tracing
+from job_queue import JobQueue
+from template_renderer import TemplateRenderer
+import worker
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_CONFIG = 3
+
+EXPORT_FIELDS = {
+    "signals": ["id", "topic", "score", "status", "report_file", "created_at", "forked_from"],
+    "products": ["id", "signal_id", "name", "description", "product_type", "suite", "created_at"],
+}
+
+
+class UsageError(Exception):
+    """Argumen valid secara sintaks tapi tidak bisa diproses (mis. ID tidak dikenal)."""
+
+
+def run_jobs(func: Callable[[Any], Dict], items: List[Any], jobs: int) -> List[Dict]:
+    """Jalankan `func` untuk setiap item dengan maksimal `jobs` thread, urutan hasil tetap."""
+    def safe(item):
+        try:
+            return {"ok": True, **func(item)}
+        except Exception as e:
+            return {"ok": False, "input": item if isinstance(item, str) else item.get('id'), "error": str(e)}
+
+    if jobs <= 1 or len(items) <= 1:
+        return [safe(item) for item in items]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # Salin context per item agar span tracing tetap bersarang di bawah span perintah
+        futures = [pool.submit(contextvars.copy_context().run, safe, item) for item in items]
+        return [f.result() for f in futures]
+
+
+# --- SUBCOMMAND ---
+def submit_jobs(kind: str, payloads: List[Dict], args) -> List[Dict]:
+    """Masukkan pekerjaan ke antrian job daemon alih-alih menjalankannya langsung."""
+    queue = JobQueue(worker.JOBS_DB_PATH)
+    try:
+        return [
+            {"ok": True, "input": payload, "job_id": queue.submit(kind, payload, args.priority, args.max_attempts)}
+            for payload in payloads
+        ]
+    finally:
+        queue.close()
+
+
+def cmd_scan(args) -> List[Dict]:
+    if args.queue:
+        return submit_jobs("scan", [{"topic": t, "on_duplicate": args.on_duplicate} for t in args.topics], args)
+
+    def scan(topic: str) -> Dict:
+        if args.on_duplicate != "scan":
+            matches = app.find_duplicates(topic)
+            if matches:
+                source = app.signals_repo.get(matches[0]['signal_id'])
+                if args.on_duplicate == "reuse":
+                    return {"input": topic, "action": "reused", "similarity": matches[0]['similarity'], "signal": source}
+                return {"input": topic, "action": "forked", "similarity": matches[0]['similarity'],
+                        "signal": app.fork_signal(topic, source)}
+        return {"input": topic, "action": "scanned", "signal": app.scan_topic(topic)}
+
+    return run_jobs(scan, args.topics, args.jobs)
+
+
+def select_signals(args) -> List[Dict]:
+    if args.signal:
+        signals = []
+        for signal_id in args.signal:
+            signal = app.signals_repo.get(signal_id)
+            if signal is None:
+                raise UsageError(f"Signal tidak ditemukan: {signal_id}")
+            signals.append(signal)
+        return signals
+    queue = app.load_signal_queue()
+    return [app.signals_repo.get(sid) for sid in queue.peek(args.top)]
+
+
+def batch_jobs(args, signals: List[Dict]) -> List[List[str]]:
+    """Jenis produk per job untuk planner: satu suite dikerjakan berurutan dalam satu job."""
+    product_types = TemplateRenderer.SUITES[args.suite] if args.suite else [args.type]
+    return [list(product_types) for _ in signals]
+
+
+def make_plan(args, signals: List[Dict], workers: int, trim: bool = True) -> Dict[str, Any]:
+    max_seconds = args.max_hours * 3600 if args.max_hours else None
+    try:
+        return planner.plan_batch(batch_jobs(args, signals), workers, args.budget, max_seconds,
+                                  trim=trim, products=app.products_repo.all())
+    except planner.BudgetExceeded as e:
+        print_plan(e.plan)
+        raise UsageError(f"{e}; batch dibatalkan (--strict-budget)")
+
+
+def print_plan(plan: Dict[str, Any]):
+    print(f"🧮 Rencana: {plan['jobs']} job / {plan['products']} produk, {plan['llm_calls']} panggilan LLM, "
+          f"{plan['workers']} worker")
+    print(f"   ⏱️  ~{planner.format_duration(plan['wall_seconds'])} (p90 ~{planner.format_duration(plan['wall_seconds_p90'])}), "
+          f"dibatasi oleh {plan['bottleneck']}; concurrency disarankan: {plan['recommended_concurrency']}")
+    print(f"   💰 ~Rp {plan['cost_idr']:,.0f} (${plan['cost_usd']:.2f}), "
+          f"{plan['prompt_tokens'] + plan['completion_tokens']:,} token")
+    print(f"   💾 ~{app.format_size(plan['disk_bytes'])} (sisa disk {app.format_size(plan['disk_free'])})")
+    for product_type, s in plan['per_type'].items():
+        print(f"   • {product_type:<18} LLM {s['llm_seconds']:6.1f}d  render {s['render_seconds']:5.1f}d  "
+              f"Rp {s['cost_usd'] * telemetry.USD_TO_IDR:8,.0f}/produk  ({s['source']})")
+    if plan['disk_bytes'] > plan['disk_free']:
+        print("   ⚠️ Perkiraan ukuran file melebihi sisa disk!")
+    if plan['trimmed']:
+        kept = plan['kept']
+        print(f"   ✂️  Melebihi anggaran: hanya {plan['keep']} job pertama yang dijalankan "
+              f"(~Rp {kept['cost_idr']:,.0f}, ~{planner.format_duration(kept['wall_seconds'])})")
+
+
+def cmd_plan(args) -> List[Dict]:
+    signals = select_signals(args)
+    return [{"ok": True, "input": "plan", "plan": make_plan(args, signals, args.workers or args.jobs)}]
+
+
+def cmd_generate(args) -> List[Dict]:
+    signals = select_signals(args)
+    if args.budget is not None or args.max_hours is not None:
+        plan = make_plan(args, signals, 1 if args.batch else args.jobs, trim=not args.strict_budget)
+        print_plan(plan)
+        signals = signals[:plan['keep']]
+    if args.queue:
+        if args.suite:
+            payloads = [{"signal_id": s['id'], "suite": args.suite} for s in signals]
+            return submit_jobs("generate_suite", payloads, args)
+        payloads = [{"signal_id": s['id'], "product_type": args.type} for s in signals]
+        return submit_jobs("generate_product", payloads, args)
+
+    if args.batch:
+        products, errors = app.generate_products_batch(signals, args.type)
+        by_signal = {p['signal_id']: p for p in products}
+        return [
+            {"ok": True, "input": s['id'], "product": by_signal[s['id']]} if s['id'] in by_signal
+            else {"ok": False, "input": s['id'], "error": errors.get(s['id'], "unknown error")}
+            for s in signals
+        ]
+
+    def generate(signal: Dict) -> Dict:
+        # Tanpa --tenant, slot penjadwal dibagi menurut tenant pemilik signal
+        with scheduler.context(tenant=None if args.tenant else signal.get('tenant')):
+            if args.suite:
+                product = app.generate_suite(signal, args.suite)
+            else:
+                product = app.generate_product(signal, args.type)
+        return {"input": signal['id'], "product": product}
+
+    return run_jobs(generate, signals, args.jobs)
+
+
+def cmd_render(args) -> List[Dict]:
+    if args.all:
+        products = list(app.products_repo.all())
+    else:
+        products = []
+        for product_id in args.products:
+            product = app.products_repo.get(product_id)
+            if product is None:
+                raise UsageError(f"Produk tidak ditemukan: {product_id}")
+            products.append(product)
+    if args.queue:
+        return submit_jobs("render", [{"product_id": p['id']} for p in products], args)
+
+    def render(product: Dict) -> Dict:
+        return {"input": product['id'], "files": app.rerender_product(product)}
+
+    return run_jobs(render, products, args.jobs)
+
+
+def cmd_export(args) -> List[Dict]:
+    repo = app.signals_repo if args.what == "signals" else app.products_repo
+    rows = [r.to_dict() for r in repo.all()]
+    if args.status:
+        rows = [r for r in rows if r.get('status') == args.status]
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.__stdout__
+    try:
+        if args.format == "csv":
+            writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS[args.what], extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, out, indent=2, ensure_ascii=False)
+            out.write("\n")
+    finally:
+        if args.output:
+            out.close()
+    return [{"ok": True, "input": args.what, "count": len(rows), "output": args.output or "-"}]
+
+
+def cmd_imsakiyah(args) -> List[Dict]:
+    cities = prayer_times.load_cities(args.cities) if args.cities else list(prayer_times.CITIES.values())
+    start = prayer_times.ramadan_start(start=args.start)
+    if args.signal:
+        signal = app.signals_repo.get(args.signal)
+        if signal is None:
+            raise UsageError(f"Signal tidak ditemukan: {args.signal}")
+        # Konten ditulis LLM sekali; jadwal & kalender tiap kota dihitung lokal
+        assets = app.BuilderAgent().generate_product_assets(signal['topic'], "ramadan_calendar")
+        by_name = {city.name: city for city in cities}
+
+        def edition(name: str) -> Dict:
+            return {"input": name, "product": app.generate_ramadan_edition(signal, assets, by_name[name], start)}
+
+        return run_jobs(edition, list(by_name), args.jobs)
+
+    table = prayer_times.schedule(cities, start)
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.__stdout__
+    try:
+        if args.format == "csv":
+            count = prayer_times.write_csv(table, out)
+        else:
+            json.dump(table, out, indent=2, ensure_ascii=False)
+            out.write("\n")
+            count = sum(len(rows) for rows in table.values())
+    finally:
+        if args.output:
+            out.close()
+    return [{"ok": True, "input": "imsakiyah", "count": count, "output": args.output or "-"}]
+
+
+def cmd_keywords(args) -> List[Dict]:
+    index = keyword_index.get_index()
+
+    def suggest(topic: str) -> Dict:
+        return {"input": topic, "keywords": [s._asdict() for s in index.peek(topic, args.top)]}
+
+    return run_jobs(suggest, args.topics, 1)
+
+
+def cmd_invoices(args) -> List[Dict]:
+    try:
+        company = invoice_batch.load_company(args.company)
+        summary = invoice_batch.run(args.csv, args.output, company, workers=args.workers,
+                                    name=args.name, restart=args.restart)
+    except (OSError, json.JSONDecodeError, invoice_batch.InvoiceError) as e:
+        raise UsageError(str(e))
+    errors = summary.pop("errors")
+    return [{"ok": True, "input": str(args.csv), "invoices": summary}] + [
+        {"ok": False, "input": number, "error": error} for number, error in errors.items()]
+
+
+def cmd_resume(args) -> List[Dict]:
+    run_ids = args.runs or [r.run_id for r in app.SuiteCheckpoint.list_incomplete(app.RUNS_DIR)]
+
+    def resume(run_id: str) -> Dict:
+        return {"input": run_id, "product": app.resume_suite_run(run_id)}
+
+    return run_jobs(resume, run_ids, args.jobs)
+
+
+def cmd_jobs(args) -> List[Dict]:
+    queue = JobQueue(worker.JOBS_DB_PATH)
+    try:
+        if args.action == "retry":
+            return [{"ok": True, "input": args.job_id or "dead", "requeued": queue.retry_dead(args.job_id)}]
+        if args.action == "list":
+            return [{"ok": True, "input": "jobs", "jobs": queue.list(args.status, args.limit)}]
+        return [{"ok": True, "input": "jobs", "stats": queue.stats()}]
+    finally:
+        queue.close()
+
+
+def cmd_worker(args) -> List[Dict]:
+    worker.run_daemon(args.workers, lease_seconds=args.lease)
+    return []
+
+
+def cmd_telemetry(args) -> List[Dict]:
+    since = time.time() - args.since * 3600 if args.since else None
+    records = telemetry.load_records(since=since)
+    return [{"ok": True, "input": "telemetry", "calls": len(records), "summary": telemetry.summarize(records)}]
+
+
+def cmd_pregen(args) -> List[Dict]:
+    return pregen.run_once(args.limit)
+
+
+def cmd_serve(args) -> List[Dict]:
+    # asyncio & server HTTP hanya dimuat untuk perintah ini; default opsi ada di api_server
+    import api_server
+    argv = []
+    for flag, value in (("--host", args.host), ("--port", args.port),
+                        ("--concurrency", args.concurrency), ("--queue-size", args.queue_size)):
+        if value is not None:
+            argv += [flag, str(value)]
+    api_server.main(argv)
+    return []
+
+
+def add_budget_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--budget", type=float, metavar="RP", help="Batas biaya LLM (Rupiah)")
+    parser.add_argument("--max-hours", type=float, metavar="JAM", help="Batas perkiraan durasi batch")
+
+
+def add_queue_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--queue", action="store_true", help="Kirim ke antrian job daemon, jangan jalankan langsung")
+    parser.add_argument("--priority", type=int, default=0, help="Prioritas job antrian (lebih besar lebih dulu)")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Batas percobaan sebelum dead-letter")
+
+
+# --- PARSER ---
+def build_parser() -> argparse.ArgumentParser:
+    suites = list(TemplateRenderer.SUITES)
+    product_types = [t for types in TemplateRenderer.SUITES.values() for t in types]
+
+    parser = argparse.ArgumentParser(prog="autopreneur", description="Autopreneur CLI (non-interaktif)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Jumlah pekerjaan paralel (default 1)")
+    parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON ke stdout")
+    parser.add_argument("--trace", action="store_true", help="Tulis trace per tahap ke db/traces/ (format Chrome)")
+    parser.add_argument("--profile-render", action="store_true",
+                        help="Dengan --trace: profil sampling tahap render (file .folded)")
+    parser.add_argument("--tenant", help="Tenant untuk penjadwal fair-share (default: tenant signal)")
+    parser.add_argument("--priority-class", choices=scheduler.PRIORITIES,
+                        default=scheduler.DEFAULT_PRIORITY, help="Kelas prioritas penjadwal (default batch)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scan = sub.add_parser("scan", help="Riset & beri skor satu atau beberapa topik")
+    scan.add_argument("topics", nargs="+")
+    scan.add_argument("--on-duplicate", choices=["reuse", "fork", "scan"], default="reuse",
+                      help="Tindakan jika topik hampir sama dengan signal lama (default reuse)")
+    add_queue_args(scan)
+    scan.set_defaults(func=cmd_scan, needs_api=True)
+
+    generate = sub.add_parser("generate", help="Generate produk atau suite dari signal")
+    target = generate.add_mutually_exclusive_group(required=True)
+    target.add_argument("--signal", nargs="+", metavar="ID", help="ID signal yang akan di-generate")
+    target.add_argument("--top", type=int, metavar="N", help="Ambil N signal prioritas tertinggi")
+    kind = generate.add_mutually_exclusive_group()
+    kind.add_argument("--type", choices=product_types, default="caption_bank", help="Jenis produk (default caption_bank)")
+    kind.add_argument("--suite", choices=suites, help="Generate satu suite lengkap")
+    generate.add_argument("--batch", action="store_true",
+                          help="Gabungkan beberapa topik dalam satu request LLM (hanya untuk --type)")
+    add_budget_args(generate)
+    generate.add_argument("--strict-budget", action="store_true",
+                          help="Batalkan seluruh batch jika melebihi anggaran (default: pangkas)")
+    add_queue_args(generate)
+    generate.set_defaults(func=cmd_generate, needs_api=True)
+
+    plan = sub.add_parser("plan", help="Perkirakan waktu, biaya & disk batch generate tanpa menjalankannya")
+    plan_target = plan.add_mutually_exclusive_group(required=True)
+    plan_target.add_argument("--signal", nargs="+", metavar="ID")
+    plan_target.add_argument("--top", type=int, metavar="N")
+    plan_kind = plan.add_mutually_exclusive_group()
+    plan_kind.add_argument("--type", choices=product_types, default="caption_bank")
+    plan_kind.add_argument("--suite", choices=suites)
+    plan.add_argument("--workers", type=int, help="Jumlah worker/concurrency (default --jobs)")
+    add_budget_args(plan)
+    plan.set_defaults(func=cmd_plan, needs_api=False)
+
+    render = sub.add_parser("render", help="Render ulang produk dari data JSON tersimpan")
+    render_target = render.add_mutually_exclusive_group(required=True)
+    render_target.add_argument("products", nargs="*", default=[], metavar="PRODUCT_ID")
+    render_target.add_argument("--all", action="store_true", help="Render ulang semua produk")
+    add_queue_args(render)
+    render.set_defaults(func=cmd_render, needs_api=False)
+
+    export = sub.add_parser("export", help="Ekspor DB signal atau produk")
+    export.add_argument("what", choices=["signals", "products"])
+    export.add_argument("--format", choices=["json", "csv"], default="json")
+    export.add_argument("--status", help="Filter signal berdasarkan status (mis. new)")
+    export.add_argument("--output", "-o", help="File tujuan (default stdout)")
+    export.set_defaults(func=cmd_export, needs_api=False)
+
+    imsakiyah = sub.add_parser("imsakiyah", help="Jadwal imsakiyah Ramadan banyak kota, dihitung lokal")
+    imsakiyah.add_argument("--cities", type=Path, metavar="CSV",
+                           help="CSV kabupaten/kota: name,latitude,longitude[,timezone][,elevation] "
+                                "(default ibu kota provinsi)")
+    imsakiyah.add_argument("--start", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                           help="Tanggal 1 Ramadan hasil sidang isbat (default kalender Hijriah tabular)")
+    imsakiyah.add_argument("--format", choices=["csv", "json"], default="csv")
+    imsakiyah.add_argument("--output", "-o", help="File tujuan (default stdout)")
+    imsakiyah.add_argument("--signal", metavar="ID",
+                           help="Buat produk ramadan_calendar per kota dari signal ini (satu panggilan LLM)")
+    imsakiyah.set_defaults(func=cmd_imsakiyah, needs_api=False)
+
+    keywords = sub.add_parser("keywords", help="Saran kata kunci per topik dari index laporan riset & produk")
+    keywords.add_argument("topics", nargs="+", metavar="TOPIK")
+    keywords.add_argument("--top", type=int, default=keyword_index.TOP_KEYWORDS, help="Jumlah kata kunci per topik")
+    keywords.set_defaults(func=cmd_keywords, needs_api=False)
+
+    invoices = sub.add_parser("invoices", help="Invoice PDF massal dari CSV ekspor pesanan, dihitung lokal")
+    invoices.add_argument("csv", type=Path, help="CSV satu baris per item (lihat invoice_batch.py)")
+    invoices.add_argument("--company", type=Path, metavar="JSON",
+                          help="Data toko & rekening: company_name, company_address, company_phone, "
+                               "bank_name, account_number, account_name, notes")
+    invoices.add_argument("--output", "-o", type=Path, default=Path("invoices"), help="Folder PDF (default invoices/)")
+    invoices.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Proses render paralel")
+    invoices.add_argument("--name", default="Invoice", help="Judul dokumen invoice")
+    invoices.add_argument("--restart", action="store_true", help="Abaikan progres lama dan render ulang semua")
+    invoices.set_defaults(func=cmd_invoices, needs_api=False)
+
+    resume = sub.add_parser("resume", help="Lanjutkan run suite yang gagal/terhenti dari checkpoint")
+    resume.add_argument("runs", nargs="*", metavar="RUN_ID", help="Default: semua run yang belum selesai dan tidak sedang berjalan")
+    resume.set_defaults(func=cmd_resume, needs_api=True)
+
+    jobs = sub.add_parser("jobs", help="Lihat atau kelola antrian job daemon")
+    jobs.add_argument("action", choices=["stats", "list", "retry"])
+    jobs.add_argument("job_id", nargs="?", help="ID job untuk retry (default semua dead-letter)")
+    jobs.add_argument("--status", choices=["queued", "running", "done", "dead"])
+    jobs.add_argument("--limit", type=int, default=50)
+    jobs.set_defaults(func=cmd_jobs, needs_api=False)
+
+    daemon = sub.add_parser("worker", help="Jalankan daemon worker untuk antrian job")
+    daemon.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    daemon.add_argument("--lease", type=float, default=worker.LEASE_SECONDS, help="Durasi lease job (detik)")
+    daemon.set_defaults(func=cmd_worker, needs_api=True)
+
+    stats = sub.add_parser("telemetry", help="Ringkasan latensi, token & biaya LLM per jenis produk")
+    stats.add_argument("--since", type=float, metavar="JAM", help="Hanya panggilan N jam terakhir")
+    stats.set_defaults(func=cmd_telemetry, needs_api=False)
+
+    speculate = sub.add_parser("pregen", help="Pre-generate produk untuk signal berskor tinggi (anggaran harian)")
+    speculate.add_argument("--limit", type=int, default=5, help="Maksimal signal yang diproses")
+    speculate.set_defaults(func=cmd_pregen, needs_api=True)
+
+    serve = sub.add_parser("serve", help="Jalankan HTTP API asinkron untuk storefront")
+    serve.add_argument("--host")
+    serve.add_argument("--port", type=int)
+    serve.add_argument("--concurrency", type=int, help="Maksimal job berjalan bersamaan")
+    serve.add_argument("--queue-size", type=int, help="Kapasitas antrian sebelum membalas 429")
+    serve.set_defaults(func=cmd_serve, needs_api=True)
+
+    return parser
+
+
+def writes_stdout(args) -> bool:
+    """Perintah yang menulis data (bukan log) ke stdout."""
+    return args.command in ("export", "imsakiyah") and not args.output and not getattr(args, "signal", None)
+
+
+def report(args, results: List[Dict]):
+    failed = [r for r in results if not r["ok"]]
+    # Data ekspor sudah ditulis ke stdout, jangan dicampur dengan ringkasan
+    if writes_stdout(args) or args.command in ("worker", "serve"):
+        return
+    if args.json:
+        payload = {"command": args.command, "ok": not failed, "results": results}
+        print(json.dumps(payload, ensure_ascii=False, default=app.record_to_json))
+        return
+    for r in results:
+        if not r["ok"]:
+            print(f"❌ {r['input']}: {r['error']}")
+        elif "signal" in r:
+            s = r["signal"]
+            print(f"✅ [{r['action']}] {s['id']} skor {s['score']}: {s['topic']}")
+        elif "product" in r:
+            print(f"✅ {r['input']} → {r['product']['id']} ({r['product']['name']})")
+        elif "files" in r:
+            print(f"✅ {r['input']}: {len(r['files'])} file dirender ulang")
+        elif "job_id" in r:
+            print(f"📥 {r['job_id']} masuk antrian: {json.dumps(r['input'], ensure_ascii=False)}")
+        elif "stats" in r:
+            print("📊 Antrian job: " + (" | ".join(f"{k}: {v}" for k, v in sorted(r['stats'].items())) or "kosong"))
+        elif "jobs" in r:
+            for job in r['jobs']:
+                error = (job['last_error'] or "").splitlines()[0] if job['last_error'] else ""
+                print(f"• {job['id']} {job['kind']:<17} {job['status']:<8} {job['attempts']}/{job['max_attempts']} {error}")
+        elif "summary" in r:
+            print(f"{'operasi':<16} {'produk':<18} {'call':>5} {'err':>4} {'p50 s':>7} {'p90 s':>7} "
+                  f"{'p99 s':>7} {'ttft s':>7} {'tok out':>8} {'biaya Rp':>10}")
+            for row in r['summary']:
+                secs = [f"{row[k] / 1000:7.1f}" if row[k] is not None else f"{'-':>7}"
+                        for k in ("wall_p50_ms", "wall_p90_ms", "wall_p99_ms", "ttft_p50_ms")]
+                print(f"{row['operation']:<16} {row['product_type']:<18} {row['calls']:>5} {row['errors']:>4} "
+                      f"{' '.join(secs)} {row['completion_tokens_avg']:>8.0f} {row['cost_idr']:>10,.0f}")
+            total = sum(row['cost_idr'] for row in r['summary'])
+            print(f"\n💰 {r['calls']} panggilan, total estimasi biaya Rp {total:,.0f}")
+        elif "speculated" in r:
+            print(f"⚡ {r['input']}: " + ("siap dipakai" if r['speculated'] else "dilewati"))
+        elif "plan" in r:
+            print_plan(r['plan'])
+        elif "invoices" in r:
+            i = r['invoices']
+            print(f"🧾 {r['input']}: {i['rendered']} dirender, {i['skipped']} sudah ada, {i['failed']} gagal "
+                  f"dalam {i['elapsed_seconds']} detik ({i['per_minute']}/menit) → {i['output']}")
+        elif "keywords" in r:
+            print(f"🔑 {r['input']}: {len(r['keywords'])} kata kunci")
+            for k in r['keywords']:
+                print(f"   {k['keyword']:<32} relevansi {k['relevance']:.2f}  co-occurrence {k['cooccurrence']:>4.0%}"
+                      f"  {k['documents']} dokumen")
+        elif "requeued" in r:
+            print(f"♻️  {r['requeued']} job dikembalikan ke antrian")
+        else:
+            print(f"✅ {r['count']} {r['input']} diekspor ke {r['output']}")
+    print(f"\n📊 Selesai: {len(results) - len(failed)} berhasil, {len(failed)} gagal")
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs minimal 1")
+    if args.command == "invoices" and args.workers < 1:
+        parser.error("--workers minimal 1")
+    if args.command in ("generate", "plan", "keywords") and args.top is not None and args.top < 1:
+        parser.error("--top minimal 1")
+    if args.command == "generate" and args.batch and (args.suite or args.queue):
+        parser.error("--batch hanya bisa dipakai dengan --type dan tanpa --queue")
+
+    app.ensure_setup()
+    if args.trace:
+        tracing.enable(profile_render=args.profile_render)
+    needs_api = args.needs_api or (args.command == "imsakiyah" and args.signal)
+    if needs_api and not os.getenv("OPENAI_API_KEY"):
+        print("❌ ERROR: OpenAI API Key tidak ditemukan (OPENAI_API_KEY).", file=sys.stderr)
+        return EXIT_CONFIG
+
+    # Dalam mode JSON, log progres agent/renderer dialihkan ke stderr agar stdout bisa di-pipe
+    log_target = sys.stderr if args.json or writes_stdout(args) else sys.stdout
+    # serve & worker mengekspor metrik dari prosesnya sendiri; perintah singkat lain hanya lewat
+    # textfile karena port HTTP akan bentrok antar pemanggilan CLI/cron yang berjalan bersamaan
+    exporter = metrics.TextfileExporter("cli") if args.command not in ("serve", "worker") else None
+    try:
+        with contextlib.redirect_stdout(log_target), tracing.span(f"cli.{args.command}"), \
+                scheduler.context(args.tenant, args.priority_class):
+            if exporter:
+                exporter.start()
+            results = args.func(args)
+    except UsageError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_USAGE
+    finally:
+        if exporter:
+            exporter.stop()
+
+    report(args, results)
+    return EXIT_OK if all(r["ok"] for r in results) else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+# hashtag_engine.py
+"""Cluster hashtag lokal dari korpus produk yang sudah digenerate.
+
+Hashtag di output caption_bank, content_calendar dan copy_swipes (`products/**/<jenis>_data.json`)
+dikumpulkan per "dokumen" (satu caption, satu minggu kalender, satu swipe). Dari situ dibangun
+matriks co-occurrence sparse (Counter berkunci pasangan id tag, tanpa numpy/scipy), graf tetangga
+berbobot Ochiai c(a,b)/√(c(a)·c(b)) yang dipangkas ke tetangga terkuat, lalu komunitas dicari
+dengan label propagation (linear terhadap jumlah sisi). Sejuta kemunculan hashtag selesai dalam
+hitungan detik dan tanpa biaya API.
+
+Untuk satu topik, tag yang memuat kata topik menjadi benih; benih, tetangganya, dan anggota
+komunitasnya diurutkan menurut relevansi lalu dibagi ke cluster template:
+- High/Medium/Low Competition: tertil frekuensi pemakaian di korpus
+- Community: tag dari komunitas tetangga yang bersinggungan dengan topik
+
+`posts_count` = jumlah pemakaian di korpus sendiri (bukan jumlah post Instagram) dan
+`engagement_rate` = persentase pemakaian tag yang muncul bersama tag topik terdekatnya. Jika korpus belum
+cukup menutupi topik, `fill_clusters()` tidak mengisi `clusters` dan BuilderAgent memintanya ke LLM.
+"""
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from similarity import tokenize
+
+CORPUS_TYPES = ("caption_bank", "content_calendar", "copy_swipes")
+
+# Minimal tag relevan di korpus sebelum cluster dihitung lokal; di bawahnya LLM yang mengisi
+MIN_TOPIC_TAGS = int(os.getenv("AUTOPRENEUR_HASHTAG_MIN_TAGS", "15"))
+TAGS_PER_CLUSTER = 20
+MIN_COOCCURRENCE = 2
+NEIGHBORS = 25
+# Dokumen dengan puluhan tag (spam) dipotong agar pasangan tidak tumbuh kuadratik
+MAX_DOC_TAGS = 30
+MAX_ITERATIONS = 20
+
+# Tag kompetisi tinggi cepat tenggelam di jam ramai; tag kecil & komunitas paling hidup malam hari
+BEST_TIMES = {
+    "High Competition": "21:00",
+    "Medium Competition": "19:00",
+    "Low Competition": "12:00",
+    "Community": "20:00",
+}
+
+HASHTAG_RE = re.compile(r"#([^\W_]\w*)")
+_PAIR_SHIFT = 32
+
+
+def _products_dir() -> Path:
+    import main as app
+    return app.PRODUCTS_DIR
+
+
+def normalize_tag(tag: str) -> Optional[str]:
+    """"#KopiSusu " / "kopisusu" → "#kopisusu"; None jika bukan hashtag."""
+    match = HASHTAG_RE.search(tag if tag.lstrip().startswith("#") else f"#{tag.strip()}")
+    return f"#{match.group(1).lower()}" if match else None
+
+
+def extract_documents(data) -> Iterator[List[str]]:
+    """Satu dokumen per objek JSON yang memuat hashtag (list `hashtags` + #tag di teksnya)."""
+    if isinstance(data, list):
+        for item in data:
+            yield from extract_documents(item)
+        return
+    if not isinstance(data, dict):
+        return
+    tags: List[str] = []
+    for key, value in data.items():
+        if isinstance(value, str):
+            tags.extend(f"#{m.lower()}" for m in HASHTAG_RE.findall(value))
+        elif key == "hashtags" and isinstance(value, list) and all(isinstance(v, str) for v in value):
+            tags.extend(filter(None, map(normalize_tag, value)))
+        else:
+            yield from extract_documents(value)
+    if tags:
+        yield list(dict.fromkeys(tags))
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class HashtagGraph:
+    """Matriks co-occurrence sparse + komunitas hasil label propagation."""
+
+    def __init__(self, documents: List[List[str]]):
+        ids: Dict[str, int] = {}
+        docs = [sorted({ids.setdefault(tag, len(ids)) for tag in doc[:MAX_DOC_TAGS]}) for doc in documents]
+        counts = [0] * len(ids)
+        for doc in docs:
+            for tag in doc:
+                counts[tag] += 1
+        # Tag yang dipakai sekali tidak mungkin punya pasangan ≥ MIN_COOCCURRENCE
+        keys: List[int] = []
+        for doc in docs:
+            doc = [tag for tag in doc if counts[tag] >= MIN_COOCCURRENCE]
+            for i, a in enumerate(doc):
+                shifted = a << _PAIR_SHIFT
+                keys.extend([shifted | b for b in doc[i + 1:]])
+        pairs = Counter(keys)
+        self.tags = list(ids)
+        self.counts = counts
+        self.index = ids
+        self.neighbors = self._neighbors(pairs)
+        self.labels = self._propagate()
+        self.strength = self._strength()
+
+    def _neighbors(self, pairs: Counter) -> Dict[int, List[Tuple[int, float, int]]]:
+        """(tetangga, bobot Ochiai, jumlah co-occurrence) per tag, tetangga terkuat saja."""
+        counts = self.counts
+        mask = (1 << _PAIR_SHIFT) - 1
+        rows: Dict[int, List[Tuple[int, float, int]]] = defaultdict(list)
+        for key, together in pairs.items():
+            if together < MIN_COOCCURRENCE:
+                continue
+            a, b = key >> _PAIR_SHIFT, key & mask
+            weight = together / math.sqrt(counts[a] * counts[b])
+            rows[a].append((b, weight, together))
+            rows[b].append((a, weight, together))
+        for tag, row in rows.items():
+            row.sort(key=lambda edge: -edge[1])
+            del row[NEIGHBORS:]
+        return dict(rows)
+
+    def _propagate(self) -> Dict[int, int]:
+        """Label propagation asinkron: tiap tag mengambil label dengan bobot tetangga terbesar."""
+        labels = {tag: tag for tag in self.neighbors}
+        order = sorted(self.neighbors, key=lambda t: (-self.counts[t], t))
+        for _ in range(MAX_ITERATIONS):
+            changed = 0
+            for tag in order:
+                scores: Dict[int, float] = defaultdict(float)
+                for other, weight, _together in self.neighbors[tag]:
+                    scores[labels[other]] += weight
+                current = labels[tag]
+                # Seri: pertahankan label sekarang, lalu label milik tag yang lebih sering dipakai
+                best = max(scores, key=lambda l: (scores[l], l == current, self.counts[l], -l))
+                if best != current and scores[best] > scores.get(current, 0.0):
+                    labels[tag] = best
+                    changed += 1
+            if changed <= len(order) // 1000:
+                break
+        return labels
+
+    def _strength(self) -> Dict[int, float]:
+        """Bobot total ke sesama anggota komunitas: ukuran seberapa sentral tag di cluster-nya."""
+        labels = self.labels
+        return {tag: sum(w for other, w, _ in row if labels[other] == labels[tag])
+                for tag, row in self.neighbors.items()}
+
+    def communities(self, limit: Optional[int] = None) -> List[List[str]]:
+        """Komunitas terbesar dulu; tag di dalamnya diurutkan sentralitas × log frekuensi."""
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for tag, label in self.labels.items():
+            groups[label].append(tag)
+        ranked = sorted(groups.values(), key=lambda g: -sum(self.counts[t] for t in g))[:limit]
+        return [[self.tags[t] for t in sorted(group, key=self._rank)] for group in ranked]
+
+    def _rank(self, tag: int):
+        return -self.strength.get(tag, 0.0) * math.log1p(self.counts[tag]), self.tags[tag]
+
+    def seeds(self, topic: str) -> List[int]:
+        """Tag yang memuat salah satu kata topik (≥3 huruf), mis. "kopi susu" → #kopisusu, #ngopi."""
+        words = [w for w in tokenize(topic) if len(w) >= 3]
+        return [i for i, tag in enumerate(self.tags) if any(w in tag for w in words)]
+
+    def topic_clusters(self, topic: str, per_cluster: int = TAGS_PER_CLUSTER) -> Optional[List[Dict]]:
+        """`clusters` template untuk topik, atau None jika korpus belum cukup menutupi topik."""
+        seeds = self.seeds(topic)
+        if not seeds:
+            return None
+        relevance: Dict[int, float] = defaultdict(float)
+        with_topic: Dict[int, int] = defaultdict(int)
+        for seed in seeds:
+            relevance[seed] += 1.0
+            for other, weight, together in self.neighbors.get(seed, ()):
+                relevance[other] += weight
+                with_topic[other] = max(with_topic[other], together)
+        topic_labels = Counter(self.labels[s] for s in seeds if s in self.labels)
+        main_labels = {label for label, _ in topic_labels.most_common(3)}
+        for tag, label in self.labels.items():
+            if label in main_labels and tag not in relevance:
+                relevance[tag] = 0.1 * self.strength.get(tag, 0.0)
+
+        pool = sorted(relevance, key=lambda t: (-relevance[t], self._rank(t)))[:3 * per_cluster]
+        if len(pool) < MIN_TOPIC_TAGS:
+            return None
+        by_count = sorted(pool, key=lambda t: (-self.counts[t], self.tags[t]))
+        third = math.ceil(len(by_count) / 3)
+        tiers = {
+            "High Competition": by_count[:third],
+            "Medium Competition": by_count[third:2 * third],
+            "Low Competition": by_count[2 * third:],
+        }
+        # Komunitas lain yang paling banyak bersinggungan dengan tetangga topik
+        used = set(pool)
+        near = Counter()
+        for tag in pool:
+            for other, weight, _ in self.neighbors.get(tag, ()):
+                label = self.labels[other]
+                if label not in main_labels:
+                    near[label] += weight
+        community = [t for label, _ in near.most_common(3) for t in self.labels if self.labels[t] == label]
+        tiers["Community"] = sorted((t for t in community if t not in used), key=self._rank)[:per_cluster]
+
+        def share(tag: int) -> float:
+            return round(100.0 * with_topic.get(tag, 0) / self.counts[tag], 1)
+
+        return [{
+            "cluster_name": name,
+            "hashtags": [{
+                "tag": self.tags[t],
+                "posts_count": self.counts[t],
+                "engagement_rate": share(t),
+                "best_time": BEST_TIMES[name],
+            } for t in sorted(members, key=lambda t: -relevance.get(t, 0.0))],
+        } for name, members in tiers.items() if members]
+
+
+class HashtagCorpus:
+    """Korpus hashtag dari products/, diperbarui inkremental per file (mtime/ukuran)."""
+
+    def __init__(self, products_dir: Optional[Path] = None):
+        self.products_dir = products_dir
+        self._files: Dict[Path, Tuple[Tuple[int, int], List[List[str]]]] = {}
+        self._graph: Optional[HashtagGraph] = None
+        self._lock = threading.Lock()
+
+    def _data_files(self) -> Iterator[Path]:
+        names = {f"{product_type}_data.json" for product_type in CORPUS_TYPES}
+        root = self.products_dir or _products_dir()
+        if root.is_dir():
+            yield from (p for p in root.rglob("*_data.json") if p.name in names)
+
+    def sync(self) -> bool:
+        """Baca ulang hanya file yang baru/berubah. True jika korpus berubah."""
+        seen = set()
+        changed = False
+        for path in self._data_files():
+            seen.add(path)
+            signature = _file_signature(path)
+            cached = self._files.get(path)
+            if signature is None or (cached and cached[0] == signature):
+                continue
+            try:
+                documents = list(extract_documents(json.loads(path.read_text(encoding="utf-8"))))
+            except (OSError, json.JSONDecodeError):
+                documents = []
+            self._files[path] = (signature, documents)
+            changed = True
+        for stale in [p for p in self._files if p not in seen]:
+            del self._files[stale]
+            changed = True
+        return changed
+
+    def graph(self) -> HashtagGraph:
+        with self._lock:
+            if self.sync() or self._graph is None:
+                self._graph = HashtagGraph([doc for _, docs in self._files.values() for doc in docs])
+            return self._graph
+
+
+CORPUS = HashtagCorpus()
+
+
+def topic_clusters(topic: str) -> Optional[List[Dict]]:
+    return CORPUS.graph().topic_clusters(topic)
+
+
+def fill_clusters(data: Dict, topic: str, local: Optional[Dict] = None) -> Dict:
+    """Isi `clusters` hashtag_clusterer dari korpus lokal jika topiknya sudah tertutup.
+
+    `local["clusters"]` = cluster yang sudah dihitung saat prompt dibuat (di luar slot LLM), sehingga
+    graf tidak dibangun ulang di dalam slot dan hasilnya sama dengan yang dirujuk prompt.
+    """
+    if "clusters" not in data:
+        clusters = local["clusters"] if local and "clusters" in local else topic_clusters(topic)
+        if clusters:
+            data["clusters"] = clusters
+    return data
+
+
+def outline(clusters: Optional[List[Dict]]) -> str:
+    """Ringkasan cluster lokal untuk prompt (usage_guide & monthly_calendar merujuk tag ini)."""
+    if not clusters:
+        return ""
+    return "\n".join(f"{c['cluster_name']}: {' '.join(h['tag'] for h in c['hashtags'][:8])}" for c in clusters)
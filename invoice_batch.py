@@ -0,0 +1,348 @@
+# invoice_batch.py
+"""Invoice massal dari CSV ekspor pesanan, satu PDF per invoice, tanpa LLM.
+
+Format CSV: satu baris per item, baris dengan nomor invoice yang sama berurutan.
+
+    number,date,client_name,client_address,client_phone,description,quantity,price
+    INV/2026/001,2026-10-01,Budi,Jl. Mawar 1,0812...,Kopi Susu 1L,2,"Rp 85.000"
+
+Kolom wajib: number, client_name, description, quantity, price (nama kolom ekspor
+marketplace umum seperti no_pesanan/nama_pembeli/jumlah/harga juga dikenali); nomor kosong
+berarti item lanjutan invoice di atasnya. Data toko dan rekening dari file JSON `--company`;
+kolom CSV dengan nama yang sama menimpanya per invoice.
+
+Total baris, subtotal, PPN dan total dihitung dengan Decimal. Baris CSV dibaca streaming,
+render berjalan di process pool (template invoice_macro dikompilasi sekali per proses), dan
+setiap invoice selesai dicatat di `progress.jsonl` folder tujuan. Menjalankan ulang perintah
+yang sama hanya merender invoice yang belum selesai atau isinya berubah. Tanggal terbit untuk
+CSV tanpa kolom tanggal ditetapkan sekali di `progress.jsonl`, jadi run ulang di hari lain tetap
+melewati invoice yang sudah jadi.
+"""
+import csv
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from prayer_times import MONTHS
+from template_renderer import TemplateRenderer
+
+PPN_RATE = Decimal(os.getenv("AUTOPRENEUR_PPN_RATE", "0.11"))
+DUE_DAYS = int(os.getenv("AUTOPRENEUR_INVOICE_DUE_DAYS", "14"))
+CENT = Decimal("0.01")
+PROGRESS_FILE = "progress.jsonl"
+# Invoice yang boleh menunggu di antrian per worker; CSV tidak pernah dimuat seluruhnya
+MAX_PENDING_PER_WORKER = 4
+
+REQUIRED_COLUMNS = ("number", "client_name", "description", "quantity", "price")
+COMPANY_FIELDS = ("company_name", "company_address", "company_phone", "bank_name", "account_number",
+                  "account_name", "notes")
+INVOICE_COLUMNS = ("date", "due_date", "client_name", "client_address", "client_phone") + COMPANY_FIELDS
+COLUMN_ALIASES = {
+    "no_invoice": "number", "invoice": "number", "no_pesanan": "number", "order_id": "number",
+    "tanggal": "date", "tanggal_pesanan": "date", "jatuh_tempo": "due_date",
+    "nama_pembeli": "client_name", "pembeli": "client_name", "customer": "client_name",
+    "alamat": "client_address", "alamat_pengiriman": "client_address",
+    "telepon": "client_phone", "no_telepon": "client_phone", "phone": "client_phone",
+    "produk": "description", "nama_produk": "description", "item": "description",
+    "jumlah": "quantity", "qty": "quantity", "harga": "price", "harga_satuan": "price",
+    "catatan": "notes",
+}
+DEFAULT_COMPANY = {field: "" for field in COMPANY_FIELDS}
+DEFAULT_COMPANY["notes"] = "Pembayaran melalui transfer ke rekening di atas paling lambat tanggal jatuh tempo."
+
+
+class InvoiceError(ValueError):
+    """Baris CSV suatu invoice tidak bisa diproses."""
+
+
+# --- Parsing & perhitungan ---
+def parse_amount(text: str) -> Decimal:
+    """"Rp 15.000" / "15000" / "15.000,50" / "15000.50" → Decimal."""
+    cleaned = re.sub(r"[^\d,.\-]", "", text or "")
+    if "," in cleaned and "." in cleaned:
+        # Pemisah yang muncul terakhir adalah desimal
+        thousands, decimal = (".", ",") if cleaned.rfind(",") > cleaned.rfind(".") else (",", ".")
+        cleaned = cleaned.replace(thousands, "").replace(decimal, ".")
+    elif "," in cleaned:
+        cleaned = cleaned.replace(",", "") if re.fullmatch(r"-?\d{1,3}(,\d{3})+", cleaned) else cleaned.replace(",", ".")
+    elif re.fullmatch(r"-?\d{1,3}(\.\d{3})+", cleaned):
+        cleaned = cleaned.replace(".", "")
+    try:
+        return Decimal(cleaned)
+    except InvalidOperation:
+        raise InvoiceError(f"angka tidak valid: {text!r}") from None
+
+
+def parse_quantity(text: str) -> int:
+    quantity = parse_amount(text)
+    if quantity != quantity.to_integral_value() or quantity <= 0:
+        raise InvoiceError(f"jumlah harus bilangan bulat positif: {text!r}")
+    return int(quantity)
+
+
+def parse_date(text: str) -> date:
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"):
+        try:
+            return datetime.strptime(text.strip(), fmt).date()
+        except ValueError:
+            continue
+    raise InvoiceError(f"tanggal tidak dikenali: {text!r} (pakai YYYY-MM-DD atau DD/MM/YYYY)")
+
+
+def format_date(day: date) -> str:
+    return f"{day.day} {MONTHS[day.month - 1]} {day.year}"
+
+
+def _money(value: Decimal) -> Decimal:
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def build_invoice(number: str, rows: List[Dict[str, str]], company: Dict[str, str],
+                  today: Optional[date] = None) -> Dict[str, Any]:
+    """Satu invoice (format data invoice_macro) dari baris-baris item-nya."""
+    first = rows[0]
+    fields = {**DEFAULT_COMPANY, **company, **{k: first[k] for k in INVOICE_COLUMNS if first.get(k)}}
+    issued = parse_date(fields["date"]) if fields.get("date") else (today or date.today())
+    due = parse_date(fields["due_date"]) if fields.get("due_date") else issued + timedelta(days=DUE_DAYS)
+
+    items = []
+    subtotal = Decimal(0)
+    for row in rows:
+        quantity = parse_quantity(row["quantity"])
+        price = parse_amount(row["price"])
+        total = _money(price * quantity)
+        subtotal += total
+        items.append({"description": row["description"], "quantity": quantity,
+                      "price": float(price), "total": float(total)})
+    tax = _money(subtotal * PPN_RATE)
+    return {
+        "company_name": fields["company_name"],
+        "company_address": fields["company_address"],
+        "company_phone": fields["company_phone"],
+        "number": number,
+        "date": format_date(issued),
+        "due_date": format_date(due),
+        "client_name": fields.get("client_name", ""),
+        "client_address": fields.get("client_address", ""),
+        "client_phone": fields.get("client_phone", ""),
+        "bank_name": fields["bank_name"],
+        "account_number": fields["account_number"],
+        "account_name": fields["account_name"],
+        "items": items,
+        "subtotal": float(subtotal),
+        "tax": float(tax),
+        "total": float(subtotal + tax),
+        "notes": fields["notes"],
+    }
+
+
+def _canonical(header: List[str]) -> List[str]:
+    names = [h.strip().lower().replace(" ", "_") for h in header]
+    return [COLUMN_ALIASES.get(name, name) for name in names]
+
+
+def read_invoices(path: Path, company: Dict[str, str], today: Optional[date] = None
+                  ) -> Iterator[Tuple[str, Union[Dict[str, Any], InvoiceError]]]:
+    """Stream (nomor, invoice | InvoiceError) dari CSV; hanya baris satu invoice yang ditahan di memori."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = _canonical(next(reader, []))
+        missing = [c for c in REQUIRED_COLUMNS if c not in header]
+        if missing:
+            raise InvoiceError(f"kolom wajib tidak ada di {path}: {', '.join(missing)}")
+        seen = set()
+        number, rows = None, []
+
+        def finish():
+            if number in seen:
+                return number, InvoiceError("baris invoice tidak berurutan di CSV")
+            seen.add(number)
+            try:
+                return number, build_invoice(number, rows, company, today)
+            except (InvoiceError, KeyError) as e:
+                return number, InvoiceError(str(e) if isinstance(e, InvoiceError) else f"kolom kosong: {e}")
+
+        for values in reader:
+            if not any(v.strip() for v in values):
+                continue
+            row = dict(zip(header, (v.strip() for v in values)))
+            # Sebagian ekspor hanya menulis nomor pesanan di baris item pertama
+            row["number"] = row.get("number") or number or ""
+            if row["number"] != number:
+                if number is not None:
+                    yield finish()
+                number, rows = row["number"], []
+            rows.append(row)
+        if number is not None:
+            yield finish()
+
+
+def invoice_filename(number: str) -> str:
+    """"INV-2026-001" → "INV-2026-001.pdf"; "INV/2026/001" → "INV-2026-001-<hash>.pdf".
+
+    Nomor yang harus diubah agar aman jadi nama file diberi akhiran hash nomor aslinya, supaya
+    "INV/1" dan "INV-1" tidak menulis PDF yang sama.
+    """
+    stem = re.sub(r"[^\w.-]+", "-", number).strip("-.")
+    if stem != number:
+        stem = f"{stem}-{hashlib.sha256(number.encode('utf-8')).hexdigest()[:8]}"
+    return stem + ".pdf"
+
+
+def digest(invoice: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(invoice, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+# --- Proses worker: template & konfigurasi font dibuat sekali per proses ---
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(template_dir: str):
+    renderer = TemplateRenderer(template_dir)
+    _worker["template"] = renderer.env.get_template(TemplateRenderer.TEMPLATES["invoice_macro"])
+    _worker["base_url"] = str(Path(template_dir).resolve())
+    from weasyprint.text.fonts import FontConfiguration
+    _worker["font_config"] = FontConfiguration()
+
+
+def render_invoice(invoice: Dict[str, Any], pdf_path: str, name: str) -> float:
+    """Render satu invoice ke PDF (ditulis atomik); return detik render."""
+    from weasyprint import HTML
+    started = time.perf_counter()
+    html = _worker["template"].render(name=name, description=invoice["number"], invoices=[invoice])
+    tmp_path = f"{pdf_path}.{os.getpid()}.tmp"
+    HTML(string=html, base_url=_worker["base_url"]).write_pdf(tmp_path, font_config=_worker["font_config"])
+    os.replace(tmp_path, pdf_path)
+    return time.perf_counter() - started
+
+
+# --- Progres ---
+class InvoiceProgress:
+    """Log JSONL invoice selesai/gagal; entri terakhir per nomor yang berlaku.
+
+    Baris `{"issued": "YYYY-MM-DD"}` menyimpan tanggal terbit default folder ini (untuk invoice
+    tanpa kolom tanggal), ditulis sekali saat progres dibuat.
+    """
+
+    def __init__(self, out_dir: Path, restart: bool = False, today: Optional[date] = None):
+        self.path = out_dir / PROGRESS_FILE
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.issued: Optional[date] = None
+        if restart and self.path.exists():
+            self.path.unlink()
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # baris terakhir terpotong saat proses dihentikan
+                    if "issued" in entry:
+                        self.issued = date.fromisoformat(entry["issued"])
+                    else:
+                        self.entries[entry["number"]] = entry
+        self._file = self.path.open("a", encoding="utf-8")
+        if self.issued is None:
+            self.issued = today or date.today()
+            self._write({"issued": self.issued.isoformat()})
+
+    def done(self, number: str, key: str, pdf_path: Path) -> bool:
+        entry = self.entries.get(number)
+        return (entry is not None and entry["status"] == "ok" and entry["digest"] == key
+                and pdf_path.exists() and pdf_path.stat().st_size > 0)
+
+    def record(self, number: str, status: str, **fields):
+        entry = {"number": number, "status": status, "at": time.time(), **fields}
+        self.entries[number] = entry
+        self._write(entry)
+
+    def _write(self, entry: Dict[str, Any]):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def load_company(path: Optional[Path]) -> Dict[str, str]:
+    if path is None:
+        return {}
+    company = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {k: str(v) for k, v in company.items() if k in COMPANY_FIELDS}
+
+
+def run(csv_path: Path, out_dir: Path, company: Dict[str, str], workers: int = os.cpu_count() or 1,
+        template_dir: str = "templates", name: str = "Invoice", restart: bool = False,
+        today: Optional[date] = None) -> Dict[str, Any]:
+    """Render semua invoice di CSV ke `out_dir`; return ringkasan + daftar error per invoice."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    progress = InvoiceProgress(out_dir, restart, today)
+    # Nama file (huruf kecil, untuk filesystem case-insensitive) → nomor invoice pemiliknya
+    files: Dict[str, str] = {}
+    summary: Dict[str, Any] = {"rendered": 0, "skipped": 0, "failed": 0, "render_seconds": 0.0}
+    errors: Dict[str, str] = {}
+    started = time.perf_counter()
+    pending: Dict[Future, Tuple[str, str, Path]] = {}
+
+    def collect(futures):
+        for future in futures:
+            number, key, pdf_path = pending.pop(future)
+            try:
+                seconds = future.result()
+            except Exception as e:
+                errors[number] = str(e)
+                summary["failed"] += 1
+                progress.record(number, "error", error=str(e))
+                continue
+            summary["rendered"] += 1
+            summary["render_seconds"] += seconds
+            progress.record(number, "ok", digest=key, file=pdf_path.name)
+
+    # multiprocessing baru dimuat di sini agar cold start perintah CLI lain tidak ikut membayar
+    import multiprocessing as mp
+    from concurrent.futures import ProcessPoolExecutor
+
+    # spawn: sama seperti render pool api_server, proses anak tidak mewarisi lock/thread induk
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"),
+                             initializer=_init_worker, initargs=(template_dir,)) as pool:
+        try:
+            for number, invoice in read_invoices(csv_path, company, progress.issued):
+                # Kesalahan data CSV terdeteksi ulang setiap run; progres hanya mencatat hasil render
+                if isinstance(invoice, InvoiceError):
+                    errors[number] = str(invoice)
+                    summary["failed"] += 1
+                    continue
+                key = digest(invoice)
+                pdf_path = out_dir / invoice_filename(number)
+                owner = files.setdefault(pdf_path.name.lower(), number)
+                if owner != number:
+                    errors[number] = f"nama file {pdf_path.name} sudah dipakai invoice {owner}"
+                    summary["failed"] += 1
+                    continue
+                if progress.done(number, key, pdf_path):
+                    summary["skipped"] += 1
+                    continue
+                pending[pool.submit(render_invoice, invoice, str(pdf_path), name)] = (number, key, pdf_path)
+                if len(pending) >= workers * MAX_PENDING_PER_WORKER:
+                    collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            collect(wait(pending).done)
+        finally:
+            progress.close()
+
+    elapsed = time.perf_counter() - started
+    summary.update({
+        "elapsed_seconds": round(elapsed, 1),
+        "render_seconds": round(summary["render_seconds"], 1),
+        "per_minute": round(summary["rendered"] / elapsed * 60, 1) if summary["rendered"] else 0.0,
+        "per_minute_per_worker": round(summary["rendered"] / elapsed * 60 / workers, 1) if summary["rendered"] else 0.0,
+        "output": str(out_dir),
+        "errors": errors,
+    })
+    return summary
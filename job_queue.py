@@ -0,0 +1,202 @@
+# job_queue.py
+import json
+import random
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+JOB_KINDS = ("scan", "generate_product", "generate_suite", "render")
+
+# Status job: queued -> running -> done | queued (retry) | dead
+BACKOFF_BASE = 5.0
+BACKOFF_MAX = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    heartbeat_at REAL,
+    result TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, priority DESC, available_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs (status, lease_expires);
+"""
+
+
+def backoff_delay(attempts: int) -> float:
+    """Jeda retry eksponensial dengan jitter ±20%."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+class JobQueue:
+    """Antrian job tahan-crash berbasis SQLite dengan lease, heartbeat, retry, dan dead-letter.
+
+    Setiap proses worker membuka koneksinya sendiri. Klaim job memakai transaksi
+    `BEGIN IMMEDIATE` sehingga satu job tidak pernah dipegang dua worker sekaligus;
+    job yang lease-nya kedaluwarsa (worker crash) otomatis bisa diklaim ulang.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def submit(self, kind: str, payload: Dict[str, Any], priority: int = 0, max_attempts: int = 3) -> str:
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = f"job_{uuid.uuid4().hex[:12]}"
+        now = time.time()
+        self.conn.execute(
+            "INSERT INTO jobs (id, kind, payload, priority, max_attempts, available_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(payload), priority, max_attempts, now, now, now),
+        )
+        return job_id
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """Ambil job siap jalan dengan prioritas tertinggi dan pasang lease untuk worker ini."""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Lease kedaluwarsa: worker sebelumnya dianggap mati
+            expired = self.conn.execute(
+                "SELECT id, attempts, max_attempts FROM jobs WHERE status = 'running' AND lease_expires < ?",
+                (now,),
+            ).fetchall()
+            for row in expired:
+                if row["attempts"] >= row["max_attempts"]:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = 'dead', lease_owner = NULL, updated_at = ?, "
+                        "last_error = COALESCE(last_error, 'lease expired') WHERE id = ?",
+                        (now, row["id"]),
+                    )
+                else:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = 'queued', lease_owner = NULL, available_at = ?, "
+                        "last_error = 'lease expired', updated_at = ? WHERE id = ?",
+                        (now + backoff_delay(row["attempts"]), now, row["id"]),
+                    )
+
+            row = self.conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' AND available_at <= ? "
+                "ORDER BY priority DESC, available_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, heartbeat_at = ?, updated_at = ? WHERE id = ?",
+                (worker_id, now + lease_seconds, now, now, row["id"]),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        job = self._to_dict(row)
+        job["attempts"] += 1
+        job["status"] = "running"
+        return job
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Perpanjang lease. False berarti job sudah diambil alih worker lain."""
+        now = time.time()
+        cur = self.conn.execute(
+            "UPDATE jobs SET lease_expires = ?, heartbeat_at = ?, updated_at = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+            (now + lease_seconds, now, now, job_id, worker_id),
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = 'done', result = ?, lease_owner = NULL, updated_at = ? "
+            "WHERE id = ? AND lease_owner = ?",
+            (json.dumps(result, default=str), time.time(), job_id, worker_id),
+        )
+        return cur.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> str:
+        """Catat kegagalan; job dijadwalkan ulang dengan backoff atau masuk dead-letter."""
+        now = time.time()
+        row = self.conn.execute(
+            "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND lease_owner = ?",
+            (job_id, worker_id),
+        ).fetchone()
+        if row is None:
+            return "lost"
+        if row["attempts"] >= row["max_attempts"]:
+            status, available_at = "dead", now
+        else:
+            status, available_at = "queued", now + backoff_delay(row["attempts"])
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, available_at = ?, last_error = ?, lease_owner = NULL, "
+            "updated_at = ? WHERE id = ?",
+            (status, available_at, error, now, job_id),
+        )
+        return status
+
+    def release(self, job_id: str, worker_id: str):
+        """Kembalikan job ke antrian tanpa menghitung percobaan (dipakai worker saat shutdown)."""
+        self.conn.execute(
+            "UPDATE jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), lease_owner = NULL, "
+            "available_at = ?, updated_at = ? WHERE id = ? AND lease_owner = ?",
+            (time.time(), time.time(), job_id, worker_id),
+        )
+
+    def retry_dead(self, job_id: Optional[str] = None) -> int:
+        """Pindahkan job dari dead-letter kembali ke antrian."""
+        now = time.time()
+        query = "UPDATE jobs SET status = 'queued', attempts = 0, available_at = ?, updated_at = ? WHERE status = 'dead'"
+        params: list = [now, now]
+        if job_id:
+            query += " AND id = ?"
+            params.append(job_id)
+        return self.conn.execute(query, params).rowcount
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        if status:
+            rows = self.conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY updated_at DESC LIMIT ?", (status, limit)
+            ).fetchall()
+        else:
+            rows = self.conn.execute("SELECT * FROM jobs ORDER BY updated_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._to_dict(r) for r in rows]
+
+    def stats(self) -> Dict[str, int]:
+        rows = self.conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {r["status"]: r["n"] for r in rows}
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        if job.get("result"):
+            job["result"] = json.loads(job["result"])
+        return job
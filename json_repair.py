@@ -0,0 +1,249 @@
+# json_repair.py
+"""Parser JSON toleran untuk completion LLM yang terpotong atau sedikit rusak.
+
+`loads()` mencoba `json.loads` dulu (jalur cepat). Jika gagal, teks diurai ulang
+dengan aturan berikut:
+
+- pagar kode ```json dan teks sebelum `{`/`[` pertama diabaikan
+- koma berlebih (`[1, 2,]`, `{"a": 1,,}`) dan koma yang hilang antar elemen ditoleransi
+- string, array, dan objek yang belum ditutup di akhir teks ditutup
+- elemen terakhir yang tidak lengkap (string/angka terpotong, key tanpa nilai) dibuang
+
+Hasilnya menyebut path mana saja yang terpotong sehingga pemanggil cukup meminta
+ulang bagian tersebut.
+"""
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_LITERALS = {"true": True, "false": False, "null": None}
+
+
+class JsonRepairError(ValueError):
+    """Teks sama sekali tidak berisi JSON yang bisa diselamatkan."""
+
+
+class RepairResult:
+    def __init__(self, value: Any, truncated: List[str], repairs: List[str]):
+        self.value = value
+        # Path container yang terpotong, dari terdalam ke terluar, mis. ["captions[17]", "captions", ""]
+        self.truncated = truncated
+        self.repairs = repairs
+
+    @property
+    def complete(self) -> bool:
+        return not self.truncated
+
+    @property
+    def repaired(self) -> bool:
+        return bool(self.truncated or self.repairs)
+
+    def truncated_sections(self) -> List[str]:
+        """Key level teratas yang isinya terpotong."""
+        sections = []
+        for path in self.truncated:
+            head = re.split(r"[.\[]", path, maxsplit=1)[0]
+            if head and head not in sections:
+                sections.append(head)
+        return sections
+
+
+class _Incomplete(Exception):
+    """Nilai skalar terpotong oleh akhir teks."""
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.s = text
+        self.n = len(text)
+        self.i = 0
+        self.truncated: List[str] = []
+        self.repairs: List[str] = []
+
+    def skip_ws(self):
+        s, i, n = self.s, self.i, self.n
+        while i < n and s[i] in " \t\r\n":
+            i += 1
+        self.i = i
+
+    def at_end(self) -> bool:
+        self.skip_ws()
+        return self.i >= self.n
+
+    def parse_value(self, path: str) -> Tuple[Any, bool]:
+        """Return (nilai, lengkap?). Container terpotong dikembalikan sebagian."""
+        self.skip_ws()
+        if self.i >= self.n:
+            raise _Incomplete()
+        ch = self.s[self.i]
+        if ch == "{":
+            return self.parse_object(path)
+        if ch == "[":
+            return self.parse_array(path)
+        if ch == '"':
+            return self.parse_string(), True
+        match = _NUMBER.match(self.s, self.i)
+        if match:
+            self.i = match.end()
+            if self.i >= self.n:
+                raise _Incomplete()  # "12" bisa saja potongan "1234"
+            text = match.group()
+            return (float(text) if any(c in text for c in ".eE") else int(text)), True
+        for word, value in _LITERALS.items():
+            if self.s.startswith(word, self.i):
+                self.i += len(word)
+                return value, True
+            if word.startswith(self.s[self.i:self.n]):
+                raise _Incomplete()
+        raise JsonRepairError(f"Karakter tidak terduga {ch!r} di posisi {self.i}")
+
+    def parse_string(self) -> str:
+        start = self.i + 1
+        i = start
+        s, n = self.s, self.n
+        while True:
+            j = s.find('"', i)
+            if j < 0:
+                self.i = n
+                raise _Incomplete()
+            # Hitung backslash sebelum kutip untuk membedakan \" dari akhir string
+            k = j - 1
+            while k >= start and s[k] == "\\":
+                k -= 1
+            if (j - 1 - k) % 2 == 0:
+                break
+            i = j + 1
+        self.i = j + 1
+        raw = s[start:j]
+        try:
+            return json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            self.repairs.append(f"escape tidak valid di posisi {start}")
+            return json.loads(json.dumps(raw))
+
+    def _separator(self, closer: str, path: str) -> bool:
+        """Lewati koma setelah elemen. False berarti container sudah ditutup."""
+        self.skip_ws()
+        if self.i < self.n and self.s[self.i] == ",":
+            self.i += 1
+            self.skip_ws()
+            while self.i < self.n and self.s[self.i] == ",":
+                self.repairs.append(f"koma ganda di {path or '$'}")
+                self.i += 1
+                self.skip_ws()
+            if self.i < self.n and self.s[self.i] == closer:
+                self.repairs.append(f"koma berlebih di {path or '$'}")
+                self.i += 1
+                return False
+            return True
+        if self.i < self.n and self.s[self.i] == closer:
+            self.i += 1
+            return False
+        if self.i < self.n:
+            self.repairs.append(f"koma hilang di {path or '$'}")
+        return True
+
+    def parse_array(self, path: str) -> Tuple[List[Any], bool]:
+        self.i += 1
+        items: List[Any] = []
+        if self.at_end():
+            self.truncated.append(path)
+            return items, False
+        if self.s[self.i] == "]":
+            self.i += 1
+            return items, True
+        while True:
+            item_path = f"{path}[{len(items)}]"
+            try:
+                value, complete = self.parse_value(item_path)
+            except _Incomplete:
+                self.truncated += [item_path, path]
+                return items, False
+            if not complete:
+                # Elemen container terpotong dibuang, array tetap dipakai sebagian
+                self.truncated.append(path)
+                return items, False
+            items.append(value)
+            if not self._separator("]", path):
+                return items, True
+            if self.at_end():
+                self.truncated.append(path)
+                return items, False
+
+    def parse_object(self, path: str) -> Tuple[dict, bool]:
+        self.i += 1
+        obj: dict = {}
+        while True:
+            if self.at_end():
+                self.truncated.append(path)
+                return obj, False
+            ch = self.s[self.i]
+            if ch == "}":
+                self.i += 1
+                return obj, True
+            if ch == ",":
+                self.repairs.append(f"koma berlebih di {path or '$'}")
+                self.i += 1
+                continue
+            if ch != '"':
+                raise JsonRepairError(f"Key objek diharapkan di posisi {self.i}")
+            try:
+                key = self.parse_string()
+            except _Incomplete:
+                self.truncated.append(path)
+                return obj, False
+            self.skip_ws()
+            if self.i >= self.n:
+                self.truncated.append(path)
+                return obj, False
+            if self.s[self.i] != ":":
+                raise JsonRepairError(f"':' diharapkan di posisi {self.i}")
+            self.i += 1
+            child = f"{path}.{key}" if path else key
+            try:
+                value, complete = self.parse_value(child)
+            except _Incomplete:
+                self.truncated += [child, path]
+                return obj, False
+            if not complete:
+                # Container terpotong tetap disimpan sebagian; path-nya sudah tercatat
+                obj[key] = value
+                self.truncated.append(path)
+                return obj, False
+            obj[key] = value
+            if not self._separator("}", path):
+                return obj, True
+
+
+def _start_of_json(text: str) -> int:
+    positions = [p for p in (text.find("{"), text.find("[")) if p >= 0]
+    if not positions:
+        raise JsonRepairError("Tidak ada objek atau array JSON")
+    return min(positions)
+
+
+def repair(text: str) -> RepairResult:
+    """Urai teks JSON yang mungkin terpotong/rusak tanpa mencoba `json.loads` dulu."""
+    start = _start_of_json(text)
+    parser = _Parser(text)
+    parser.i = start
+    if start:
+        parser.repairs.append("teks sebelum JSON diabaikan")
+    try:
+        value, _ = parser.parse_value("")
+    except _Incomplete:
+        raise JsonRepairError("JSON kosong")
+    if not parser.at_end() and not parser.s[parser.i:].strip().startswith("```"):
+        parser.repairs.append("teks setelah JSON diabaikan")
+    return RepairResult(value, parser.truncated, parser.repairs)
+
+
+def loads(text: Optional[str]) -> RepairResult:
+    """`json.loads` dengan jalur cepat; perbaikan hanya dipakai jika parsing biasa gagal."""
+    if not text:
+        raise JsonRepairError("Respons kosong")
+    try:
+        return RepairResult(json.loads(text), [], [])
+    except json.JSONDecodeError:
+        return repair(text)
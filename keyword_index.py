@@ -0,0 +1,408 @@
+# keyword_index.py
+"""Index kata kunci dari laporan riset dan teks produk untuk keyword_tracker.
+
+Dokumen = satu `db/report_*.md` atau satu `products/**/<jenis>_data.json` (semua teksnya).
+Frasa kandidat diambil per potongan kalimat yang dipisah tanda baca & stopword, lalu n-gram
+1-3 kata di dalamnya ("kopi susu gula aren" → "kopi susu", "susu gula aren", ...).
+
+Matriks dokumen×frasa disimpan sparse (dict per dokumen + posting list per frasa) di
+`db/keyword_index.json` bersama signature file, sehingga `sync()` hanya membaca ulang laporan
+dan produk yang baru/berubah. Bobot TF-IDF memakai tf sublinear dan idf yang dihaluskan.
+
+`suggest(topic)` mencari dokumen yang paling mirip topik (cosine TF-IDF), lalu mengurutkan
+frasa di dokumen itu menurut relevansi (jumlah bobot TF-IDF tertimbang kemiripan dokumen) dan
+co-occurrence (porsi dokumen relevan yang memuat frasa). Peringkat per topik disimpan terpisah
+di `db/keyword_rankings.json` (baca-gabung-tulis di bawah lock DB, aman antar proses) agar laporan
+berikutnya bisa menunjukkan perubahan posisi.
+
+Kata kunci dihitung sekali per permintaan saat prompt dibuat (`prompt_keywords`) dan daftar yang
+sama dipakai lagi oleh `fill_keywords`, sehingga `keyword_notes` LLM selalu cocok dengan barisnya.
+
+Di keyword_tracker, `search_volume` = jumlah kemunculan frasa di korpus sendiri, `competition` =
+tertil jumlah dokumen yang memuatnya, dan posisi = peringkat relevansi di index (bukan data
+Shopee). LLM hanya menulis estimasi CPC, saran per kata kunci, ringkasan, dan rekomendasi.
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from prayer_times import format_date
+from similarity import ALIASES, STOPWORDS
+from singleflight import normalize_topic
+
+INDEX_PATH = Path(os.getenv("AUTOPRENEUR_KEYWORD_INDEX", "db/keyword_index.json"))
+RANKINGS_PATH = Path(os.getenv("AUTOPRENEUR_KEYWORD_RANKINGS", "db/keyword_rankings.json"))
+REPORTS_DIR = Path("db")
+# Output keyword_tracker sendiri tidak diindex agar angka karangan lama tidak ikut memberi skor
+EXCLUDED_TYPES = ("keyword_tracker",)
+
+MAX_NGRAM = 3
+TOP_KEYWORDS = int(os.getenv("AUTOPRENEUR_KEYWORDS", "30"))
+# Minimal kata kunci yang ditemukan sebelum keyword_tracker memakai index; di bawahnya LLM
+MIN_KEYWORDS = int(os.getenv("AUTOPRENEUR_KEYWORD_MIN", "10"))
+RELEVANT_DOCS = 50
+# Frasa multi-kata harus muncul di minimal dua dokumen agar bukan kebetulan satu kalimat
+MIN_PHRASE_DOCS = 2
+# Frasa pendek dibuang jika frasa lebih panjang yang memuatnya muncul di ≥90% dokumennya
+# ("gula aren" tidak perlu ditampilkan di samping "susu gula aren")
+SUBSUME_RATIO = 0.9
+# Lift = porsi di dokumen relevan ÷ porsi di seluruh korpus; kata umum semua laporan ("umkm") ≈ 1
+MIN_LIFT = 1.2
+
+# Kata umum laporan riset yang tidak berguna sebagai kata kunci
+KEYWORD_STOPWORDS = STOPWORDS | {
+    "ada", "bisa", "tidak", "sudah", "belum", "masih", "karena", "agar", "saat", "jika", "kami",
+    "kita", "anda", "mereka", "sangat", "banyak", "setiap", "semua", "hanya", "tanpa", "antara",
+    "seperti", "yaitu", "adalah", "dapat", "harus", "perlu", "membuat", "menjadi", "memiliki",
+    "is", "are", "be", "with", "on", "as", "by", "at", "or", "this", "that", "your", "you", "it",
+    "rp", "dll", "dsb", "tersebut", "lain", "hal", "cara", "tips",
+}
+COMPETITION_LEVELS = ("High", "Medium", "Low")
+# Saran bawaan jika LLM tidak menulis catatan untuk kata kunci tertentu
+DEFAULT_ACTIONS = {
+    "High": "Pakai di judul produk utama dan pantau posisinya tiap minggu",
+    "Medium": "Masukkan ke judul & deskripsi, uji dengan iklan budget kecil",
+    "Low": "Jadikan kata kunci long-tail di deskripsi dan tag produk",
+}
+_CHUNK_RE = re.compile(r"[^\w\s-]+|\s-\s|\n")
+_WORD_RE = re.compile(r"[a-z][a-z0-9]*")
+
+
+def _products_dir() -> Path:
+    import main as app
+    return app.PRODUCTS_DIR
+
+
+class Suggestion(NamedTuple):
+    keyword: str
+    relevance: float      # 0-1, relatif terhadap kata kunci teratas
+    cooccurrence: float   # 0-1, porsi dokumen relevan yang memuat kata kunci
+    mentions: int         # total kemunculan di seluruh korpus
+    documents: int        # jumlah dokumen yang memuatnya
+
+
+def phrases(text: str) -> Dict[str, int]:
+    """Frekuensi frasa n-gram (1..MAX_NGRAM) dari teks; n-gram tidak melewati tanda baca/stopword."""
+    counts: Dict[str, int] = defaultdict(int)
+    for chunk in _CHUNK_RE.split(text.lower()):
+        run: List[str] = []
+        for raw in _WORD_RE.findall(chunk) + [""]:
+            words = ALIASES.get(raw, raw).split()
+            if not words or words[0] in KEYWORD_STOPWORDS or len(words[0]) < 2:
+                for n in range(1, MAX_NGRAM + 1):
+                    for i in range(len(run) - n + 1):
+                        counts[" ".join(run[i:i + n])] += 1
+                run = []
+                continue
+            run.extend(words)
+    return dict(counts)
+
+
+def _texts(data) -> Iterator[str]:
+    if isinstance(data, str):
+        if not data.startswith(("http://", "https://", "#")):
+            yield data
+    elif isinstance(data, dict):
+        for value in data.values():
+            yield from _texts(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from _texts(item)
+
+
+def _write_json_atomic(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _file_signature(path: Path) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class KeywordIndex:
+    """Matriks TF-IDF sparse dokumen×frasa yang diperbarui inkremental per file."""
+
+    def __init__(self, path: Optional[Path] = INDEX_PATH, reports_dir: Path = REPORTS_DIR,
+                 products_dir: Optional[Path] = None, rankings_path: Optional[Path] = RANKINGS_PATH):
+        self.path = path
+        self.reports_dir = reports_dir
+        self.products_dir = products_dir
+        self.rankings_path = rankings_path
+        # doc → {"signature": [...], "terms": {frasa: tf}}
+        self.docs: Dict[str, Dict] = {}
+        # Peringkat per topik jika tidak disimpan ke file: {topik: {"at": ..., "ranks": {frasa: posisi}}}
+        self.rankings: Dict[str, Dict] = {}
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._norms: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        if path and path.exists():
+            try:
+                stored = json.loads(path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                stored = {}
+            # Index versi lama menyimpan peringkat di file yang sama
+            self.rankings = stored.get("rankings", {})
+            for doc, entry in stored.get("docs", {}).items():
+                self._add(doc, entry["signature"], entry["terms"])
+
+    # --- Matriks sparse ---
+    def _add(self, doc: str, signature: List[int], terms: Dict[str, int]):
+        self.docs[doc] = {"signature": signature, "terms": terms}
+        for term, tf in terms.items():
+            self.postings[term][doc] = tf
+        self._norms.clear()
+
+    def _remove(self, doc: str):
+        entry = self.docs.pop(doc, None)
+        if entry is None:
+            return
+        for term in entry["terms"]:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc, None)
+                if not posting:
+                    del self.postings[term]
+        self._norms.clear()
+
+    def idf(self, term: str) -> float:
+        return math.log((1 + len(self.docs)) / (1 + len(self.postings.get(term, ())))) + 1
+
+    @staticmethod
+    def _tf(count: int) -> float:
+        return 1 + math.log(count)
+
+    def _norm(self, doc: str) -> float:
+        """Panjang vektor TF-IDF dokumen; dihitung ulang setelah korpus berubah (idf ikut berubah)."""
+        norm = self._norms.get(doc)
+        if norm is None:
+            terms = self.docs[doc]["terms"]
+            norm = math.sqrt(sum((self._tf(tf) * self.idf(t)) ** 2 for t, tf in terms.items())) or 1.0
+            self._norms[doc] = norm
+        return norm
+
+    # --- Sinkronisasi korpus ---
+    def _sources(self) -> Iterator[Tuple[str, Path]]:
+        if self.reports_dir.is_dir():
+            for path in self.reports_dir.glob("report_*.md"):
+                yield f"report:{path.name}", path
+        root = self.products_dir or _products_dir()
+        if root.is_dir():
+            excluded = {f"{product_type}_data.json" for product_type in EXCLUDED_TYPES}
+            for path in root.rglob("*_data.json"):
+                if path.name not in excluded:
+                    yield f"product:{path.relative_to(root).as_posix()}", path
+
+    @staticmethod
+    def _read_terms(path: Path) -> Dict[str, int]:
+        text = path.read_text(encoding="utf-8")
+        if path.suffix == ".json":
+            text = "\n".join(_texts(json.loads(text)))
+        return phrases(text)
+
+    def sync(self) -> bool:
+        """Index laporan/produk yang baru atau berubah, buang yang sudah hilang. True jika berubah."""
+        changed = False
+        seen = set()
+        for doc, path in self._sources():
+            seen.add(doc)
+            signature = _file_signature(path)
+            entry = self.docs.get(doc)
+            if signature is None or (entry and entry["signature"] == signature):
+                continue
+            try:
+                terms = self._read_terms(path)
+            except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+                continue
+            self._remove(doc)
+            self._add(doc, signature, terms)
+            changed = True
+        for stale in [doc for doc in self.docs if doc not in seen]:
+            self._remove(stale)
+            changed = True
+        return changed
+
+    def save(self):
+        """Simpan matriks setelah `sync()` mengubahnya.
+
+        Isinya selalu hasil sinkronisasi penuh dengan file di disk, jadi tulisan proses lain
+        yang lebih baru tidak kehilangan dokumen; lock DB hanya mencegah tulisan bertumpuk.
+        """
+        import main as app
+
+        if not self.path:
+            return
+        with app._db_lock:
+            _write_json_atomic(self.path, {"docs": self.docs})
+
+    # --- Query ---
+    def relevant_docs(self, topic: str, limit: int = RELEVANT_DOCS) -> Dict[str, float]:
+        """Dokumen paling mirip topik (cosine TF-IDF) → skor kemiripan."""
+        scores: Dict[str, float] = defaultdict(float)
+        for term, count in phrases(topic).items():
+            weight = self._tf(count) * self.idf(term) ** 2
+            for doc, tf in self.postings.get(term, {}).items():
+                scores[doc] += weight * self._tf(tf)
+        ranked = sorted(((score / self._norm(doc), doc) for doc, score in scores.items()), reverse=True)
+        return {doc: score for score, doc in ranked[:limit]}
+
+    def suggest(self, topic: str, k: int = TOP_KEYWORDS) -> List[Suggestion]:
+        """Top-k kata kunci untuk topik, diurutkan relevansi."""
+        relevant = self.relevant_docs(topic)
+        if not relevant:
+            return []
+        relevance: Dict[str, float] = defaultdict(float)
+        present: Dict[str, int] = defaultdict(int)
+        for doc, similarity in relevant.items():
+            norm = self._norm(doc)
+            for term, tf in self.docs[doc]["terms"].items():
+                relevance[term] += similarity * self._tf(tf) * self.idf(term) / norm
+                present[term] += 1
+        total = len(self.docs)
+        candidates = [t for t in relevance
+                      if (" " not in t or len(self.postings[t]) >= MIN_PHRASE_DOCS)
+                      and present[t] / len(relevant) >= MIN_LIFT * len(self.postings[t]) / total]
+        pool = sorted(candidates, key=lambda t: (-relevance[t], t))[:k * 10]
+        subsumed = self._subsumed(pool)
+        top = [t for t in pool if t not in subsumed][:k]
+        if not top:
+            return []
+        best = relevance[top[0]]
+        return [Suggestion(
+            keyword=term,
+            relevance=round(relevance[term] / best, 3),
+            cooccurrence=round(present[term] / len(relevant), 3),
+            mentions=sum(self.postings[term].values()),
+            documents=len(self.postings[term]),
+        ) for term in top]
+
+    def _subsumed(self, terms: List[str]) -> set:
+        """Sub-frasa yang hampir selalu muncul sebagai bagian frasa lebih panjang di daftar ini."""
+        present = set(terms)
+        subsumed = set()
+        for term in terms:
+            words = term.split()
+            documents = len(self.postings[term])
+            for n in range(1, len(words)):
+                for i in range(len(words) - n + 1):
+                    part = " ".join(words[i:i + n])
+                    if part in present and documents >= SUBSUME_RATIO * len(self.postings[part]):
+                        subsumed.add(part)
+        return subsumed
+
+    def peek(self, topic: str, k: int = TOP_KEYWORDS) -> List[Suggestion]:
+        """`suggest()` setelah korpus disinkronkan, tanpa menyimpan peringkat."""
+        with self._lock:
+            if self.sync():
+                self.save()
+            return self.suggest(topic, k)
+
+    # --- Peringkat per topik ---
+    def _load_rankings(self) -> Dict[str, Dict]:
+        if not self.rankings_path or not self.rankings_path.exists():
+            return dict(self.rankings)
+        try:
+            stored = json.loads(self.rankings_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return dict(self.rankings)
+        return stored if isinstance(stored, dict) else {}
+
+    def record(self, topic: str, suggestions: List[Suggestion]) -> Dict[str, int]:
+        """Simpan peringkat topik ini dan kembalikan peringkat sebelumnya ({frasa: posisi})."""
+        import main as app
+
+        key = normalize_topic(topic)
+        ranks = {s.keyword: i for i, s in enumerate(suggestions, 1)}
+        if not self.rankings_path:
+            previous = self.rankings.get(key, {}).get("ranks", {})
+            self.rankings[key] = {"at": time.time(), "ranks": ranks}
+            return previous
+        # Baca-gabung-tulis di bawah lock DB agar peringkat dari proses lain tidak tertimpa
+        with app._db_lock:
+            rankings = self._load_rankings()
+            previous = rankings.get(key, {}).get("ranks", {})
+            rankings[key] = {"at": time.time(), "ranks": ranks}
+            _write_json_atomic(self.rankings_path, rankings)
+        return previous
+
+
+_index: Optional[KeywordIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> KeywordIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = KeywordIndex()
+        return _index
+
+
+def prompt_keywords(topic: str, k: int = TOP_KEYWORDS) -> List[Suggestion]:
+    """Kata kunci untuk satu permintaan keyword_tracker; kosong jika index belum menutupi topik."""
+    suggestions = get_index().peek(topic, k)
+    return suggestions if len(suggestions) >= MIN_KEYWORDS else []
+
+
+def outline(suggestions: List[Suggestion]) -> str:
+    """Daftar kata kunci lokal untuk prompt: frasa | relevansi | co-occurrence | dokumen."""
+    if not suggestions:
+        return ""
+    return "\n".join(f"{s.keyword} | {s.relevance:.2f} | {s.cooccurrence:.0%} | {s.documents}"
+                     for s in suggestions)
+
+
+def competition(suggestions: List[Suggestion]) -> Dict[str, str]:
+    """Tertil jumlah dokumen: frasa yang dipakai banyak laporan/produk = persaingan tinggi."""
+    ordered = sorted(suggestions, key=lambda s: (-s.documents, s.keyword))
+    third = math.ceil(len(ordered) / 3) or 1
+    return {s.keyword: COMPETITION_LEVELS[min(i // third, 2)] for i, s in enumerate(ordered)}
+
+
+def fill_keywords(data: Dict, topic: str, local: Optional[Dict] = None,
+                  today: Optional[date] = None) -> Dict:
+    """Isi `report_date` dan `keywords` keyword_tracker dari index.
+
+    `local["keywords"]` = daftar dari `prompt_keywords` saat prompt dibuat; `keyword_notes` LLM
+    (cpc_estimate & recommended_action per kata kunci) digabung ke baris daftar itu. Jika index
+    belum punya cukup kata kunci untuk topik, `keywords` dibiarkan kosong agar BuilderAgent
+    memintanya ke LLM.
+    """
+    data["report_date"] = format_date(today or date.today())
+    notes = {normalize_topic(str(n.get("keyword", ""))): n
+             for n in data.pop("keyword_notes", None) or [] if isinstance(n, dict)}
+    if "keywords" in data:
+        return data
+    suggestions = local["keywords"] if local and "keywords" in local else prompt_keywords(topic)
+    if len(suggestions) < MIN_KEYWORDS:
+        return data
+    previous = get_index().record(topic, suggestions)
+    levels = competition(suggestions)
+    keywords = []
+    for position, s in enumerate(suggestions, 1):
+        note = notes.get(s.keyword, {})
+        before = previous.get(s.keyword)
+        keywords.append({
+            "keyword": s.keyword,
+            "search_volume": s.mentions,
+            "competition": levels[s.keyword],
+            "current_position": position,
+            "previous_position": before if before is not None else "Not Ranked",
+            "change": before - position if before is not None else 0,
+            "cpc_estimate": float(note.get("cpc_estimate") or 0.0),
+            "recommended_action": note.get("recommended_action") or DEFAULT_ACTIONS[levels[s.keyword]],
+        })
+    data["keywords"] = keywords
+    return data
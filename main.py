@@ -1,24 +1,49 @@
 # main.py
 import os
+import copy
 import json
 import uuid
 from pathlib import Path
 import csv
 import sys
 import time
-from typing import Optional, Dict, List
-
-# Import untuk PDF
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from weasyprint import HTML
+import threading
+from typing import Optional, Dict, List, Tuple
 
 from agents import AnalystAgent, BuilderAgent
+from template_renderer import TemplateRenderer
+from similarity import TopicIndex
+from repository import JsonRepository, Dashboard, InterProcessLock
+from signal_queue import SignalQueue
+from records import SignalRecord, ProductRecord, load_records, record_to_json
+from catalogue import ProductCatalogue, SORT_FIELDS, describe_files
+from checkpoint import SuiteCheckpoint
+import metrics
+import prayer_times
+import pregen
+import scheduler
+import schemas
+import telemetry
+import tracing
 
 # --- KONFIGURASI ---
 DB_DIR = Path("db")
 PRODUCTS_DIR = Path("products")
 SIGNALS_DB_PATH = DB_DIR / "signals.json"
 PRODUCTS_DB_PATH = DB_DIR / "products.json"
+TOPIC_INDEX_PATH = DB_DIR / "topic_index.json"
+# Batas kemiripan (0-1) untuk menganggap dua topik hampir sama
+DUPLICATE_THRESHOLD = float(os.getenv("AUTOPRENEUR_DUPLICATE_THRESHOLD", "0.6"))
+SIGNAL_QUEUE_PATH = DB_DIR / "signal_queue.json"
+PRODUCTS_INDEX_PATH = DB_DIR / "products_index.json"
+# Checkpoint per-run untuk generate suite (lihat checkpoint.py)
+RUNS_DIR = DB_DIR / "runs"
+CATALOGUE_PAGE_SIZE = 10
+# Bobot antrian generate: tambahan prioritas per hari umur signal & pengali skor per tenant
+QUEUE_AGE_WEIGHT = float(os.getenv("AUTOPRENEUR_QUEUE_AGE_WEIGHT", "0"))
+QUEUE_TENANT_WEIGHTS = scheduler.TENANT_WEIGHTS
+# Jumlah signal teratas yang ditampilkan saat memilih manual
+GENERATE_LIST_LIMIT = 20
 
 # --- FUNGSI UTILITAS ---
 def ensure_setup():
@@ -31,21 +56,64 @@ def ensure_setup():
     if not PRODUCTS_DB_PATH.exists():
         PRODUCTS_DB_PATH.write_text("[]", encoding="utf-8")
 
-def load_db(path: Path):
-    """Membaca data dari file JSON."""
+def load_db(path: Path, record_type=None):
+    """Membaca data dari file JSON, opsional sebagai record ber-__slots__."""
     if not path.exists() or path.stat().st_size == 0:
         return []
     try:
+        if record_type is not None:
+            return load_records(path, record_type)
         with path.open("r", encoding="utf-8") as f:
             return json.load(f)
     except json.JSONDecodeError:
         print(f"⚠️  Peringatan: File {path.name} korup, menganggap sebagai list kosong.")
         return []
 
+@tracing.traced("db.save", "path")
 def save_db(path: Path, data):
-    """Menyimpan data ke file JSON."""
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    """Menyimpan data ke file JSON secara atomik (tulis file sementara lalu rename)."""
+    with metrics.DB_WRITE_SECONDS.time(path.name):
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, default=record_to_json)
+        os.replace(tmp_path, path)
+
+# Cache DB in-process: file hanya di-parse ulang jika mtime/ukurannya berubah
+signals_repo = JsonRepository(SIGNALS_DB_PATH, lambda p: load_db(p, SignalRecord), save_db)
+products_repo = JsonRepository(PRODUCTS_DB_PATH, lambda p: load_db(p, ProductRecord), save_db)
+dashboard = Dashboard(signals_repo, products_repo)
+catalogue = ProductCatalogue(PRODUCTS_DB_PATH, PRODUCTS_INDEX_PATH)
+
+_signal_queue: Optional[SignalQueue] = None
+_signal_queue_version = -1
+
+def load_signal_queue() -> SignalQueue:
+    """Antrian prioritas signal 'new', disinkronkan hanya saat DB signal berubah."""
+    global _signal_queue, _signal_queue_version
+    if _signal_queue is None:
+        _signal_queue = SignalQueue(SIGNAL_QUEUE_PATH, QUEUE_AGE_WEIGHT, QUEUE_TENANT_WEIGHTS)
+        metrics.SIGNAL_QUEUE_DEPTH.set_function(lambda: len(_signal_queue))
+    signals = signals_repo.all()
+    if _signal_queue_version != signals_repo.version:
+        if _signal_queue.sync(signals):
+            _signal_queue.save()
+        _signal_queue_version = signals_repo.version
+    return _signal_queue
+
+_topic_index: Optional[TopicIndex] = None
+_topic_index_version = -1
+
+def load_topic_index() -> TopicIndex:
+    """Index kemiripan topik, dibaca sekali per proses dan disinkronkan hanya saat DB signal berubah."""
+    global _topic_index, _topic_index_version
+    if _topic_index is None:
+        _topic_index = TopicIndex(TOPIC_INDEX_PATH)
+    signals = signals_repo.all()
+    if _topic_index_version != signals_repo.version:
+        if _topic_index.sync(signals):
+            _topic_index.save()
+        _topic_index_version = signals_repo.version
+    return _topic_index
 
 def clear_screen():
     """Membersihkan layar terminal."""
@@ -91,33 +159,343 @@ def pause():
     input("\n📌 Tekan Enter untuk melanjutkan...")
 
 # --- FUNGSI BARU UNTUK PDF ---
+@tracing.traced("render.pdf")
 def write_pdf(product_folder: Path, assets: dict) -> Path:
     """Render template Jinja2 menjadi file PDF menggunakan WeasyPrint."""
     print("📄 Merender file PDF...")
+    # Import untuk PDF: dimuat saat dipakai agar start CLI/menu tidak menunggu WeasyPrint
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+    from weasyprint import HTML
+
     env = Environment(
         loader=FileSystemLoader("templates"),
-        autoescape=select_autoescape(["html"])
+        autoescape=select_autoescape(["html"]),
+        # Schema menjamin hashtag berupa list; ditampilkan sebagai teks dipisah spasi
+        finalize=lambda value: " ".join(value) if isinstance(value, list) else value
     )
     template = env.get_template("umkm_productivity/caption_bank.html")
     
-    # Process captions for display - ensure hashtags are strings not arrays
-    display_assets = assets.copy()
-    if 'captions' in display_assets:
-        processed_captions = []
-        for caption in display_assets['captions']:
-            processed_caption = caption.copy()
-            if 'hashtags' in processed_caption and isinstance(processed_caption['hashtags'], list):
-                processed_caption['hashtags'] = ' '.join(processed_caption['hashtags'])
-            processed_captions.append(processed_caption)
-        display_assets['captions'] = processed_captions
-    
-    html_content = template.render(**display_assets)
+    with tracing.span("render.jinja", template="caption_bank"):
+        html_content = template.render(**assets)
     
     pdf_path = product_folder / "panduan_konten.pdf"
-    HTML(string=html_content).write_pdf(pdf_path)
+    with tracing.span("render.weasyprint", template="caption_bank"):
+        HTML(string=html_content).write_pdf(pdf_path)
     print(f"✅ File PDF disimpan di: {pdf_path}")
     return pdf_path
 
+# --- OPERASI INTI (dipakai menu & CLI) ---
+# Menjaga konsistensi DB ketika beberapa thread/proses worker menyimpan hasil bersamaan
+_db_lock = InterProcessLock(DB_DIR / ".db.lock")
+
+def find_duplicates(topic: str) -> List[Dict]:
+    """Cari signal yang topiknya hampir sama dengan topik baru."""
+    with _db_lock:
+        return load_topic_index().query(topic, DUPLICATE_THRESHOLD)
+
+@tracing.traced("db.create_signal")
+def create_signal(topic: str, report_text: str, score: int, forked_from: Optional[str] = None) -> Dict:
+    """Simpan report & signal baru ke DB, antrian generate, dan index kemiripan."""
+    global _signal_queue_version, _topic_index_version
+    signal_id = str(uuid.uuid4())[:8]
+    report_file = DB_DIR / f"report_{signal_id}.md"
+    report_file.write_text(report_text, encoding="utf-8")
+    
+    new_signal = {
+        "id": signal_id,
+        "topic": topic,
+        "score": score,
+        "status": "new",
+        "report_file": str(report_file),
+        "created_at": time.time()
+    }
+    if forked_from:
+        new_signal["forked_from"] = forked_from
+    
+    with _db_lock:
+        queue = load_signal_queue()
+        index = load_topic_index()
+        signals_repo.append(SignalRecord.from_dict(new_signal))
+        queue.push(new_signal)
+        queue.save()
+        index.add(signal_id, topic, report_text)
+        index.save()
+        # Antrian & index sudah diperbarui langsung, tidak perlu sync ulang seluruh tabel signal
+        _signal_queue_version = _topic_index_version = signals_repo.version
+    
+    metrics.SIGNALS_CREATED.inc("fork" if forked_from else "scan")
+    pregen.notify(new_signal)
+    return new_signal
+
+@tracing.traced("scan", "topic")
+def scan_topic(topic: str) -> Dict:
+    """Riset & beri skor topik dengan AnalystAgent lalu simpan sebagai signal."""
+    analyst = AnalystAgent()
+    report_text = analyst.research_topic(topic)
+    score = analyst.score_idea(report_text)
+    return create_signal(topic, report_text, score)
+
+@tracing.traced("fork", "topic")
+def fork_signal(topic: str, source_signal: Dict) -> Dict:
+    """Buat signal baru dari report & skor signal lain tanpa memanggil LLM."""
+    report_text = Path(source_signal['report_file']).read_text(encoding="utf-8")
+    return create_signal(topic, report_text, source_signal['score'], forked_from=source_signal['id'])
+
+@tracing.traced("render.csv")
+def write_caption_csv(product_folder: Path, assets: dict) -> Path:
+    """Simpan caption bank sebagai CSV dengan hashtag digabung ke teks."""
+    csv_path = product_folder / "caption_bank.csv"
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['day', 'text'])
+        writer.writeheader()
+        
+        # Hashtag digabung ke teks caption
+        processed_captions = [
+            {'day': caption['day'], 'text': " ".join([caption['text'], *caption['hashtags']])}
+            for caption in assets['captions']
+        ]
+        
+        writer.writerows(processed_captions)
+    return csv_path
+
+def render_product_files(product_type: str, assets: dict, product_folder: Path) -> Dict[str, str]:
+    """Tulis file produk (PDF/CSV/HTML/JSON) dari data aset."""
+    with tracing.profile("render", product_type=product_type):
+        return _render_product_files(product_type, assets, product_folder)
+
+def _render_product_files(product_type: str, assets: dict, product_folder: Path) -> Dict[str, str]:
+    if product_type == "caption_bank":
+        with scheduler.slot("render"), metrics.RENDER_SECONDS.time(product_type), \
+                telemetry.timed("render", product_type=product_type):
+            csv_path = write_caption_csv(product_folder, assets)
+            pdf_path = write_pdf(product_folder, assets)
+            # Data mentah disimpan agar produk bisa dirender ulang tanpa LLM
+            json_path = product_folder / "caption_bank_data.json"
+            json_path.write_text(json.dumps(assets, indent=2, ensure_ascii=False), encoding="utf-8")
+        return {"csv": str(csv_path), "pdf": str(pdf_path), "json": str(json_path)}
+    
+    files = TemplateRenderer().render_product(product_type, assets, product_folder)
+    return {ftype: str(fpath) for ftype, fpath in files.items() if fpath}
+
+@tracing.traced("db.save_product", "signal_id")
+def save_product(new_product: Dict, signal_id: Optional[str]):
+    """Catat produk baru dan tandai signal sumbernya sudah di-generate (None = produk ad-hoc)."""
+    global _signal_queue_version
+    with _db_lock:
+        products_repo.append(ProductRecord.from_dict(new_product))
+        
+        if signal_id is not None:
+            queue = load_signal_queue()
+            signals_repo.update(signal_id, status='generated')
+            queue.remove(signal_id)
+            queue.save()
+            _signal_queue_version = signals_repo.version
+    metrics.PRODUCTS_GENERATED.inc(new_product.get('product_type') or "-")
+
+def product_record(signal: Dict, product_type: str, assets: Dict, files: Dict[str, str],
+                   product_id: str, extra: Optional[Dict] = None) -> Dict:
+    """Susun record DB untuk satu produk yang sudah dirender."""
+    suite = next((name for name, types in TemplateRenderer.SUITES.items() if product_type in types), None)
+    return {
+        "id": product_id,
+        "signal_id": signal['id'],
+        "name": assets['name'],
+        "description": assets['description'],
+        "product_type": product_type,
+        "suite": suite,
+        "created_at": time.time(),
+        "files": files,
+        **(extra or {})
+    }
+
+@tracing.traced("generate_product", "product_type")
+def generate_product(signal: Dict, product_type: str = "caption_bank", extra: Optional[Dict] = None) -> Dict:
+    """Generate satu produk dari signal, render file-nya, lalu simpan ke DB."""
+    product_id = f"prod_{uuid.uuid4().hex[:12]}"
+    product_folder = PRODUCTS_DIR / product_id
+    # Hasil pre-generate (lihat pregen.py) langsung dipakai tanpa LLM & render
+    claimed = pregen.claim(signal, product_type, product_folder)
+    if claimed:
+        assets, files = claimed
+    else:
+        builder = BuilderAgent()
+        assets = builder.generate_product_assets(signal['topic'], product_type)
+        if not assets:
+            raise RuntimeError("Gagal membuat aset produk.")
+        product_folder.mkdir(parents=True)
+        files = render_product_files(product_type, assets, product_folder)
+    
+    new_product = product_record(signal, product_type, assets, files, product_id, extra)
+    save_product(new_product, signal['id'])
+    return new_product
+
+@tracing.traced("generate_products_batch", "product_type")
+def generate_products_batch(signals: List[Dict], product_type: str, extra: Optional[Dict] = None
+                            ) -> Tuple[List[Dict], Dict[str, str]]:
+    """Generate satu jenis produk untuk banyak signal dengan prompt multi-topik.
+    
+    Return (produk tersimpan, error per signal_id).
+    """
+    products, errors = [], {}
+    remaining = []
+    for signal in signals:
+        product_id = f"prod_{uuid.uuid4().hex[:12]}"
+        claimed = pregen.claim(signal, product_type, PRODUCTS_DIR / product_id)
+        if not claimed:
+            remaining.append(signal)
+            continue
+        new_product = product_record(signal, product_type, claimed[0], claimed[1], product_id, extra)
+        save_product(new_product, signal['id'])
+        products.append(new_product)
+    
+    builder = BuilderAgent()
+    assets_by_topic, topic_errors = builder.generate_product_assets_batch([s['topic'] for s in remaining], product_type)
+    for signal in remaining:
+        assets = assets_by_topic.get(signal['topic'])
+        if assets is None:
+            errors[signal['id']] = topic_errors.get(signal['topic'], "Gagal membuat aset produk.")
+            continue
+        try:
+            product_id = f"prod_{uuid.uuid4().hex[:12]}"
+            product_folder = PRODUCTS_DIR / product_id
+            product_folder.mkdir(parents=True)
+            files = render_product_files(product_type, assets, product_folder)
+            new_product = product_record(signal, product_type, assets, files, product_id, extra)
+            save_product(new_product, signal['id'])
+            products.append(new_product)
+        except Exception as e:
+            errors[signal['id']] = str(e)
+    return products, errors
+
+def open_suite_checkpoint(signal: Dict, suite_type: str, run_id: Optional[str] = None) -> SuiteCheckpoint:
+    """Buka checkpoint run yang ada, atau buat run baru untuk suite ini."""
+    validator = TemplateRenderer().validate_template_data
+    checkpoint = SuiteCheckpoint.open(RUNS_DIR, run_id, validator) if run_id else None
+    if checkpoint is None:
+        checkpoint = SuiteCheckpoint.create(
+            RUNS_DIR, suite_type, signal['topic'], signal['id'],
+            product_id=f"prod_{uuid.uuid4().hex[:12]}", run_id=run_id,
+            validator=validator
+        )
+    return checkpoint
+
+def render_suite_files(suite_type: str, suite_data: Dict[str, Dict], product_folder: Path) -> Dict[str, str]:
+    """Render suite (melewati produk yang sudah dirender) dan kembalikan daftar file-nya.
+    
+    RuntimeError jika ada produk yang gagal dirender.
+    """
+    with tracing.profile("render.suite", suite_type=suite_type):
+        results = TemplateRenderer().render_suite(suite_type, suite_data, product_folder, resume=True)
+    failed = [product_type for product_type, product_files in results.items() if not product_files]
+    if failed:
+        # Produk yang sudah dirender dilewati saat run dilanjutkan, jadi cukup gagalkan run-nya
+        raise RuntimeError(f"Render gagal untuk: {', '.join(failed)}")
+    files = {}
+    for product_type, product_files in results.items():
+        for ftype, fpath in product_files.items():
+            if fpath:
+                files[f"{product_type}_{ftype}"] = str(fpath)
+    files["manifest"] = str(product_folder / suite_type / "manifest.json")
+    return files
+
+def suite_record(signal: Dict, suite_type: str, suite_config: Dict, suite_data: Dict[str, Dict],
+                 files: Dict[str, str], checkpoint: SuiteCheckpoint, extra: Optional[Dict] = None) -> Dict:
+    """Susun record DB untuk satu paket suite."""
+    names = [data.get('name', product_type) for product_type, data in suite_data.items() if data]
+    return {
+        "id": checkpoint.meta["product_id"],
+        "signal_id": signal['id'],
+        "name": f"Paket {suite_type.replace('_', ' ').title()}: {signal['topic']}",
+        "description": "Berisi: " + ", ".join(names),
+        "product_type": "suite",
+        "suite": suite_type,
+        "bundle_price": suite_config["bundle_price"],
+        "run_id": checkpoint.run_id,
+        "created_at": time.time(),
+        "files": files,
+        **(extra or {})
+    }
+
+@tracing.traced("generate_ramadan_edition", "city")
+def generate_ramadan_edition(signal: Dict, assets: Dict, city: "prayer_times.City",
+                             start=None, extra: Optional[Dict] = None) -> Dict:
+    """Satu produk ramadan_calendar untuk satu kota dari konten LLM yang sama, tanpa panggilan LLM.
+    
+    `assets` hasil BuilderAgent sekali untuk signal; jadwal sholat & kalender dihitung ulang per kota.
+    """
+    data = prayer_times.fill_ramadan_calendar(copy.deepcopy(assets), city, start)
+    if city.name.lower() not in data['name'].lower():
+        data['name'] = f"{data['name']} - {city.name}"
+    product_id = f"prod_{uuid.uuid4().hex[:12]}"
+    product_folder = PRODUCTS_DIR / product_id
+    product_folder.mkdir(parents=True)
+    files = render_product_files("ramadan_calendar", data, product_folder)
+    new_product = product_record(signal, "ramadan_calendar", data, files, product_id,
+                                 {"city": city.name, **(extra or {})})
+    save_product(new_product, signal['id'])
+    return new_product
+
+@tracing.traced("generate_suite", "suite_type", "run_id")
+def generate_suite(signal: Dict, suite_type: str, extra: Optional[Dict] = None,
+                   run_id: Optional[str] = None) -> Dict:
+    """Generate seluruh produk dalam satu suite dari signal dan simpan sebagai satu paket.
+    
+    Hasil LLM tiap produk langsung disimpan ke checkpoint run. Jika `run_id` milik run
+    yang belum selesai, produk yang sudah ada di checkpoint maupun yang sudah dirender
+    tidak dibuat ulang.
+    """
+    checkpoint = open_suite_checkpoint(signal, suite_type, run_id)
+    # Produk bisa sudah tersimpan walau run belum ditandai complete (crash di antara keduanya)
+    existing = products_repo.get(checkpoint.meta["product_id"])
+    if existing is not None:
+        if checkpoint.meta.get("status") != "complete":
+            checkpoint.mark("complete")
+        return existing
+    
+    checkpoint.claim()
+    try:
+        builder = BuilderAgent()
+        suite_data, suite_config = builder.generate_product_suite(suite_type, signal['topic'], checkpoint=checkpoint)
+        files = render_suite_files(suite_type, suite_data, PRODUCTS_DIR / checkpoint.meta["product_id"])
+    except Exception as e:
+        checkpoint.mark("failed", error=str(e))
+        raise RuntimeError(f"{e} (lanjutkan dengan run {checkpoint.run_id})") from e
+    
+    new_product = suite_record(signal, suite_type, suite_config, suite_data, files, checkpoint, extra)
+    save_product(new_product, signal['id'])
+    checkpoint.mark("complete")
+    return new_product
+
+def resume_suite_run(run_id: str) -> Dict:
+    """Lanjutkan run suite yang gagal/terhenti dari checkpoint-nya."""
+    checkpoint = SuiteCheckpoint.open(RUNS_DIR, run_id)
+    if checkpoint is None:
+        raise FileNotFoundError(f"Run tidak ditemukan: {run_id}")
+    signal = signals_repo.get(checkpoint.meta["signal_id"])
+    if signal is None:
+        signal = {"id": checkpoint.meta["signal_id"], "topic": checkpoint.meta["topic"]}
+    return generate_suite(signal, checkpoint.meta["suite_type"], run_id=run_id)
+
+@tracing.traced("rerender")
+def rerender_product(product: Dict) -> Dict[str, str]:
+    """Render ulang file produk dari data JSON yang tersimpan, tanpa memanggil LLM."""
+    product_folder = PRODUCTS_DIR / product['id']
+    data_files = sorted(product_folder.rglob("*_data.json"))
+    if not data_files:
+        raise FileNotFoundError(f"Data JSON untuk produk {product['id']} tidak ditemukan")
+    
+    rendered = {}
+    for data_path in data_files:
+        product_type = data_path.name[:-len("_data.json")]
+        # Data lama (sebelum schema strict) tetap boleh dirender selama field utamanya lengkap
+        assets = schemas.upgrade_legacy(product_type, json.loads(data_path.read_text(encoding="utf-8")))
+        errors = schemas.missing_fields(product_type, assets)
+        if errors:
+            raise ValueError(f"Data {data_path} tidak lengkap: " + "; ".join(errors[:5]))
+        for ftype, fpath in render_product_files(product_type, assets, data_path.parent).items():
+            rendered[f"{product_type}_{ftype}"] = fpath
+    return rendered
+
 # --- FUNGSI MENU ---
 def menu_scan_topic():
     """Menu untuk scan topik bisnis."""
@@ -144,28 +522,57 @@ def menu_scan_topic():
         pause()
         return
     
-    print(f"\n🔄 Sedang menganalisis: '{topic}'")
-    print("⏳ Proses ini membutuhkan waktu 30-60 detik...")
+    matches = find_duplicates(topic)
+    source_signal = None
     
-    try:
-        analyst = AnalystAgent()
-        report_text = analyst.research_topic(topic)
-        score = analyst.score_idea(report_text)
-        signal_id = str(uuid.uuid4())[:8]
-        report_file = DB_DIR / f"report_{signal_id}.md"
-        report_file.write_text(report_text, encoding="utf-8")
+    if matches:
+        print("\n♻️  Ditemukan topik yang hampir sama:")
+        print("-" * 70)
+        for i, match in enumerate(matches, 1):
+            existing = signals_repo.get(match['signal_id'])
+            print(f"{i}. {existing['topic'][:45]} (Skor: {existing['score']}, Kemiripan: {match['similarity']:.0%})")
+        print("-" * 70)
+        print("\nApa yang ingin dilakukan?")
+        print("1. Pakai ulang report & skor yang sudah ada (tanpa biaya API)")
+        print("2. Fork: buat signal baru dari report yang sudah ada (tanpa biaya API)")
+        print("3. Tetap lakukan scan baru")
+        print("4. Batal")
         
-        new_signal = {
-            "id": signal_id,
-            "topic": topic,
-            "score": score,
-            "status": "new",
-            "report_file": str(report_file)
-        }
+        action = get_choice(4, has_back=False)
+        if action == 4:
+            return
+        if action in (1, 2):
+            if len(matches) > 1:
+                print(f"\nPilih topik yang ingin dipakai (1-{len(matches)}): ", end="")
+                match_choice = get_choice(len(matches), has_back=False)
+            else:
+                match_choice = 1
+            source_signal = signals_repo.get(matches[match_choice - 1]['signal_id'])
+            
+            if action == 1:
+                print("\n" + "=" * 70)
+                print("♻️  MEMAKAI ULANG SIGNAL YANG ADA")
+                print("=" * 70)
+                print(f"📊 ID Signal    : {source_signal['id']}")
+                print(f"💡 Topik        : {source_signal['topic']}")
+                print(f"⭐ Skor Bisnis  : {source_signal['score']}/100")
+                print(f"📄 Laporan      : {source_signal['report_file']}")
+                print("=" * 70)
+                pause()
+                return
+    
+    try:
+        if source_signal:
+            print(f"\n🍴 Fork dari signal {source_signal['id']}: '{source_signal['topic']}'")
+            new_signal = fork_signal(topic, source_signal)
+        else:
+            print(f"\n🔄 Sedang menganalisis: '{topic}'")
+            print("⏳ Proses ini membutuhkan waktu 30-60 detik...")
+            new_signal = scan_topic(topic)
         
-        signals = load_db(SIGNALS_DB_PATH)
-        signals.append(new_signal)
-        save_db(SIGNALS_DB_PATH, signals)
+        signal_id = new_signal['id']
+        score = new_signal['score']
+        report_file = new_signal['report_file']
         
         print("\n" + "=" * 70)
         print("✅ ANALISIS SELESAI!")
@@ -191,10 +598,9 @@ def menu_scan_topic():
 def menu_generate_product():
     """Menu untuk generate produk."""
     print_header()
-    signals = load_db(SIGNALS_DB_PATH)
-    new_signals = [s for s in signals if s['status'] == 'new']
+    queue = load_signal_queue()
     
-    if not new_signals:
+    if not len(queue):
         print("⚠️  TIDAK ADA SIGNAL BARU")
         print("=" * 70)
         print("Anda perlu melakukan scan topik terlebih dahulu.")
@@ -202,6 +608,10 @@ def menu_generate_product():
         pause()
         return
     
+    # Hanya signal teratas yang diambil dari antrian, tanpa memfilter seluruh DB
+    top_signals = [signals_repo.get(sid) for sid in queue.peek(GENERATE_LIST_LIMIT)]
+    speculated = pregen.ready_signals("caption_bank")
+    
     print("🎯 GENERATE PRODUK DIGITAL")
     print("=" * 70)
     print("\nSignal yang tersedia untuk di-generate:")
@@ -209,16 +619,21 @@ def menu_generate_product():
     print(f"{'No':<4} {'Topik':<40} {'Skor':<10} {'ID':<10}")
     print("-" * 70)
     
-    for i, signal in enumerate(new_signals, 1):
+    for i, signal in enumerate(top_signals, 1):
         topic_short = signal['topic'][:37] + "..." if len(signal['topic']) > 40 else signal['topic']
-        print(f"{i:<4} {topic_short:<40} {signal['score']:<10} {signal['id']:<10}")
+        ready = " ⚡" if signal['id'] in speculated else ""
+        print(f"{i:<4} {topic_short:<40} {signal['score']:<10} {signal['id']:<10}{ready}")
     
     print("-" * 70)
-    print(f"\n📊 Total signal baru: {len(new_signals)}")
+    if speculated:
+        print("⚡ = sudah di-generate di latar belakang, selesai seketika")
+    print(f"\n📊 Total signal baru: {len(queue)}")
+    if len(queue) > len(top_signals):
+        print(f"   (menampilkan {len(top_signals)} prioritas teratas)")
     
     # Pilih signal
     print("\nPilih signal yang ingin di-generate:")
-    print("1. Otomatis (pilih skor tertinggi)")
+    print("1. Otomatis (pilih prioritas tertinggi)")
     print("2. Pilih manual")
     print("3. Batal")
     
@@ -228,13 +643,13 @@ def menu_generate_product():
         return
     
     if choice == 1:
-        selected_signal = max(new_signals, key=lambda s: s['score'])
+        selected_signal = top_signals[0]
     else:
-        print(f"\nMasukkan nomor signal (1-{len(new_signals)}): ", end="")
-        signal_choice = get_choice(len(new_signals), has_back=False)
+        print(f"\nMasukkan nomor signal (1-{len(top_signals)}): ", end="")
+        signal_choice = get_choice(len(top_signals), has_back=False)
         if not signal_choice:
             return
-        selected_signal = new_signals[signal_choice - 1]
+        selected_signal = top_signals[signal_choice - 1]
     
     print(f"\n🔥 Memproses: '{selected_signal['topic']}'")
     print(f"⭐ Skor: {selected_signal['score']}")
@@ -242,72 +657,18 @@ def menu_generate_product():
     print("🤖 AI sedang membuat konten...")
     
     try:
-        builder = BuilderAgent()
-        assets = builder.generate_product_assets(selected_signal['topic'], "caption_bank")
-        
-        if not assets:
-            print("❌ Gagal membuat aset produk.")
-            pause()
-            return
-        
-        product_id = f"prod_{uuid.uuid4().hex[:12]}"
+        new_product = generate_product(selected_signal, "caption_bank")
+        product_id = new_product['id']
         product_folder = PRODUCTS_DIR / product_id
-        product_folder.mkdir()
-        
-        # 1. Simpan file CSV
-        csv_path = product_folder / "caption_bank.csv"
-        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['day', 'text'])
-            writer.writeheader()
-            
-            # Process captions to merge hashtags into text
-            processed_captions = []
-            for caption in assets['captions']:
-                processed_caption = {
-                    'day': caption['day'],
-                    'text': caption['text']
-                }
-                
-                # Add hashtags to text if they exist
-                if 'hashtags' in caption and caption['hashtags']:
-                    hashtags_str = ' '.join(caption['hashtags'])
-                    processed_caption['text'] = f"{caption['text']} {hashtags_str}"
-                
-                processed_captions.append(processed_caption)
-            
-            writer.writerows(processed_captions)
-        
-        # 2. Simpan file PDF
-        pdf_path = write_pdf(product_folder, assets)
-        
-        # 3. Update database
-        new_product = {
-            "id": product_id,
-            "signal_id": selected_signal['id'],
-            "name": assets['name'],
-            "description": assets['description'],
-            "files": {
-                "csv": str(csv_path),
-                "pdf": str(pdf_path)
-            }
-        }
-        
-        products = load_db(PRODUCTS_DB_PATH)
-        products.append(new_product)
-        save_db(PRODUCTS_DB_PATH, products)
-        
-        # Update status signal
-        for s in signals:
-            if s['id'] == selected_signal['id']:
-                s['status'] = 'generated'
-        save_db(SIGNALS_DB_PATH, signals)
+        csv_path = Path(new_product['files']['csv'])
+        pdf_path = Path(new_product['files']['pdf'])
         
         print("\n" + "=" * 70)
         print("🎉 PRODUK BERHASIL DIBUAT!")
         print("=" * 70)
         print(f"📦 ID Produk    : {product_id}")
-        print(f"📌 Nama         : {assets['name']}")
-        print(f"📝 Deskripsi    : {assets['description'][:60]}...")
+        print(f"📌 Nama         : {new_product['name']}")
+        print(f"📝 Deskripsi    : {new_product['description'][:60]}...")
         print(f"\n📂 File tersimpan di: {product_folder}")
         print(f"   • Caption Bank (CSV): {csv_path.name}")
         print(f"   • Panduan (PDF)     : {pdf_path.name}")
@@ -324,7 +685,7 @@ def menu_view_signals():
     print("📊 DAFTAR SIGNAL RISET")
     print("=" * 70)
     
-    signals = load_db(SIGNALS_DB_PATH)
+    signals = signals_repo.all()
     
     if not signals:
         print("📭 Belum ada signal yang tersimpan.")
@@ -359,54 +720,133 @@ def menu_view_signals():
     print("-" * 70)
     print(f"\n📈 Total signal: {len(signals)} | Baru: {len(new_signals)} | Sudah di-generate: {len(generated_signals)}")
     
+    histogram = dashboard.stats()['score_histogram']
+    print("📊 Sebaran skor: " + " | ".join(f"{b}-{b + 9 if b < 90 else 100}: {n}" for b, n in histogram.items() if n))
+    
     pause()
 
-def menu_view_products():
-    """Menu untuk melihat daftar produk."""
-    print_header()
-    print("📦 DAFTAR PRODUK DIGITAL")
-    print("=" * 70)
+def format_size(size: int) -> str:
+    """Format ukuran file agar mudah dibaca."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def choose_catalogue_filter(filters: Dict) -> Dict:
+    """Sub-menu untuk mengatur filter katalog produk."""
+    print("\n🔎 FILTER PRODUK")
+    print("-" * 50)
     
-    products = load_db(PRODUCTS_DB_PATH)
+    suites = catalogue.suites()
+    print_menu("Filter suite:", ["Semua suite"] + suites, back_option=False)
+    choice = get_choice(len(suites) + 1, has_back=False)
+    filters['suite'] = None if choice == 1 else suites[choice - 2]
     
-    if not products:
-        print("📭 Belum ada produk yang dibuat.")
-        print("\nGenerate produk dari signal yang tersedia!")
-        pause()
-        return
+    product_types = catalogue.product_types()
+    print_menu("Filter jenis produk:", ["Semua jenis"] + product_types, back_option=False)
+    choice = get_choice(len(product_types) + 1, has_back=False)
+    filters['product_type'] = None if choice == 1 else product_types[choice - 2]
     
-    print(f"\n🎁 Total {len(products)} produk tersedia:")
-    print("-" * 70)
+    for key, label in (('date_from', "Dari tanggal"), ('date_to', "Sampai tanggal")):
+        while True:
+            value = input(f"\n📅 {label} (YYYY-MM-DD, kosongkan untuk semua): ").strip()
+            if not value:
+                filters[key] = None
+                break
+            try:
+                time.strptime(value, "%Y-%m-%d")
+                filters[key] = value
+                break
+            except ValueError:
+                print("❌ Format tanggal harus YYYY-MM-DD")
+    return filters
+
+def menu_view_products():
+    """Menu untuk melihat katalog produk per halaman."""
+    filters = {'suite': None, 'product_type': None, 'date_from': None, 'date_to': None}
+    sort = "terbaru"
+    cursors = [None]
     
-    for i, product in enumerate(products, 1):
-        print(f"\n{i}. {product['name']}")
-        print(f"   📌 ID: {product['id']}")
-        print(f"   📝 {product['description'][:70]}...")
-        print(f"   📂 Lokasi: products/{product['id']}/")
+    while True:
+        print_header()
+        print("📦 DAFTAR PRODUK DIGITAL")
+        print("=" * 70)
         
-        if 'files' in product:
-            print("   📎 Files:")
-            for file_type, file_path in product['files'].items():
-                print(f"      • {file_type.upper()}: {Path(file_path).name}")
-    
-    print("-" * 70)
-    
-    # Opsi untuk membuka folder
-    print("\n📂 Ingin membuka folder produk?")
-    print("1. Ya, buka Windows Explorer")
-    print("2. Tidak, kembali ke menu")
-    
-    choice = get_choice(2, has_back=False)
-    
-    if choice == 1 and products:
-        try:
-            # Buka folder products di Windows Explorer
-            os.startfile(str(PRODUCTS_DIR.absolute()))
-            print("✅ Folder produk telah dibuka!")
-        except:
-            print(f"📂 Lokasi folder: {PRODUCTS_DIR.absolute()}")
-    
-    pause()
+        page = catalogue.page(cursors[-1], CATALOGUE_PAGE_SIZE, sort=sort, **filters)
+        
+        if not page['total'] and not any(filters.values()):
+            print("📭 Belum ada produk yang dibuat.")
+            print("\nGenerate produk dari signal yang tersedia!")
+            pause()
+            return
+        
+        active = [f"{k}={v}" for k, v in filters.items() if v]
+        print(f"🔎 Filter: {', '.join(active) if active else 'tidak ada'} | ↕️  Urutan: {sort}")
+        
+        if page['items']:
+            first = page['start'] + 1
+            last = page['start'] + len(page['items'])
+            print(f"\n🎁 Produk {first}-{last} dari {page['total']}:")
+        else:
+            print("\n📭 Tidak ada produk yang cocok dengan filter.")
+        print("-" * 70)
+        
+        for i, product in enumerate(page['items'], page['start'] + 1):
+            print(f"\n{i}. {product['name']}")
+            print(f"   📌 ID: {product['id']} | {product['suite']} / {product['product_type']}")
+            print(f"   📝 {product['description'][:70]}...")
+            print(f"   📂 Lokasi: products/{product['id']}/")
+            
+            files = describe_files(product)
+            if files:
+                print("   📎 Files:")
+                for info in files:
+                    status = format_size(info['size']) if info['exists'] else "❌ tidak ditemukan"
+                    print(f"      • {info['type'].upper()}: {info['name']} ({status})")
+        
+        print("-" * 70)
+        
+        options = [
+            "➡️  Halaman berikutnya",
+            "⬅️  Halaman sebelumnya",
+            "🔎 Atur filter",
+            "↕️  Ubah urutan",
+            "📂 Buka folder produk",
+        ]
+        print_menu("NAVIGASI KATALOG", options)
+        choice = get_choice(len(options))
+        
+        if choice == 1:
+            if page['next_cursor']:
+                cursors.append(page['next_cursor'])
+            else:
+                print("📌 Ini sudah halaman terakhir.")
+                pause()
+        elif choice == 2:
+            if len(cursors) > 1:
+                cursors.pop()
+            else:
+                print("📌 Ini sudah halaman pertama.")
+                pause()
+        elif choice == 3:
+            filters = choose_catalogue_filter(filters)
+            cursors = [None]
+        elif choice == 4:
+            sort_options = list(SORT_FIELDS)
+            print_menu("Urutkan berdasarkan:", sort_options, back_option=False)
+            sort = sort_options[get_choice(len(sort_options), has_back=False) - 1]
+            cursors = [None]
+        elif choice == 5:
+            try:
+                # Buka folder products di Windows Explorer
+                os.startfile(str(PRODUCTS_DIR.absolute()))
+                print("✅ Folder produk telah dibuka!")
+            except:
+                print(f"📂 Lokasi folder: {PRODUCTS_DIR.absolute()}")
+            pause()
+        else:
+            return
 
 def menu_view_report():
     """Menu untuk melihat detail report."""
@@ -414,7 +854,7 @@ def menu_view_report():
     print("📄 LIHAT DETAIL REPORT RISET")
     print("=" * 70)
     
-    signals = load_db(SIGNALS_DB_PATH)
+    signals = signals_repo.all()
     
     if not signals:
         print("📭 Belum ada signal yang tersimpan.")
@@ -574,15 +1014,16 @@ def menu_help():
 
 def main_menu():
     """Menu utama aplikasi."""
+    metrics.start_http_server()
+    pregen.start()
     while True:
         print_header()
         
-        # Statistik
-        signals = load_db(SIGNALS_DB_PATH)
-        products = load_db(PRODUCTS_DB_PATH)
-        new_signals = len([s for s in signals if s['status'] == 'new'])
+        # Statistik (dari cache, tanpa parsing ulang jika DB tidak berubah)
+        stats = dashboard.stats()
+        new_signals = stats['status_counts'].get('new', 0)
         
-        print(f"📊 Status: {len(signals)} Signal | {new_signals} Baru | {len(products)} Produk")
+        print(f"📊 Status: {stats['total_signals']} Signal | {new_signals} Baru | {stats['total_products']} Produk")
         print("=" * 70)
         
         options = [
@@ -0,0 +1,344 @@
+# metrics.py
+"""Metrik operasional (counter, gauge, histogram) dalam format teks Prometheus.
+
+Semua metrik didefinisikan di modul ini dan diperbarui dari agent, renderer, dan
+helper DB. Ada dua cara membacanya:
+
+- endpoint HTTP: `GET /metrics` pada `python cli.py serve`, atau server terpisah untuk menu
+  interaktif lewat `AUTOPRENEUR_METRICS_PORT=9464` (`start_http_server`)
+- textfile collector node_exporter: set `AUTOPRENEUR_METRICS_DIR`, setiap proses menulis
+  `autopreneur_<proses>.prom` secara berkala dan saat selesai
+
+Update di jalur panas hanya berupa lookup dict + penjumlahan di bawah lock per metrik;
+gauge yang mahal dihitung lewat callback saat di-scrape.
+"""
+import bisect
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+METRICS_PORT = int(os.getenv("AUTOPRENEUR_METRICS_PORT", "0"))
+METRICS_DIR = os.getenv("AUTOPRENEUR_METRICS_DIR", "")
+EXPORT_INTERVAL = float(os.getenv("AUTOPRENEUR_METRICS_INTERVAL", "15"))
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+LLM_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+SCORE_BUCKETS = (10, 20, 30, 40, 50, 60, 70, 80, 90, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    """Basis metrik: nama, bantuan, label, dan lock; turunan menentukan `kind` dan sampel."""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Tuple[str, ...]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} butuh label {self.labelnames}, diberi {labels}")
+        return tuple(str(v) for v in labels)
+
+    def _labels(self, key: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]:
+        """Baris sampel format teks Prometheus, tanpa HELP/TYPE."""
+
+    def expose(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{self._labels(key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, *labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, *labels, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set_function(self, func: Optional[Callable[[], float]]):
+        """Nilai dihitung saat scrape (hanya untuk gauge tanpa label)."""
+        if self.labelnames:
+            raise ValueError("set_function hanya untuk gauge tanpa label")
+        self._function = func
+
+    def samples(self) -> Iterator[str]:
+        if self._function is not None:
+            try:
+                yield f"{self.name} {_format_value(float(self._function()))}"
+            except Exception:
+                pass  # sumber data belum siap; sample dilewati
+            return
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{self._labels(key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DURATION_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label: [hitungan per bucket (non-kumulatif, terakhir = +Inf), jumlah, total]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, *labels) -> "_Timer":
+        """`with HISTOGRAM.time("label"):` mencatat durasi blok dalam detik."""
+        return _Timer(self, labels)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1], state[2])) for key, state in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket{self._labels(key, le)} {cumulative}"
+            yield f"{self.name}_sum{self._labels(key)} {_format_value(total)}"
+            yield f"{self.name}_count{self._labels(key)} {count}"
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metrik sudah terdaftar: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DURATION_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def expose(self) -> str:
+        """Seluruh metrik dalam format teks Prometheus 0.0.4."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(m.expose() for m in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+# --- DEFINISI METRIK ---
+SIGNALS_SCANNED = REGISTRY.counter(
+    "autopreneur_signals_scanned_total", "Topik yang selesai diriset AnalystAgent.")
+SIGNALS_CREATED = REGISTRY.counter(
+    "autopreneur_signals_created_total", "Signal baru yang tersimpan di DB.", ["source"])
+IDEA_SCORE = REGISTRY.histogram(
+    "autopreneur_idea_score", "Sebaran skor ide dari AnalystAgent.", buckets=SCORE_BUCKETS)
+PRODUCT_ASSETS = REGISTRY.counter(
+    "autopreneur_product_assets_total", "Hasil generate aset produk BuilderAgent.", ["product_type", "result"])
+PRODUCTS_GENERATED = REGISTRY.counter(
+    "autopreneur_products_generated_total", "Produk yang tersimpan di DB per jenis.", ["product_type"])
+RENDER_SECONDS = REGISTRY.histogram(
+    "autopreneur_render_seconds", "Durasi render file satu produk.", ["product_type"])
+LLM_REQUESTS = REGISTRY.counter(
+    "autopreneur_llm_requests_total", "Panggilan LLM per operasi dan hasilnya.", ["operation", "outcome"])
+LLM_SECONDS = REGISTRY.histogram(
+    "autopreneur_llm_request_seconds", "Durasi panggilan LLM termasuk retry.", ["operation"], LLM_BUCKETS)
+LLM_TOKENS = REGISTRY.counter(
+    "autopreneur_llm_tokens_total", "Token LLM yang terpakai.", ["kind"])
+LLM_RATE_LIMITED = REGISTRY.counter(
+    "autopreneur_llm_rate_limited_total", "Respons 429 (rate limit) dari API LLM.")
+LLM_RETRIES = REGISTRY.counter(
+    "autopreneur_llm_retries_total", "Percobaan ulang panggilan LLM per penyebab.", ["reason"])
+CACHE_REQUESTS = REGISTRY.counter(
+    "autopreneur_cache_requests_total", "Akses cache (DB in-process, single-flight LLM).", ["cache", "result"])
+DB_WRITE_SECONDS = REGISTRY.histogram(
+    "autopreneur_db_write_seconds", "Latensi tulis file DB JSON (atomik).", ["file"])
+SIGNAL_QUEUE_DEPTH = REGISTRY.gauge(
+    "autopreneur_signal_queue_depth", "Signal 'new' yang menunggu di-generate.")
+JOBS_PROCESSED = REGISTRY.counter(
+    "autopreneur_jobs_processed_total", "Job yang diproses worker daemon.", ["kind", "result"])
+API_QUEUE_DEPTH = REGISTRY.gauge(
+    "autopreneur_api_queue_depth", "Job API yang menunggu di antrian.")
+API_JOBS_RUNNING = REGISTRY.gauge(
+    "autopreneur_api_jobs_running", "Job API yang sedang berjalan.")
+API_REJECTED = REGISTRY.counter(
+    "autopreneur_api_rejected_total", "Permintaan API yang ditolak karena antrian penuh (429).")
+
+
+# --- EKSPOR ---
+def write_textfile(directory: Optional[str] = None, process: str = "main") -> Optional[Path]:
+    """Tulis metrik untuk textfile collector node_exporter (atomik: file sementara lalu rename)."""
+    directory = directory or METRICS_DIR
+    if not directory:
+        return None
+    path = Path(directory) / f"autopreneur_{process}.prom"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(REGISTRY.expose(), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+class TextfileExporter:
+    """Thread latar yang menulis textfile setiap `interval` detik dan sekali lagi saat berhenti."""
+
+    def __init__(self, process: str, directory: Optional[str] = None, interval: float = EXPORT_INTERVAL):
+        self.process = process
+        self.directory = directory or METRICS_DIR
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-textfile", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                write_textfile(self.directory, self.process)
+            except OSError as e:
+                print(f"⚠️ Gagal menulis metrik: {e}")
+
+    def start(self) -> "TextfileExporter":
+        if self.directory:
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if not self.directory:
+            return
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        write_textfile(self.directory, self.process)
+
+
+def start_http_server(port: int = METRICS_PORT, host: str = "127.0.0.1") -> Optional["ThreadingHTTPServer"]:
+    """Sajikan `GET /metrics` di thread latar; port 0/kosong atau port terpakai berarti tidak dijalankan.
+
+    Hanya untuk proses berumur panjang; perintah CLI singkat cukup memakai `TextfileExporter`.
+    """
+    if not port:
+        return None
+    # http.server hanya dimuat jika endpoint diaktifkan
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = REGISTRY.expose().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as e:
+        # Port dipakai proses lain (mis. menu kedua); metrik tetap bisa lewat textfile
+        print(f"⚠️ Endpoint metrik {host}:{port} tidak bisa dibuka ({e}), dilewati.")
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"📈 Metrik tersedia di http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,221 @@
+# planner.py
+"""Perkiraan waktu, biaya, dan disk sebuah batch generate sebelum dijalankan.
+
+Dasarnya data historis di `db/telemetry.jsonl` (latensi & token per panggilan LLM dan
+durasi render per jenis produk) serta ukuran file produk yang sudah ada. Jenis produk
+tanpa riwayat memakai nilai default yang konservatif.
+
+    python cli.py plan --top 200 --suite seasonal --workers 8 --budget 500000
+"""
+import math
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import telemetry
+from agents import DEFAULT_OUTPUT_TOKENS, MODEL
+from template_renderer import TemplateRenderer
+
+# Batas rate API (per menit) untuk model yang dipakai; sesuaikan dengan tier akun
+RATE_LIMIT_RPM = int(os.getenv("AUTOPRENEUR_RATE_LIMIT_RPM", "500"))
+RATE_LIMIT_TPM = int(os.getenv("AUTOPRENEUR_RATE_LIMIT_TPM", "200000"))
+MAX_CONCURRENCY = 32
+# Default untuk jenis produk tanpa riwayat
+DEFAULT_PROMPT_TOKENS = 800
+DEFAULT_TOKENS_PER_SECOND = 60.0
+DEFAULT_RENDER_SECONDS = 3.0
+DEFAULT_PRODUCT_BYTES = 500 * 1024
+# Riwayat minimal sebelum statistik dianggap lebih baik dari default
+MIN_SAMPLES = 3
+LLM_OPERATIONS = ("generate", "repair_sections")
+
+
+class BudgetExceeded(Exception):
+    """Batch melebihi anggaran dan pemangkasan tidak diizinkan."""
+
+    def __init__(self, plan: Dict[str, Any]):
+        super().__init__(f"Perkiraan biaya Rp {plan['cost_idr']:,.0f} / waktu {format_duration(plan['wall_seconds'])} "
+                         f"melebihi anggaran")
+        self.plan = plan
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}j {minutes}m"
+    return f"{minutes}m {secs}d" if minutes else f"{secs}d"
+
+
+def _mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def product_type_of(file_key: str, product_types: List[str]) -> Optional[str]:
+    """Jenis produk dari key file suite (`caption_bank_pdf` → caption_bank)."""
+    return next((t for t in product_types if file_key.startswith(t + "_")), None)
+
+
+def disk_history(products: List[Dict], product_types: List[str]) -> Dict[str, List[int]]:
+    """Total ukuran file per produk, dikelompokkan per jenis produk."""
+    sizes: Dict[str, List[int]] = {}
+    for product in products:
+        per_type: Dict[str, int] = {}
+        for file_key, file_path in (product.get("files") or {}).items():
+            product_type = product.get("product_type")
+            if product_type == "suite":
+                product_type = product_type_of(file_key, product_types)
+            if not product_type or not file_path:
+                continue
+            try:
+                per_type[product_type] = per_type.get(product_type, 0) + Path(file_path).stat().st_size
+            except OSError:
+                continue
+        for product_type, size in per_type.items():
+            sizes.setdefault(product_type, []).append(size)
+    return sizes
+
+
+def product_stats(records: List[Dict], disk: Dict[str, List[int]], product_type: str) -> Dict[str, Any]:
+    """Statistik per satu produk jadi: panggilan LLM, token, biaya, durasi LLM & render, ukuran file."""
+    llm = [r for r in records if r.get("product_type") == product_type and r.get("operation") in LLM_OPERATIONS]
+    generations = [r for r in llm if r.get("operation") == "generate" and "error" not in r]
+    renders = [r["wall_ms"] / 1000 for r in records
+               if r.get("operation") == "render" and r.get("product_type") == product_type
+               and "error" not in r and "wall_ms" in r]
+    sizes = disk.get(product_type, [])
+
+    if len(generations) >= MIN_SAMPLES:
+        n = len(generations)
+        # Panggilan perbaikan (repair_sections) dibebankan ke produk yang dihasilkan
+        walls = [r["wall_ms"] / 1000 for r in generations]
+        stats = {
+            "source": f"riwayat {n}",
+            "calls": len(llm) / n,
+            "prompt_tokens": sum(r.get("prompt_tokens", 0) for r in llm) / n,
+            "completion_tokens": sum(r.get("completion_tokens", 0) for r in llm) / n,
+            "llm_seconds": sum(r.get("wall_ms", 0) for r in llm) / 1000 / n,
+            "llm_seconds_p90": telemetry.percentile(walls, 90) * len(llm) / n,
+            "error_rate": sum(1 for r in llm if r.get("operation") == "generate" and "error" in r) / n,
+        }
+        costs = [r["cost_usd"] for r in llm if "cost_usd" in r]
+        stats["cost_usd"] = sum(costs) / n if costs else None
+    else:
+        completion = DEFAULT_OUTPUT_TOKENS
+        seconds = completion / DEFAULT_TOKENS_PER_SECOND
+        stats = {
+            "source": "default",
+            "calls": 1.0,
+            "prompt_tokens": float(DEFAULT_PROMPT_TOKENS),
+            "completion_tokens": float(completion),
+            "llm_seconds": seconds,
+            "llm_seconds_p90": seconds * 1.5,
+            "error_rate": 0.0,
+            "cost_usd": None,
+        }
+    if stats["cost_usd"] is None:
+        stats["cost_usd"] = telemetry.estimate_cost(MODEL, stats["prompt_tokens"], stats["completion_tokens"]) or 0.0
+    stats["render_seconds"] = _mean(renders) if len(renders) >= MIN_SAMPLES else DEFAULT_RENDER_SECONDS
+    stats["disk_bytes"] = _mean(sizes) if len(sizes) >= MIN_SAMPLES else DEFAULT_PRODUCT_BYTES
+    return stats
+
+
+def load_stats(product_types: List[str], products: List[Dict], since: Optional[float] = None) -> Dict[str, Dict]:
+    records = telemetry.load_records(since=since)
+    all_types = [t for types in TemplateRenderer.SUITES.values() for t in types]
+    disk = disk_history(products, all_types)
+    return {t: product_stats(records, disk, t) for t in product_types}
+
+
+def _estimate(jobs: List[List[str]], stats: Dict[str, Dict], workers: int) -> Dict[str, Any]:
+    """Perkiraan untuk daftar job; satu job = produk-produk yang dikerjakan berurutan (mis. satu suite)."""
+    totals = {"calls": 0.0, "prompt_tokens": 0.0, "completion_tokens": 0.0, "cost_usd": 0.0,
+              "work_seconds": 0.0, "work_seconds_p90": 0.0, "disk_bytes": 0.0}
+    longest = 0.0
+    for job in jobs:
+        job_seconds = 0.0
+        for product_type in job:
+            s = stats[product_type]
+            seconds = s["llm_seconds"] + s["render_seconds"]
+            job_seconds += seconds
+            totals["calls"] += s["calls"]
+            totals["prompt_tokens"] += s["prompt_tokens"]
+            totals["completion_tokens"] += s["completion_tokens"]
+            totals["cost_usd"] += s["cost_usd"]
+            totals["work_seconds"] += seconds
+            totals["work_seconds_p90"] += s["llm_seconds_p90"] + s["render_seconds"]
+            totals["disk_bytes"] += s["disk_bytes"]
+        longest = max(longest, job_seconds)
+
+    tokens = totals["prompt_tokens"] + totals["completion_tokens"]
+    bounds = {
+        "concurrency": max(totals["work_seconds"] / max(1, workers), longest),
+        "rpm": totals["calls"] / RATE_LIMIT_RPM * 60,
+        "tpm": tokens / RATE_LIMIT_TPM * 60,
+    }
+    bottleneck = max(bounds, key=bounds.get)
+    rate_bound = max(bounds["rpm"], bounds["tpm"], longest)
+    # Worker tambahan di atas angka ini hanya menunggu rate limit
+    recommended = math.ceil(totals["work_seconds"] / rate_bound) if rate_bound > 0 else 1
+    recommended = max(1, min(MAX_CONCURRENCY, len(jobs) or 1, recommended))
+    slowdown = totals["work_seconds_p90"] / totals["work_seconds"] if totals["work_seconds"] else 1.0
+
+    return {
+        "jobs": len(jobs),
+        "products": sum(len(job) for job in jobs),
+        "workers": workers,
+        "llm_calls": round(totals["calls"]),
+        "prompt_tokens": round(totals["prompt_tokens"]),
+        "completion_tokens": round(totals["completion_tokens"]),
+        "cost_usd": round(totals["cost_usd"], 4),
+        "cost_idr": round(totals["cost_usd"] * telemetry.USD_TO_IDR, 2),
+        "wall_seconds": bounds[bottleneck],
+        "wall_seconds_p90": bounds[bottleneck] * slowdown if bottleneck == "concurrency" else bounds[bottleneck],
+        "bottleneck": bottleneck,
+        "recommended_concurrency": recommended,
+        "disk_bytes": round(totals["disk_bytes"]),
+    }
+
+
+def plan_batch(jobs: List[List[str]], workers: int, budget_idr: Optional[float] = None,
+               max_seconds: Optional[float] = None, trim: bool = True,
+               products: Optional[List[Dict]] = None, since: Optional[float] = None) -> Dict[str, Any]:
+    """Rencanakan batch. `jobs` berurutan sesuai prioritas; yang melebihi anggaran dipangkas dari belakang.
+
+    Return dict perkiraan + `keep` (jumlah job yang muat anggaran). Jika `trim=False` dan
+    anggaran terlampaui, raise BudgetExceeded.
+    """
+    product_types = sorted({t for job in jobs for t in job})
+    stats = load_stats(product_types, products or [], since)
+    plan = _estimate(jobs, stats, workers)
+
+    def within(estimate: Dict[str, Any]) -> bool:
+        return ((budget_idr is None or estimate["cost_idr"] <= budget_idr)
+                and (max_seconds is None or estimate["wall_seconds"] <= max_seconds))
+
+    keep = len(jobs)
+    if not within(plan):
+        if not trim:
+            raise BudgetExceeded(plan)
+        # Estimasi monoton terhadap jumlah job, jadi cari prefix terpanjang dengan binary search
+        low, high = 0, len(jobs)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if within(_estimate(jobs[:mid], stats, workers)):
+                low = mid
+            else:
+                high = mid - 1
+        keep = low
+
+    plan["keep"] = keep
+    plan["trimmed"] = len(jobs) - keep
+    if keep != len(jobs):
+        plan["kept"] = _estimate(jobs[:keep], stats, workers)
+    plan["per_type"] = {t: {k: (round(v, 4) if isinstance(v, float) else v) for k, v in s.items()}
+                        for t, s in stats.items()}
+    plan["disk_free"] = shutil.disk_usage(Path(".")).free
+    plan["budget_idr"] = budget_idr
+    plan["max_seconds"] = max_seconds
+    return plan
@@ -0,0 +1,320 @@
+# prayer_times.py
+"""Jadwal imsakiyah Ramadan dihitung lokal dari posisi matahari (parameter Kemenag RI).
+
+Kalender Ramadan tidak lagi meminta LLM mengarang jam sholat: `fill_ramadan_calendar()`
+mengisi `prayer_times`, `calendar_days`, dan jadwal harian (`imsakiyah`) untuk koordinat
+kota, sehingga LLM cukup menulis ide konten.
+
+Parameter Kemenag: Subuh -20°, Isya -18°, Ashar bayangan 1× (Syafi'i), Imsak = Subuh
+- 10 menit, ihtiyath +2 menit dibulatkan ke atas. Deklinasi & equation of time dihitung
+sekali per tanggal lalu dipakai ulang untuk semua kota, jadi ~500 kabupaten/kota x 30 hari
+selesai dalam waktu kurang dari satu detik.
+
+Awal Ramadan memakai kalender Hijriah tabular dan bisa berbeda satu hari dari hasil
+sidang isbat; tetapkan lewat `AUTOPRENEUR_RAMADAN_START=2026-02-19` atau `--start`.
+
+    python cli.py imsakiyah --cities kabupaten_kota.csv --output imsakiyah.csv
+"""
+import csv
+import math
+import os
+import re
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, TextIO, Tuple
+
+FAJR_ANGLE = 20.0
+ISHA_ANGLE = 18.0
+ASR_SHADOW_FACTOR = 1
+IMSAK_MINUTES = 10
+IHTIYATH_MINUTES = int(os.getenv("AUTOPRENEUR_IHTIYATH_MINUTES", "2"))
+# Refraksi + jari-jari piringan matahari saat terbit/terbenam
+HORIZON_ANGLE = 0.8333
+RAMADAN_DAYS = 30
+RAMADAN_START = os.getenv("AUTOPRENEUR_RAMADAN_START")
+DEFAULT_CITY = os.getenv("AUTOPRENEUR_DEFAULT_CITY", "Jakarta")
+
+PRAYERS = ["Imsak", "Subuh", "Terbit", "Dzuhur", "Ashar", "Maghrib", "Isya"]
+# Yang tampil di kotak jadwal kalender (Terbit hanya ada di tabel imsakiyah)
+CALENDAR_PRAYERS = ["Imsak", "Subuh", "Dzuhur", "Ashar", "Maghrib", "Isya"]
+TIMEZONES = {"WIB": 7, "WITA": 8, "WIT": 9}
+WEEKDAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+MONTHS = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli",
+          "Agustus", "September", "Oktober", "November", "Desember"]
+HIJRI_MONTHS = ["Muharram", "Safar", "Rabiul Awal", "Rabiul Akhir", "Jumadil Awal", "Jumadil Akhir",
+                "Rajab", "Syakban", "Ramadan", "Syawal", "Zulkaidah", "Zulhijah"]
+# Penanda hari khusus per tanggal Ramadan
+RAMADAN_EVENTS = {1: "Awal Ramadan", 17: "Nuzulul Quran", 21: "Malam Lailatul Qadar (ganjil)",
+                  23: "Malam ganjil", 25: "Malam ganjil", 27: "Malam ganjil", 29: "Malam ganjil"}
+
+
+class City(NamedTuple):
+    name: str
+    latitude: float
+    longitude: float
+    timezone: int
+    elevation: float = 0.0
+
+
+# Ibu kota provinsi; untuk seluruh kabupaten/kota muat CSV lewat load_cities()
+CITIES: Dict[str, City] = {c.name.lower(): c for c in [
+    City("Banda Aceh", 5.5483, 95.3238, 7),
+    City("Medan", 3.5952, 98.6722, 7),
+    City("Padang", -0.9471, 100.4172, 7),
+    City("Pekanbaru", 0.5071, 101.4478, 7),
+    City("Tanjung Pinang", 0.9186, 104.4554, 7),
+    City("Batam", 1.0456, 104.0305, 7),
+    City("Jambi", -1.6101, 103.6131, 7),
+    City("Palembang", -2.9761, 104.7754, 7),
+    City("Bengkulu", -3.7928, 102.2608, 7),
+    City("Bandar Lampung", -5.3971, 105.2668, 7),
+    City("Pangkal Pinang", -2.1291, 106.1090, 7),
+    City("Jakarta", -6.2088, 106.8456, 7),
+    City("Serang", -6.1200, 106.1503, 7),
+    City("Tangerang", -6.1783, 106.6319, 7),
+    City("Bogor", -6.5971, 106.8060, 7, 265),
+    City("Bekasi", -6.2383, 106.9756, 7),
+    City("Depok", -6.4025, 106.7942, 7),
+    City("Bandung", -6.9175, 107.6191, 7, 768),
+    City("Semarang", -6.9667, 110.4167, 7),
+    City("Solo", -7.5755, 110.8243, 7),
+    City("Yogyakarta", -7.7956, 110.3695, 7),
+    City("Surabaya", -7.2575, 112.7521, 7),
+    City("Malang", -7.9666, 112.6326, 7, 440),
+    City("Pontianak", -0.0263, 109.3425, 7),
+    City("Palangka Raya", -2.2161, 113.9135, 7),
+    City("Banjarmasin", -3.3186, 114.5944, 8),
+    City("Banjarbaru", -3.4425, 114.8303, 8),
+    City("Samarinda", -0.5022, 117.1536, 8),
+    City("Balikpapan", -1.2379, 116.8529, 8),
+    City("Tanjung Selor", 2.8375, 117.3653, 8),
+    City("Denpasar", -8.6705, 115.2126, 8),
+    City("Mataram", -8.5833, 116.1167, 8),
+    City("Kupang", -10.1772, 123.6070, 8),
+    City("Makassar", -5.1477, 119.4327, 8),
+    City("Mamuju", -2.6748, 118.8885, 8),
+    City("Palu", -0.8917, 119.8707, 8),
+    City("Kendari", -3.9985, 122.5129, 8),
+    City("Gorontalo", 0.5435, 123.0568, 8),
+    City("Manado", 1.4748, 124.8421, 8),
+    City("Ambon", -3.6954, 128.1814, 9),
+    City("Sofifi", 0.7333, 127.5667, 9),
+    City("Ternate", 0.7893, 127.3757, 9),
+    City("Manokwari", -0.8615, 134.0620, 9),
+    City("Sorong", -0.8762, 131.2558, 9),
+    City("Nabire", -3.3667, 135.4833, 9),
+    City("Jayapura", -2.5337, 140.7181, 9),
+    City("Wamena", -4.0956, 138.9481, 9, 1550),
+    City("Merauke", -8.4932, 140.4018, 9),
+]}
+
+
+# --- KOTA ---
+def _normalize(name: str) -> str:
+    name = re.sub(r"^\s*(kota|kabupaten|kab\.?)\s+", "", name.strip().lower())
+    return re.sub(r"\s+", " ", name)
+
+
+def timezone_for(longitude: float) -> int:
+    """Perkiraan zona waktu dari bujur; CSV sebaiknya mencantumkan WIB/WITA/WIT sendiri."""
+    if longitude < 114.5:
+        return 7
+    return 8 if longitude < 126.5 else 9
+
+
+def find_city(name: Optional[str], cities: Optional[Dict[str, City]] = None) -> City:
+    """Kota dari nama bebas ("Kota Surabaya", "Jakarta Selatan"); tidak dikenal → DEFAULT_CITY."""
+    cities = cities or CITIES
+    key = _normalize(name or "")
+    if key in cities:
+        return cities[key]
+    for city_key in sorted(cities, key=len, reverse=True):
+        if re.search(rf"\b{re.escape(city_key)}\b", key):
+            return cities[city_key]
+    return cities.get(DEFAULT_CITY.lower(), CITIES[DEFAULT_CITY.lower()])
+
+
+def _parse_timezone(value: str, longitude: float) -> int:
+    value = (value or "").strip().upper()
+    if not value:
+        return timezone_for(longitude)
+    if value in TIMEZONES:
+        return TIMEZONES[value]
+    return int(float(value.replace("UTC", "") or 0))
+
+
+def load_cities(path: Path) -> List[City]:
+    """Baca CSV kabupaten/kota: name, latitude, longitude, [timezone WIB/WITA/WIT/+7], [elevation]."""
+    cities = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            longitude = float(row["longitude"])
+            cities.append(City(
+                name=row["name"].strip(),
+                latitude=float(row["latitude"]),
+                longitude=longitude,
+                timezone=_parse_timezone(row.get("timezone", ""), longitude),
+                elevation=float(row.get("elevation") or 0),
+            ))
+    return cities
+
+
+# --- KALENDER HIJRIAH (TABULAR) ---
+_HIJRI_EPOCH = date(622, 7, 19).toordinal()  # 1 Muharram 1 H
+
+
+def hijri_to_date(year: int, month: int, day: int) -> date:
+    ordinal = (day + math.ceil(29.5 * (month - 1)) + (year - 1) * 354
+               + (3 + 11 * year) // 30 + _HIJRI_EPOCH - 1)
+    return date.fromordinal(ordinal)
+
+
+def to_hijri(day: date) -> Tuple[int, int, int]:
+    ordinal = day.toordinal()
+    year = (30 * (ordinal - _HIJRI_EPOCH) + 10646) // 10631
+    month = min(12, math.ceil((ordinal - 29 - hijri_to_date(year, 1, 1).toordinal()) / 29.5) + 1)
+    return year, month, ordinal - hijri_to_date(year, month, 1).toordinal() + 1
+
+
+def ramadan_start(today: Optional[date] = None, start: Optional[date] = None) -> date:
+    """Tanggal 1 Ramadan berikutnya (atau yang sedang berjalan) dari `today`."""
+    if start is not None:
+        return start
+    if RAMADAN_START:
+        return date.fromisoformat(RAMADAN_START)
+    today = today or date.today()
+    year, month, day = to_hijri(today)
+    if month > 9 or (month == 9 and day > RAMADAN_DAYS):
+        year += 1
+    return hijri_to_date(year, 9, 1)
+
+
+# --- POSISI MATAHARI ---
+def _sin(deg: float) -> float:
+    return math.sin(math.radians(deg))
+
+
+def _cos(deg: float) -> float:
+    return math.cos(math.radians(deg))
+
+
+class SolarDay(NamedTuple):
+    day: date
+    declination: float  # derajat
+    equation: float     # jam
+
+
+def solar_day(day: date) -> SolarDay:
+    """Deklinasi & equation of time pada tengah hari WIB (05:00 UT), cukup untuk seluruh Indonesia."""
+    d = day.toordinal() - date(2000, 1, 1).toordinal() - 0.5 + 5 / 24
+    g = 357.529 + 0.98560028 * d
+    q = 280.459 + 0.98564736 * d
+    ecliptic = q + 1.915 * _sin(g) + 0.020 * _sin(2 * g)
+    obliquity = 23.439 - 0.00000036 * d
+    declination = math.degrees(math.asin(_sin(obliquity) * _sin(ecliptic)))
+    right_ascension = math.degrees(math.atan2(_cos(obliquity) * _sin(ecliptic), _cos(ecliptic))) / 15
+    equation = q / 15 - right_ascension
+    equation = (equation + 12) % 24 - 12
+    return SolarDay(day, declination, equation)
+
+
+def _hour_angle(altitude: float, latitude: float, declination: float) -> float:
+    """Selisih jam dari transit saat matahari berada di `altitude` derajat."""
+    cos_h = ((_sin(altitude) - _sin(latitude) * _sin(declination))
+             / (_cos(latitude) * _cos(declination)))
+    return math.degrees(math.acos(max(-1.0, min(1.0, cos_h)))) / 15
+
+
+def compute_times(city: City, sun: SolarDay) -> Dict[str, float]:
+    """Waktu sholat (jam desimal waktu lokal, tanpa ihtiyath) untuk satu kota & satu tanggal."""
+    lat, dec = city.latitude, sun.declination
+    transit = 12 + city.timezone - city.longitude / 15 - sun.equation
+    # Kota di ketinggian melihat matahari terbenam lebih lambat
+    horizon = HORIZON_ANGLE + 0.0347 * math.sqrt(max(0.0, city.elevation))
+    sunset = _hour_angle(-horizon, lat, dec)
+    asr_altitude = math.degrees(math.atan(1 / (ASR_SHADOW_FACTOR + math.tan(math.radians(abs(lat - dec))))))
+    fajr = transit - _hour_angle(-FAJR_ANGLE, lat, dec)
+    return {
+        "Imsak": fajr - IMSAK_MINUTES / 60,
+        "Subuh": fajr,
+        "Terbit": transit - sunset,
+        "Dzuhur": transit,
+        "Ashar": transit + _hour_angle(asr_altitude, lat, dec),
+        "Maghrib": transit + sunset,
+        "Isya": transit + _hour_angle(-ISHA_ANGLE, lat, dec),
+    }
+
+
+def format_time(hours: float, name: str) -> str:
+    """Jam desimal → "HH:MM" dengan ihtiyath; Terbit dikurangi (lebih aman untuk batas Subuh)."""
+    if name == "Terbit":
+        minutes = math.floor(hours * 60 - IHTIYATH_MINUTES)
+    else:
+        minutes = math.ceil(hours * 60 + IHTIYATH_MINUTES - 1e-9)
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+
+def schedule(cities: Iterable[City], start: date, days: int = RAMADAN_DAYS) -> Dict[str, List[Dict[str, str]]]:
+    """Jadwal harian banyak kota sekaligus; posisi matahari dihitung sekali per tanggal."""
+    suns = [solar_day(start + timedelta(days=i)) for i in range(days)]
+    result = {}
+    for city in cities:
+        rows = []
+        for i, sun in enumerate(suns):
+            times = compute_times(city, sun)
+            rows.append({"ramadan": i + 1, "date": sun.day.isoformat(),
+                         **{name: format_time(times[name], name) for name in PRAYERS}})
+        result[city.name] = rows
+    return result
+
+
+# --- DATA TEMPLATE ---
+def format_date(day: date) -> str:
+    return f"{WEEKDAYS[day.weekday()]}, {day.day} {MONTHS[day.month - 1]} {day.year}"
+
+
+def fill_ramadan_calendar(data: Dict, city: Optional[City] = None, start: Optional[date] = None,
+                          today: Optional[date] = None) -> Dict:
+    """Isi field kalender & jadwal sholat data `ramadan_calendar`; ide konten dari LLM tidak disentuh.
+
+    Kota dari `city` atau dicari dari `data["location"]`. Selain field template, jadwal
+    per hari disimpan di `imsakiyah` (dipakai tabel imsakiyah & ekspor CSV).
+    """
+    today = today or date.today()
+    city = city or find_city(data.get("location"))
+    start = ramadan_start(today, start)
+    rows = schedule([city], start)[city.name]
+    hijri_year = to_hijri(start)[0]
+    # Jadwal di kotak utama: hari ini jika sedang Ramadan, selain itu 1 Ramadan
+    current = next((row for row in rows if row["date"] == today.isoformat()), rows[0])
+
+    data.update({
+        "location": city.name,
+        "current_date": format_date(today),
+        "month_name": "Ramadan",
+        "year": start.year,
+        "hijri_month": HIJRI_MONTHS[8],
+        "hijri_year": hijri_year,
+        "weekdays": list(WEEKDAYS),
+        "prayer_times": [{"name": name, "time": current[name]} for name in CALENDAR_PRAYERS],
+        "calendar_days": [{
+            "number": date.fromisoformat(row["date"]).day,
+            "hijri": f"{row['ramadan']} Ramadan",
+            "is_today": row["date"] == today.isoformat(),
+            "event": RAMADAN_EVENTS.get(row["ramadan"]),
+        } for row in rows],
+        "imsakiyah": rows,
+    })
+    return data
+
+
+def write_csv(table: Dict[str, List[Dict[str, str]]], out: TextIO) -> int:
+    """Tulis jadwal banyak kota ke satu CSV (satu baris per kota per hari). Return jumlah baris."""
+    writer = csv.DictWriter(out, fieldnames=["city", "ramadan", "date", *PRAYERS])
+    writer.writeheader()
+    count = 0
+    for name, rows in table.items():
+        for row in rows:
+            writer.writerow({"city": name, **row})
+            count += 1
+    return count
@@ -0,0 +1,361 @@
+# pregen.py
+"""Pre-generate spekulatif untuk signal berskor tinggi.
+
+Signal dengan skor >= `PREGEN_SCORE_THRESHOLD` dibuatkan produk yang paling mungkin
+dipilih (default caption_bank, sama dengan menu Generate Produk) di latar belakang,
+hanya saat slot LLM sedang menganggur. Hasilnya disimpan di `products/.speculative/`
+dan dicatat di `db/speculative.json`, tidak di DB produk, sehingga status signal tidak
+pernah berubah. Saat signal itu benar-benar di-generate, `claim()` memindahkan folder
+hasil spekulasi menjadi produk sungguhan tanpa memanggil LLM.
+
+Aktifkan dengan `AUTOPRENEUR_PREGEN=1`. Biaya dibatasi per hari (Rupiah dan jumlah
+produk), dan jumlah hasil yang disimpan dibatasi; hasil yang kedaluwarsa, signalnya
+sudah bukan 'new', atau dibuat dengan prompt lama dibuang.
+
+Output thread latar (termasuk print dari BuilderAgent & renderer) ditulis ke `db/pregen.log`,
+bukan ke terminal, agar tidak menyela prompt menu interaktif.
+
+    python cli.py pregen --limit 5
+"""
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, TextIO, Tuple
+
+import scheduler
+import telemetry
+
+PREGEN_ENABLED = os.getenv("AUTOPRENEUR_PREGEN", "").lower() not in ("", "0", "false", "no")
+PREGEN_SCORE_THRESHOLD = int(os.getenv("AUTOPRENEUR_PREGEN_THRESHOLD", "80"))
+PREGEN_PRODUCT_TYPE = os.getenv("AUTOPRENEUR_PREGEN_TYPE", "caption_bank")
+# Batas per hari kalender (waktu lokal) dan jumlah hasil yang disimpan sekaligus
+PREGEN_DAILY_BUDGET_IDR = float(os.getenv("AUTOPRENEUR_PREGEN_BUDGET_IDR", "20000"))
+PREGEN_DAILY_LIMIT = int(os.getenv("AUTOPRENEUR_PREGEN_DAILY_LIMIT", "20"))
+PREGEN_MAX_STORED = int(os.getenv("AUTOPRENEUR_PREGEN_MAX_STORED", "50"))
+PREGEN_TTL = float(os.getenv("AUTOPRENEUR_PREGEN_TTL_DAYS", "7")) * 86400
+IDLE_POLL_INTERVAL = 5.0
+SPECULATIVE_TENANT = "speculative"
+
+MANIFEST_NAME = "speculative.json"
+FOLDER_NAME = ".speculative"
+LOG_NAME = "pregen.log"
+
+
+def _paths() -> Tuple[Path, Path]:
+    import main as app
+    return app.DB_DIR / MANIFEST_NAME, app.PRODUCTS_DIR / FOLDER_NAME
+
+
+def _key(signal_id: str, product_type: str) -> str:
+    return f"{signal_id}:{product_type}"
+
+
+def _load() -> Dict[str, Dict]:
+    import main as app
+    manifest_path, _ = _paths()
+    data = app.load_db(manifest_path)
+    return data if isinstance(data, dict) else {}
+
+
+def _save(manifest: Dict[str, Dict]):
+    import main as app
+    manifest_path, _ = _paths()
+    app.save_db(manifest_path, manifest)
+
+
+def _remove_folder(entry: Dict):
+    _, root = _paths()
+    shutil.rmtree(root / entry["folder"], ignore_errors=True)
+
+
+def eligible(signal: Dict) -> bool:
+    return signal.get("status") == "new" and (signal.get("score") or 0) >= PREGEN_SCORE_THRESHOLD
+
+
+def ready_signals(product_type: str = PREGEN_PRODUCT_TYPE) -> set:
+    """ID signal yang punya hasil spekulasi siap pakai untuk jenis produk ini."""
+    return {e["signal_id"] for e in _load().values() if e["product_type"] == product_type}
+
+
+def spent_today() -> Tuple[float, int]:
+    """(biaya Rupiah, jumlah produk) spekulasi sejak tengah malam."""
+    midnight = time.mktime(time.localtime()[:3] + (0, 0, 0, 0, 0, -1))
+    records = [r for r in telemetry.load_records(since=midnight) if r.get("speculative")]
+    cost = sum(r.get("cost_idr", 0) for r in records)
+    produced = sum(1 for r in records if r.get("operation") == "generate" and "error" not in r)
+    return cost, produced
+
+
+def budget_left() -> bool:
+    cost, produced = spent_today()
+    return cost < PREGEN_DAILY_BUDGET_IDR and produced < PREGEN_DAILY_LIMIT
+
+
+def seconds_until_midnight() -> float:
+    """Detik sampai anggaran harian di-reset (tengah malam waktu lokal berikutnya)."""
+    now = time.time()
+    midnight = time.mktime(time.localtime(now + 86400)[:3] + (0, 0, 0, 0, 0, -1))
+    return max(1.0, midnight - now)
+
+
+def prune(manifest: Optional[Dict[str, Dict]] = None) -> int:
+    """Buang hasil yang kedaluwarsa, signalnya bukan 'new' lagi, atau dibuat dengan prompt lama.
+
+    Hanya manifest & folder spekulasi yang dihapus; DB signal tidak disentuh.
+    """
+    import main as app
+    from agents import PROMPT_VERSION
+
+    with app._db_lock:
+        manifest = _load() if manifest is None else manifest
+        now = time.time()
+        stale = []
+        for key, entry in manifest.items():
+            signal = app.signals_repo.get(entry["signal_id"])
+            if (signal is None or signal.get("status") != "new" or now - entry["created_at"] > PREGEN_TTL
+                    or entry.get("prompt_version") != PROMPT_VERSION):
+                stale.append(key)
+        # Lewat batas simpan: yang paling lama dibuang dulu
+        keep = sorted((k for k in manifest if k not in stale), key=lambda k: manifest[k]["created_at"])
+        stale += keep[:max(0, len(keep) - PREGEN_MAX_STORED)]
+        for key in stale:
+            _remove_folder(manifest.pop(key))
+        if stale:
+            _save(manifest)
+    return len(stale)
+
+
+def speculate(signal: Dict, product_type: str = PREGEN_PRODUCT_TYPE) -> Optional[Dict]:
+    """Generate & render satu produk spekulatif. Return entri manifest, None jika dilewati."""
+    import main as app
+    from agents import BuilderAgent, PROMPT_VERSION
+
+    key = _key(signal['id'], product_type)
+    if not eligible(signal) or key in _load() or not budget_left():
+        return None
+
+    _, root = _paths()
+    folder = f"{signal['id']}_{product_type}_{int(time.time())}"
+    product_folder = root / folder
+    try:
+        with scheduler.context(tenant=SPECULATIVE_TENANT, priority="batch"), \
+                telemetry.tags(speculative=True):
+            assets = BuilderAgent().generate_product_assets(signal['topic'], product_type)
+            product_folder.mkdir(parents=True)
+            files = app.render_product_files(product_type, assets, product_folder)
+    except Exception:
+        shutil.rmtree(product_folder, ignore_errors=True)
+        raise
+
+    entry = {
+        "signal_id": signal['id'],
+        "product_type": product_type,
+        "folder": folder,
+        "files": {ftype: str(Path(fpath).relative_to(product_folder)) for ftype, fpath in files.items()},
+        "name": assets['name'],
+        "description": assets['description'],
+        "prompt_version": PROMPT_VERSION,
+        "created_at": time.time(),
+    }
+    with app._db_lock:
+        manifest = _load()
+        # Signal bisa saja sudah di-generate selama spekulasi berjalan
+        current = app.signals_repo.get(signal['id'])
+        if key in manifest or current is None or current.get("status") != "new":
+            shutil.rmtree(product_folder, ignore_errors=True)
+            return None
+        manifest[key] = entry
+        _save(manifest)
+    print(f"⚡ Pre-generate {product_type} untuk '{signal['topic']}' siap dipakai.")
+    return entry
+
+
+def claim(signal: Dict, product_type: str, product_folder: Path) -> Optional[Tuple[Dict, Dict[str, str]]]:
+    """Pindahkan hasil spekulasi ke `product_folder`. Return (assets ringkas, files) atau None."""
+    import main as app
+    if not _paths()[0].exists():
+        return None
+    from agents import PROMPT_VERSION
+
+    key = _key(signal['id'], product_type)
+    with app._db_lock:
+        manifest = _load()
+        entry = manifest.pop(key, None)
+        if entry is None:
+            return None
+        _save(manifest)
+        _, root = _paths()
+        source = root / entry["folder"]
+        if entry.get("prompt_version") != PROMPT_VERSION or not all(
+                (source / rel).exists() for rel in entry["files"].values()):
+            shutil.rmtree(source, ignore_errors=True)
+            return None
+        os.replace(source, product_folder)
+    files = {ftype: str(product_folder / rel) for ftype, rel in entry["files"].items()}
+    print(f"⚡ Memakai hasil pre-generate untuk '{signal['topic']}'.")
+    return {"name": entry["name"], "description": entry["description"]}, files
+
+
+def candidates(limit: int) -> List[Dict]:
+    """Signal 'new' berskor tinggi teratas yang belum punya hasil spekulasi."""
+    import main as app
+
+    manifest = _load()
+    queue = app.load_signal_queue()
+    result = []
+    for signal_id in queue.peek(limit * 4):
+        signal = app.signals_repo.get(signal_id)
+        if signal is None or not eligible(signal):
+            continue
+        if _key(signal_id, PREGEN_PRODUCT_TYPE) not in manifest:
+            result.append(signal)
+        if len(result) >= limit:
+            break
+    return result
+
+
+def run_once(limit: int) -> List[Dict]:
+    """Jalankan spekulasi untuk maksimal `limit` signal (untuk cron / CLI)."""
+    prune()
+    results = []
+    for signal in candidates(limit):
+        if not budget_left():
+            print("💸 Anggaran pre-generate hari ini habis.")
+            break
+        try:
+            entry = speculate(signal)
+            results.append({"ok": True, "input": signal['id'], "speculated": entry is not None})
+        except Exception as e:
+            results.append({"ok": False, "input": signal['id'], "error": str(e)})
+    return results
+
+
+class _ThreadOutput:
+    """Pengganti sys.stdout yang mengalihkan tulisan thread terdaftar ke stream lain.
+
+    `contextlib.redirect_stdout` berlaku untuk seluruh proses, jadi tidak bisa dipakai untuk
+    satu thread latar tanpa ikut membungkam menu di thread utama.
+    """
+
+    def __init__(self, default: TextIO):
+        self.default = default
+        self._routes: Dict[int, TextIO] = {}
+
+    def route(self, stream: TextIO):
+        self._routes[threading.get_ident()] = stream
+
+    def unroute(self):
+        self._routes.pop(threading.get_ident(), None)
+
+    def _target(self) -> TextIO:
+        return self._routes.get(threading.get_ident(), self.default)
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.default, name)
+
+
+def _route_thread_output(stream: TextIO):
+    """Alihkan print thread ini ke `stream` (sys.stdout diganti sekali per proses)."""
+    if not isinstance(sys.stdout, _ThreadOutput):
+        sys.stdout = _ThreadOutput(sys.stdout)
+    sys.stdout.route(stream)
+
+
+class PreGenerator:
+    """Thread latar yang menspekulasikan signal berskor tinggi saat slot LLM menganggur."""
+
+    def __init__(self):
+        self._pending: Deque[str] = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "PreGenerator":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="pregen", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def notify(self, signal: Dict):
+        """Dipanggil saat signal baru tersimpan; yang lolos ambang skor diantrikan."""
+        if eligible(signal):
+            self._pending.append(signal['id'])
+            self._wake.set()
+
+    def _scan(self):
+        """Isi ulang antrian dari signal 'new' di DB (saat start dan setelah anggaran di-reset)."""
+        try:
+            prune()
+            self._pending.clear()
+            self._pending.extend(s['id'] for s in candidates(PREGEN_MAX_STORED))
+        except Exception as e:
+            print(f"⚠️ Pre-generate gagal memindai signal: {e}")
+
+    def _run(self):
+        import main as app
+
+        app.DB_DIR.mkdir(parents=True, exist_ok=True)
+        with open(app.DB_DIR / LOG_NAME, "a", encoding="utf-8", buffering=1) as log:
+            _route_thread_output(log)
+            print(f"--- pre-generator mulai {time.strftime('%Y-%m-%d %H:%M:%S')} (pid {os.getpid()})")
+            try:
+                self._loop(app)
+            finally:
+                if isinstance(sys.stdout, _ThreadOutput):
+                    sys.stdout.unroute()
+
+    def _loop(self, app):
+        self._scan()
+        while not self._stop.is_set():
+            if not self._pending:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            # Hanya jalan saat tidak ada pekerjaan lain yang memakai/menunggu slot LLM
+            if not scheduler.SCHEDULER.idle("llm"):
+                self._stop.wait(IDLE_POLL_INTERVAL)
+                continue
+            if not budget_left():
+                # Anggaran hari ini habis: tunggu hari berganti lalu pindai ulang, karena signal
+                # yang masuk selama menunggu (dan yang tertunda sekarang) tetap ada di DB
+                self._pending.clear()
+                self._stop.wait(seconds_until_midnight())
+                self._scan()
+                continue
+            signal = app.signals_repo.get(self._pending.popleft())
+            if signal is None:
+                continue
+            try:
+                speculate(signal)
+            except Exception as e:
+                print(f"⚠️ Pre-generate '{signal['topic']}' gagal: {e}")
+
+
+_pregenerator: Optional[PreGenerator] = None
+
+
+def start() -> Optional[PreGenerator]:
+    """Mulai pre-generator latar untuk proses ini jika diaktifkan."""
+    global _pregenerator
+    if PREGEN_ENABLED and _pregenerator is None:
+        _pregenerator = PreGenerator().start()
+    return _pregenerator
+
+
+def notify(signal: Dict):
+    if _pregenerator is not None:
+        _pregenerator.notify(signal)
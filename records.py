@@ -0,0 +1,187 @@
+# records.py
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, Type, TypeVar
+
+
+class RecordError(ValueError):
+    """Record DB tidak memenuhi field wajib."""
+
+
+class Record:
+    """Basis record ber-__slots__ yang tetap bisa diakses seperti dict.
+
+    Field yang dikenal disimpan sebagai slot; field tambahan (mis. `forked_from`)
+    masuk ke `extra` yang hanya dibuat bila diperlukan.
+    """
+
+    __slots__ = ("extra",)
+    FIELDS: Tuple[str, ...] = ()
+    REQUIRED: Tuple[str, ...] = ()
+
+    def __init__(self, **values):
+        for field in self.FIELDS:
+            setattr(self, field, values.pop(field, None))
+        self.extra = values or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Record":
+        if not isinstance(data, dict):
+            raise RecordError(f"{cls.__name__}: record harus berupa object JSON")
+        for field in cls.REQUIRED:
+            if data.get(field) in (None, ""):
+                raise RecordError(f"{cls.__name__}: field '{field}' wajib diisi")
+        return cls(**data)
+
+    @classmethod
+    def from_raw(cls, data: Dict[str, Any]) -> "Record":
+        """Record tanpa validasi, untuk data lama yang tidak lolos `from_dict` tapi tidak boleh hilang."""
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {field: getattr(self, field) for field in self.FIELDS if getattr(self, field) is not None}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    # --- Kompatibilitas dengan kode lama yang memakai dict ---
+    def __getitem__(self, key: str):
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        if key in self.FIELDS:
+            return getattr(self, key) is not None
+        return bool(self.extra) and key in self.extra
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def copy(self) -> "Record":
+        """Salinan dangkal; `extra` ikut disalin agar perubahan tidak bocor ke aslinya."""
+        clone = type(self).__new__(type(self))
+        for field in self.FIELDS:
+            setattr(clone, field, getattr(self, field))
+        clone.extra = dict(self.extra) if self.extra else None
+        return clone
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class SignalRecord(Record):
+    __slots__ = ("id", "topic", "score", "status", "report_file", "created_at")
+    FIELDS = __slots__
+    REQUIRED = ("id", "topic")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SignalRecord":
+        record = super().from_dict(data)
+        try:
+            record.score = int(record.score or 0)
+        except (TypeError, ValueError):
+            raise RecordError(f"SignalRecord {record.id}: skor tidak valid ({record.score!r})")
+        # Status & path report berulang di banyak record, intern agar berbagi memori
+        record.status = sys.intern(record.status or "new")
+        return record
+
+
+class ProductRecord(Record):
+    __slots__ = ("id", "signal_id", "name", "description", "product_type", "suite", "created_at", "files")
+    FIELDS = __slots__
+    REQUIRED = ("id",)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProductRecord":
+        record = super().from_dict(data)
+        if record.product_type:
+            record.product_type = sys.intern(record.product_type)
+        if record.suite:
+            record.suite = sys.intern(record.suite)
+        return record
+
+
+def iter_json_array(text: str) -> Iterator[Tuple[Any, int, int]]:
+    """Iterasi elemen array JSON satu per satu beserta posisi karakter awal/akhirnya.
+
+    Setiap elemen langsung bisa dikonversi lalu dibuang, sehingga puncak memori
+    tidak pernah menampung seluruh list dict sekaligus.
+    """
+    decoder = json.JSONDecoder()
+    pos = text.find("[")
+    if pos < 0:
+        if text.strip():
+            raise json.JSONDecodeError("Expecting '['", text, 0)
+        return
+    pos += 1
+    length = len(text)
+    while True:
+        while pos < length and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= length:
+            raise json.JSONDecodeError("Unterminated array", text, pos)
+        if text[pos] == "]":
+            return
+        value, end = decoder.raw_decode(text, pos)
+        yield value, pos, end
+        pos = end
+
+
+R = TypeVar("R", bound=Record)
+
+
+def load_records(path: Path, record_type: Type[R]) -> List[R]:
+    """Baca & validasi file DB dalam satu kali lewat; semua elemen bertipe `record_type`.
+
+    Objek yang tidak lolos validasi tetap dimuat apa adanya (`from_raw`) agar tidak hilang
+    saat DB disimpan ulang; elemen yang bukan objek JSON dibuang. Jumlah keduanya dilaporkan
+    lewat peringatan.
+    """
+    text = path.read_text(encoding="utf-8")
+    records = []
+    invalid = dropped = 0
+    for value, _, _ in iter_json_array(text):
+        try:
+            records.append(record_type.from_dict(value))
+        except RecordError:
+            if not isinstance(value, dict):
+                dropped += 1
+                continue
+            records.append(record_type.from_raw(value))
+            invalid += 1
+    if invalid:
+        print(f"⚠️  Peringatan: {invalid} record di {path.name} tidak valid dan dilewati validasinya.")
+    if dropped:
+        print(f"⚠️  Peringatan: {dropped} elemen di {path.name} bukan object JSON dan dibuang.")
+    return records
+
+
+def record_to_json(obj):
+    """Hook `default` untuk json.dump agar record bisa disimpan langsung."""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
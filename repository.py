@@ -0,0 +1,179 @@
+# repository.py
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import metrics
+
+SCORE_BUCKET = 10
+
+
+class JsonRepository:
+    """Cache in-process untuk satu file DB JSON dengan invalidasi berbasis mtime + size.
+
+    List yang dikembalikan oleh `all()`/`get()` adalah isi cache dan hanya untuk dibaca;
+    perubahan lewat `append()`/`update()` yang menulis salinan list dulu dan baru mengganti
+    cache setelah file tersimpan, sehingga kegagalan tulis tidak meninggalkan record hantu.
+    """
+
+    def __init__(self, path: Path, loader: Callable[[Path], Any], saver: Callable[[Path, Any], None]):
+        self.path = path
+        self._loader = loader
+        self._saver = saver
+        self._records: Optional[List[Dict]] = None
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._index: Optional[Dict[str, Dict]] = None
+        self._index_version = -1
+        # Naik setiap kali isi cache berganti, dipakai untuk invalidasi agregat turunan
+        self.version = 0
+
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        # Inode ikut dicek karena save_db menulis lewat file sementara + rename
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def refresh(self) -> bool:
+        """Muat ulang file hanya jika mtime, ukuran, atau inode-nya berubah."""
+        signature = self._stat_signature()
+        if self._records is not None and signature == self._signature:
+            metrics.CACHE_REQUESTS.inc(self.path.stem, "hit")
+            return False
+        metrics.CACHE_REQUESTS.inc(self.path.stem, "miss")
+        self._records = self._loader(self.path)
+        self._signature = signature
+        self.version += 1
+        return True
+
+    def all(self) -> List[Dict]:
+        self.refresh()
+        return self._records
+
+    def get(self, record_id: str) -> Optional[Dict]:
+        """Cari record berdasarkan ID melalui index yang dibangun sekali per versi."""
+        records = self.all()
+        if self._index is None or self._index_version != self.version:
+            self._index = {r['id']: r for r in records}
+            self._index_version = self.version
+        return self._index.get(record_id)
+
+    def save(self, records: List[Dict]):
+        self._saver(self.path, records)
+        self._records = records
+        self._signature = self._stat_signature()
+        self.version += 1
+
+    def append(self, record: Dict):
+        """Tambahkan satu record; cache hanya berubah jika penyimpanan berhasil."""
+        self.save(self.all() + [record])
+
+    def update(self, record_id: str, **changes) -> Optional[Dict]:
+        """Ubah field satu record pada salinannya; None jika ID tidak ditemukan."""
+        records = self.all()
+        for i, record in enumerate(records):
+            if record.get('id') == record_id:
+                updated = record.copy()
+                for key, value in changes.items():
+                    updated[key] = value
+                self.save(records[:i] + [updated] + records[i + 1:])
+                return updated
+        return None
+
+    def invalidate(self):
+        self._records = None
+        self._signature = None
+
+
+class InterProcessLock:
+    """Lock reentrant yang berlaku antar-thread dan antar-proses (lewat lock file).
+
+    Dipakai agar beberapa proses worker tidak saling menimpa saat membaca-ubah-simpan
+    file DB JSON.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._local = threading.local()
+        self._fd: Optional[int] = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+            _lock_file(self._fd)
+        self._local.depth = depth + 1
+
+    def release(self):
+        self._local.depth -= 1
+        if self._local.depth == 0:
+            _unlock_file(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(fd: int):
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock_file(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class Dashboard:
+    """Agregat status untuk menu utama, dihitung ulang hanya saat DB berubah."""
+
+    def __init__(self, signals: JsonRepository, products: JsonRepository):
+        self.signals = signals
+        self.products = products
+        self._stats: Optional[Dict[str, Any]] = None
+        self._versions: Optional[Tuple[int, int]] = None
+
+    def stats(self) -> Dict[str, Any]:
+        signals = self.signals.all()
+        products = self.products.all()
+        versions = (self.signals.version, self.products.version)
+        if self._stats is not None and versions == self._versions:
+            return self._stats
+
+        status_counts = Counter(s.get('status') for s in signals)
+        score_histogram = Counter(
+            min(int(s.get('score') or 0) // SCORE_BUCKET * SCORE_BUCKET, 100 - SCORE_BUCKET)
+            for s in signals
+        )
+        products_per_signal = Counter(p.get('signal_id') for p in products)
+
+        self._stats = {
+            "total_signals": len(signals),
+            "total_products": len(products),
+            "status_counts": dict(status_counts),
+            "score_histogram": {b: score_histogram.get(b, 0) for b in range(0, 100, SCORE_BUCKET)},
+            "products_per_signal": dict(products_per_signal),
+        }
+        self._versions = versions
+        return self._stats
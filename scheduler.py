@@ -0,0 +1,297 @@
+# scheduler.py
+"""Penjadwal fair-share multi-tenant untuk panggilan LLM dan render.
+
+Setiap pekerjaan membawa tenant dan kelas prioritas (`interactive` atau `batch`) lewat
+`context(...)`. Sebelum BuilderAgent memanggil LLM atau TemplateRenderer merender,
+pekerjaan meminta slot:
+
+    with scheduler.context(tenant="toko_budi", priority="interactive"):
+        with scheduler.slot("llm"):
+            ...
+
+Slot dibagikan dengan weighted fair queueing (start-time fair queueing) antar tenant:
+tenant dengan bobot 2 mendapat giliran dua kali lebih sering saat antrian penuh, dan satu
+tenant yang mengantrikan 500 produk tidak menahan tenant lain. Kelas interactive selalu
+didahulukan, dan sebagian slot dicadangkan untuknya agar tidak menunggu panggilan batch
+yang panjang. Di luar cadangan itu batch boleh memakai seluruh kapasitas yang menganggur.
+"""
+import contextlib
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+import metrics
+
+
+def env_json(name: str) -> Dict[str, Any]:
+    """Object JSON dari variabel lingkungan; nilai rusak dilaporkan dan diabaikan (jadi `{}`)."""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return {}
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError as e:
+        print(f"⚠️  Peringatan: {name} bukan JSON valid ({e}), diabaikan.", file=sys.stderr)
+        return {}
+    if not isinstance(value, dict):
+        print(f"⚠️  Peringatan: {name} harus berupa object JSON, diabaikan.", file=sys.stderr)
+        return {}
+    return value
+
+
+PRIORITIES = ("interactive", "batch")
+DEFAULT_TENANT = "default"
+DEFAULT_PRIORITY = "batch"
+
+# Kapasitas total per sumber daya dalam satu proses
+CAPACITY = {
+    "llm": int(os.getenv("AUTOPRENEUR_LLM_CONCURRENCY", "8")),
+    "render": int(os.getenv("AUTOPRENEUR_RENDER_CONCURRENCY", str(os.cpu_count() or 2))),
+}
+# Slot yang hanya boleh dipakai kelas interactive
+RESERVED_INTERACTIVE = {
+    "llm": int(os.getenv("AUTOPRENEUR_LLM_RESERVED_INTERACTIVE", "1")),
+    "render": int(os.getenv("AUTOPRENEUR_RENDER_RESERVED_INTERACTIVE", "1")),
+}
+# Bobot tenant sama dengan bobot antrian signal (lihat main.QUEUE_TENANT_WEIGHTS)
+TENANT_WEIGHTS: Dict[str, float] = env_json("AUTOPRENEUR_QUEUE_TENANT_WEIGHTS")
+# Kuota slot bersamaan per tenant, mis. {"toko_budi": {"llm": 2, "render": 1}}; tanpa kuota = bebas
+TENANT_QUOTAS: Dict[str, Dict[str, int]] = env_json("AUTOPRENEUR_TENANT_QUOTAS")
+
+SCHEDULER_WAIT = metrics.REGISTRY.histogram(
+    "autopreneur_scheduler_wait_seconds", "Waktu tunggu slot penjadwal.", ["resource", "priority"])
+SCHEDULER_GRANTED = metrics.REGISTRY.counter(
+    "autopreneur_scheduler_granted_total", "Slot penjadwal yang diberikan.", ["resource", "tenant", "priority"])
+SCHEDULER_RUNNING = metrics.REGISTRY.gauge(
+    "autopreneur_scheduler_running", "Slot yang sedang dipakai per tenant.", ["resource", "tenant"])
+SCHEDULER_WAITING = metrics.REGISTRY.gauge(
+    "autopreneur_scheduler_waiting", "Permintaan slot yang menunggu per tenant.", ["resource", "tenant"])
+
+_context: contextvars.ContextVar[Tuple[str, str]] = contextvars.ContextVar(
+    "scheduler_context", default=(DEFAULT_TENANT, DEFAULT_PRIORITY))
+
+
+@contextlib.contextmanager
+def context(tenant: Optional[str] = None, priority: Optional[str] = None) -> Iterator[None]:
+    """Tenant & kelas prioritas untuk semua slot yang diminta di dalam blok ini."""
+    current_tenant, current_priority = _context.get()
+    priority = priority or current_priority
+    if priority not in PRIORITIES:
+        raise ValueError(f"Prioritas tidak dikenal: {priority}")
+    token = _context.set((tenant or current_tenant, priority))
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def current() -> Tuple[str, str]:
+    return _context.get()
+
+
+class FairQueue:
+    """Antrian weighted fair queueing per tenant, interactive sebelum batch.
+
+    Tag awal tiap item = max(waktu virtual, tag akhir item sebelumnya dari tenant yang sama),
+    tag akhir = tag awal + cost / bobot tenant. `pop()` mengambil item dengan tag awal
+    terkecil dari tenant yang lolos `eligible`. Tidak thread-safe; pemanggil memegang lock.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        self.weights = weights if weights is not None else TENANT_WEIGHTS
+        self._queues: Dict[str, Dict[str, Deque[Tuple[float, Any]]]] = {p: {} for p in PRIORITIES}
+        self._virtual = {p: 0.0 for p in PRIORITIES}
+        self._last_finish: Dict[Tuple[str, str], float] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def queued(self, tenant: str) -> int:
+        return sum(len(queues.get(tenant, ())) for queues in self._queues.values())
+
+    def push(self, item: Any, tenant: str, priority: str = DEFAULT_PRIORITY, cost: float = 1.0):
+        weight = max(float(self.weights.get(tenant, 1.0)), 1e-6)
+        start = max(self._virtual[priority], self._last_finish.get((priority, tenant), 0.0))
+        self._last_finish[(priority, tenant)] = start + cost / weight
+        self._queues[priority].setdefault(tenant, deque()).append((start, item))
+        self._size += 1
+
+    def pop(self, eligible: Optional[Callable[[str, str], bool]] = None) -> Optional[Any]:
+        for priority in PRIORITIES:
+            queues = self._queues[priority]
+            best = None
+            for tenant, queue in queues.items():
+                if eligible is not None and not eligible(tenant, priority):
+                    continue
+                if best is None or queue[0][0] < queues[best][0][0]:
+                    best = tenant
+            if best is None:
+                continue
+            start, item = queues[best].popleft()
+            if not queues[best]:
+                del queues[best]
+            self._virtual[priority] = max(self._virtual[priority], start)
+            self._size -= 1
+            return item
+        return None
+
+    def remove(self, item: Any) -> bool:
+        for queues in self._queues.values():
+            for tenant, queue in list(queues.items()):
+                for entry in queue:
+                    if entry[1] is item:
+                        queue.remove(entry)
+                        if not queue:
+                            del queues[tenant]
+                        self._size -= 1
+                        return True
+        return False
+
+
+class _Waiter:
+    __slots__ = ("resource", "tenant", "priority", "granted", "queued_at")
+
+    def __init__(self, resource: str, tenant: str, priority: str):
+        self.resource = resource
+        self.tenant = tenant
+        self.priority = priority
+        self.granted = threading.Event()
+        self.queued_at = time.perf_counter()
+
+
+class _TenantStats:
+    __slots__ = ("running", "waiting", "granted", "wait_total", "wait_max")
+
+    def __init__(self):
+        self.running = 0
+        self.waiting = 0
+        self.granted = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class Scheduler:
+    """Pembagi slot per sumber daya (llm, render) dengan fair queueing dan kuota per tenant."""
+
+    def __init__(self, capacity: Optional[Dict[str, int]] = None,
+                 reserved: Optional[Dict[str, int]] = None,
+                 quotas: Optional[Dict[str, Dict[str, int]]] = None,
+                 weights: Optional[Dict[str, float]] = None):
+        self.capacity = dict(capacity or CAPACITY)
+        self.reserved = dict(reserved if reserved is not None else RESERVED_INTERACTIVE)
+        self.quotas = quotas if quotas is not None else TENANT_QUOTAS
+        self._lock = threading.Lock()
+        self._queues = {resource: FairQueue(weights) for resource in self.capacity}
+        self._in_use = {resource: 0 for resource in self.capacity}
+        self._stats: Dict[Tuple[str, str], _TenantStats] = {}
+
+    def _tenant_stats(self, resource: str, tenant: str) -> _TenantStats:
+        stats = self._stats.get((resource, tenant))
+        if stats is None:
+            stats = self._stats[(resource, tenant)] = _TenantStats()
+        return stats
+
+    def _eligible(self, resource: str) -> Callable[[str, str], bool]:
+        free = self.capacity[resource] - self._in_use[resource]
+        # Cadangan tidak boleh menghabiskan seluruh kapasitas, batch tetap bisa jalan
+        reserved = min(self.reserved.get(resource, 0), self.capacity[resource] - 1)
+
+        def eligible(tenant: str, priority: str) -> bool:
+            if priority != "interactive" and free <= reserved:
+                return False
+            quota = self.quotas.get(tenant, {}).get(resource)
+            return quota is None or self._tenant_stats(resource, tenant).running < quota
+        return eligible
+
+    def _dispatch(self, resource: str):
+        queue = self._queues[resource]
+        while queue and self._in_use[resource] < self.capacity[resource]:
+            waiter = queue.pop(self._eligible(resource))
+            if waiter is None:
+                return
+            self._grant(waiter)
+
+    def _grant(self, waiter: _Waiter):
+        waited = time.perf_counter() - waiter.queued_at
+        stats = self._tenant_stats(waiter.resource, waiter.tenant)
+        self._in_use[waiter.resource] += 1
+        stats.waiting -= 1
+        stats.running += 1
+        stats.granted += 1
+        stats.wait_total += waited
+        stats.wait_max = max(stats.wait_max, waited)
+        SCHEDULER_WAIT.observe(waited, waiter.resource, waiter.priority)
+        SCHEDULER_GRANTED.inc(waiter.resource, waiter.tenant, waiter.priority)
+        SCHEDULER_WAITING.dec(waiter.resource, waiter.tenant)
+        SCHEDULER_RUNNING.inc(waiter.resource, waiter.tenant)
+        waiter.granted.set()
+
+    def acquire(self, resource: str, tenant: Optional[str] = None, priority: Optional[str] = None,
+                cost: float = 1.0) -> _Waiter:
+        """Tunggu sampai slot diberikan. `cost` > 1 untuk pekerjaan besar (mis. batch multi-topik)."""
+        default_tenant, default_priority = current()
+        waiter = _Waiter(resource, tenant or default_tenant, priority or default_priority)
+        with self._lock:
+            self._tenant_stats(resource, waiter.tenant).waiting += 1
+            SCHEDULER_WAITING.inc(resource, waiter.tenant)
+            self._queues[resource].push(waiter, waiter.tenant, waiter.priority, cost)
+            self._dispatch(resource)
+        try:
+            waiter.granted.wait()
+        except BaseException:
+            with self._lock:
+                if self._queues[resource].remove(waiter):
+                    self._tenant_stats(resource, waiter.tenant).waiting -= 1
+                    SCHEDULER_WAITING.dec(resource, waiter.tenant)
+                    raise
+            self.release(waiter)
+            raise
+        return waiter
+
+    def release(self, waiter: _Waiter):
+        with self._lock:
+            self._in_use[waiter.resource] -= 1
+            self._tenant_stats(waiter.resource, waiter.tenant).running -= 1
+            SCHEDULER_RUNNING.dec(waiter.resource, waiter.tenant)
+            self._dispatch(waiter.resource)
+
+    @contextlib.contextmanager
+    def slot(self, resource: str, cost: float = 1.0) -> Iterator[None]:
+        waiter = self.acquire(resource, cost=cost)
+        try:
+            yield
+        finally:
+            self.release(waiter)
+
+    def idle(self, resource: str) -> bool:
+        """Tidak ada slot yang dipakai maupun ditunggu untuk sumber daya ini."""
+        with self._lock:
+            return self._in_use[resource] == 0 and not self._queues[resource]
+
+    def stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Statistik per tenant per sumber daya: berjalan, menunggu, total slot, rata-rata & maks tunggu."""
+        with self._lock:
+            result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            for (resource, tenant), s in sorted(self._stats.items()):
+                result.setdefault(tenant, {})[resource] = {
+                    "running": s.running,
+                    "waiting": s.waiting,
+                    "granted": s.granted,
+                    "wait_avg_ms": round(s.wait_total / s.granted * 1000, 1) if s.granted else None,
+                    "wait_max_ms": round(s.wait_max * 1000, 1),
+                }
+            return result
+
+
+SCHEDULER = Scheduler()
+
+
+def slot(resource: str, cost: float = 1.0):
+    """Slot dari penjadwal bersama proses ini."""
+    return SCHEDULER.slot(resource, cost)
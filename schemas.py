@@ -0,0 +1,440 @@
+# schemas.py
+"""Struktur data setiap jenis produk, satu sumber untuk semua pemakai:
+
+- `response_format()` / `batch_response_format()`: JSON Schema strict untuk structured output OpenAI
+- `validate_template_data()`: validasi data sebelum dirender (dipakai TemplateRenderer & checkpoint)
+- `upgrade_legacy()` / `missing_fields()`: render ulang data lama yang tersimpan sebelum schema strict
+- `LOCAL_FIELDS` / `LLM_SPECS`: field yang dihitung lokal (jadwal sholat, tanggal, cluster hashtag) dan
+  bentuk respons LLM yang lebih ringkas dari data template
+
+Notasi spesifikasi: `str`, `int`, `float`, `bool`, `[X]` untuk array, dict untuk objek
+(semua field wajib), `Enum(...)` untuk pilihan teks, `AnyOf(...)` untuk beberapa tipe.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+MAX_ERRORS = 20
+
+
+class Enum:
+    def __init__(self, *values: str):
+        self.values = values
+
+
+class AnyOf:
+    def __init__(self, *specs):
+        self.specs = specs
+
+
+WEEKDAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+
+PRODUCT_SPECS: Dict[str, Dict[str, Any]] = {
+    # UMKM Productivity Suite
+    "content_calendar": {
+        "name": str, "description": str, "month": str, "year": int,
+        "calendar_weeks": [{
+            "week_number": int, "theme": str,
+            "days": [{
+                "date": str,
+                "content_type": Enum("Educational", "Promotional", "Engagement", "Behind the Scene"),
+                "idea": str, "best_time": str,
+            }],
+            "hashtags": [str],
+        }],
+    },
+    "caption_bank": {
+        "name": str, "description": str,
+        "captions": [{"day": int, "text": str, "hashtags": [str]}],
+    },
+    "invoice_macro": {
+        "name": str, "description": str,
+        "invoices": [{
+            "company_name": str, "company_address": str, "company_phone": str,
+            "number": str, "date": str, "due_date": str,
+            "client_name": str, "client_address": str, "client_phone": str,
+            "bank_name": str, "account_number": str, "account_name": str,
+            "items": [{"description": str, "quantity": int, "price": float, "total": float}],
+            "subtotal": float, "tax": float, "total": float, "notes": str,
+        }],
+    },
+
+    # Shopee Toolkit
+    "keyword_tracker": {
+        "name": str, "description": str, "report_date": str, "shop_name": str,
+        "keywords": [{
+            "keyword": str, "search_volume": int, "competition": Enum("Low", "Medium", "High"),
+            "current_position": AnyOf(int, str), "previous_position": AnyOf(int, str), "change": int,
+            "cpc_estimate": float, "recommended_action": str,
+        }],
+        "summary": str,
+        "recommendations": [str],
+    },
+    "hashtag_clusterer": {
+        "name": str, "description": str,
+        "clusters": [{
+            "cluster_name": Enum("High Competition", "Medium Competition", "Low Competition", "Branded", "Community"),
+            "hashtags": [{"tag": str, "posts_count": int, "engagement_rate": float, "best_time": str}],
+        }],
+        "usage_guide": str,
+        # Strict schema tidak mengizinkan key bebas; hari dibakukan ke nama hari
+        "monthly_calendar": {day: str for day in WEEKDAYS},
+    },
+    "copy_swipes": {
+        "name": str, "description": str,
+        "categories": [str],
+        "swipe_sections": [{
+            "name": str,
+            "swipes": [{
+                "title": str, "type": Enum("Headline", "Body Copy", "CTA", "Hook"), "content": str,
+                "conversion_rate": float, "click_rate": float, "best_for": str,
+            }],
+        }],
+        "usage_tips": [{"title": str, "content": str}],
+    },
+
+    # Canva Assets
+    "batik_patterns": {
+        "name": str, "description": str,
+        "patterns": [{
+            "name": str, "region": str, "preview_url": str, "format": Enum("PNG", "SVG"),
+            "resolution": str, "seamless": Enum("Yes", "No"), "colors": [str],
+        }],
+        "usage_examples": [{"icon": str, "title": str, "description": str}],
+        "license_terms": str,
+    },
+    "brand_kit": {
+        "name": str, "description": str,
+        "logos": [{"name": str, "preview": str, "background": str, "usage": str}],
+        "colors": [{"name": str, "hex": str, "rgb": str, "cmyk": str}],
+        "fonts": [{
+            "name": str, "family": str, "category": Enum("Heading", "Body", "Accent"),
+            "sample_text": str, "sample_size": str, "weights": [str],
+        }],
+        "templates": [{"name": str, "icon": str, "dimensions": str, "format": str}],
+        "guidelines": [{"icon": str, "title": str, "description": str, "dos": [str], "donts": [str]}],
+    },
+    "capcut_templates": {
+        "name": str, "description": str,
+        "categories": [str],
+        "templates": [{
+            "name": str, "icon": str, "duration": int,
+            "music_type": Enum("Upbeat", "Chill", "Dramatic", "Trendy"),
+            "ratio": Enum("9:16", "1:1", "16:9"), "tags": [str], "features": [str],
+        }],
+        "tutorial_steps": [{"title": str, "description": str}],
+    },
+
+    # Finance Pack
+    "pajak_calculator": {
+        "name": str, "description": str, "location": str, "current_date": str,
+        "sample_data": {
+            "monthly_revenue": float, "annual_revenue": float, "tax_rate": float,
+            "monthly_tax": float, "annual_tax": float, "dpp": float, "ppn": float, "total_with_ppn": float,
+        },
+        "tax_rules": [{"criteria": str, "rate": str, "notes": str}],
+        "tax_tips": [str],
+        "tax_deadlines": [{"date": str, "description": str}],
+    },
+    "cash_flow": {
+        "name": str, "description": str,
+        "summary": {
+            "total_income": float, "total_expense": float, "balance": float,
+            "income_change": float, "expense_change": float, "balance_change": float,
+            "runway_months": float, "burn_rate": float,
+        },
+        "transactions": [{
+            "date": str, "description": str, "category": str, "type": Enum("income", "expense"),
+            "amount": float, "balance": float,
+        }],
+        "income_categories": [{"name": str, "amount": float, "percentage": float, "color": str}],
+        "expense_categories": [{"name": str, "amount": float, "percentage": float, "color": str}],
+        "projections": [{"month": str, "value": float}],
+    },
+    "sop_templates": {
+        "name": str, "description": str, "version": str, "last_updated": str,
+        "sop_categories": [{"icon": str, "name": str}],
+        "sop_documents": [{
+            "title": str, "effective_date": str, "responsible": str, "revision": str,
+            "purpose": str, "scope": str,
+            "steps": [{"title": str, "description": str, "checklist": [str]}],
+            "form_template": {"title": str, "fields": [{"label": str, "placeholder": str}]},
+            "warnings": [str],
+            "tips": [str],
+            "approval_flow": [{"role": str, "action": str}],
+        }],
+    },
+
+    # Seasonal
+    "ramadan_calendar": {
+        "name": str, "description": str, "location": str, "current_date": str,
+        "month_name": str, "year": int, "hijri_month": str, "hijri_year": int,
+        "weekdays": [str],
+        "prayer_times": [{"name": str, "time": str}],
+        "calendar_days": [{"number": int, "hijri": str, "is_today": bool, "event": AnyOf(str, None)}],
+        "content_categories": [{"icon": str, "title": str, "ideas": [str]}],
+        "popular_hashtags": [str],
+        "special_days": [{"date": str, "name": str, "description": str}],
+    },
+    "wedding_planner": {
+        "name": str, "description": str, "couple_names": str, "wedding_date": str, "total_budget": float,
+        "budget_items": [{"category": str, "amount": float, "percentage": float}],
+        "timeline": [{"date": str, "title": str, "tasks": [str]}],
+        "vendors": [{
+            "icon": str, "name": str, "status": Enum("booked", "pending", "searching"), "status_text": str,
+            "description": str, "budget": float, "phone": str, "location": str,
+        }],
+        "guest_stats": {"total": int, "confirmed": int, "pending": int, "tables": int},
+        "guest_list": [{
+            "name": str, "relation": str, "pax": int, "rsvp": Enum("yes", "no", "pending"),
+            "rsvp_text": str, "table": int, "notes": str,
+        }],
+        "todo_columns": [{"title": str, "items": [str]}],
+        "important_notes": [{"title": str, "content": str}],
+    },
+    "yearend_planner": {
+        "name": str, "description": str, "year": int,
+        "achievements": [{"icon": str, "title": str, "description": str, "metric": str}],
+        "goal_categories": [{
+            "icon": str, "name": str,
+            "goals": [{"text": str, "priority": Enum("High", "Medium", "Low")}],
+        }],
+        "monthly_breakdown": [{"name": str, "focus": str, "tasks": [str]}],
+        "habits": [{"icon": str, "name": str, "frequency": str, "progress": int, "streak": int}],
+        "visions": [{"icon": str, "title": str, "description": str}],
+        "reflection_prompts": [{"question": str, "placeholder": str}],
+    },
+}
+
+PRODUCT_TYPES = list(PRODUCT_SPECS)
+
+# Field yang diisi kode lokal setelah respons LLM (lihat agents.LOCAL_BUILDERS)
+LOCAL_FIELDS: Dict[str, List[str]] = {
+    "ramadan_calendar": ["current_date", "month_name", "year", "hijri_month", "hijri_year",
+                         "weekdays", "prayer_times", "calendar_days"],
+    "yearend_planner": ["year"],
+    "hashtag_clusterer": ["clusters"],
+    "keyword_tracker": ["report_date", "keywords"],
+}
+
+# Respons LLM yang bentuknya berbeda dari data template: LLM hanya mengisi slot konten,
+# kerangka tanggal ditambahkan calendar_scaffold.py
+LLM_SPECS: Dict[str, Dict[str, Any]] = {
+    "content_calendar": {
+        "name": str, "description": str,
+        "weeks": [{
+            "theme": str,
+            "days": [{
+                "content_type": Enum("Educational", "Promotional", "Engagement", "Behind the Scene"),
+                "idea": str,
+            }],
+            "hashtags": [str],
+        }],
+    },
+    # Kata kunci & angka dari keyword_index.py; LLM hanya menulis CPC dan saran per kata kunci
+    "keyword_tracker": {
+        **PRODUCT_SPECS["keyword_tracker"],
+        "keyword_notes": [{"keyword": str, "cpc_estimate": float, "recommended_action": str}],
+    },
+    "yearend_planner": {
+        **PRODUCT_SPECS["yearend_planner"],
+        "monthly_breakdown": [{"focus": str, "tasks": [str]}],
+    },
+}
+
+
+def llm_spec(product_type: str) -> Dict[str, Any]:
+    """Spesifikasi respons LLM: LLM_SPECS, atau spesifikasi produk tanpa LOCAL_FIELDS."""
+    spec = LLM_SPECS.get(product_type, PRODUCT_SPECS[product_type])
+    local = LOCAL_FIELDS.get(product_type, ())
+    return {key: value for key, value in spec.items() if key not in local}
+
+
+# --- JSON SCHEMA ---
+_PRIMITIVE_SCHEMAS = {str: "string", int: "integer", float: "number", bool: "boolean", None: "null"}
+
+
+def to_json_schema(spec) -> Dict[str, Any]:
+    if isinstance(spec, dict):
+        return {
+            "type": "object",
+            "properties": {key: to_json_schema(value) for key, value in spec.items()},
+            "required": list(spec),
+            "additionalProperties": False,
+        }
+    if isinstance(spec, list):
+        return {"type": "array", "items": to_json_schema(spec[0])}
+    if isinstance(spec, Enum):
+        return {"type": "string", "enum": list(spec.values)}
+    if isinstance(spec, AnyOf):
+        return {"anyOf": [to_json_schema(s) for s in spec.specs]}
+    return {"type": _PRIMITIVE_SCHEMAS[spec]}
+
+
+@lru_cache(maxsize=None)
+def json_schema(product_type: str) -> Dict[str, Any]:
+    return to_json_schema(PRODUCT_SPECS[product_type])
+
+
+@lru_cache(maxsize=None)
+def llm_json_schema(product_type: str) -> Dict[str, Any]:
+    """Schema yang ditulis LLM (lihat `llm_spec`)."""
+    return to_json_schema(llm_spec(product_type))
+
+
+def response_format(product_type: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """`response_format` strict structured output untuk satu produk (atau sebagian field-nya)."""
+    schema = llm_json_schema(product_type)
+    if fields:
+        # Field lokal yang gagal dihitung diminta ke LLM memakai schema template-nya
+        properties = {**json_schema(product_type)["properties"], **schema["properties"]}
+        schema = {**schema, "properties": {f: properties[f] for f in fields}, "required": list(fields)}
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": product_type, "strict": True, "schema": schema},
+    }
+
+
+def batch_response_format(product_type: str, keys: List[str]) -> Dict[str, Any]:
+    """`response_format` untuk batch multi-topik: satu objek produk per key."""
+    schema = {
+        "type": "object",
+        "properties": {key: llm_json_schema(product_type) for key in keys},
+        "required": list(keys),
+        "additionalProperties": False,
+    }
+    return {"type": "json_schema", "json_schema": {"name": f"{product_type}_batch", "strict": True, "schema": schema}}
+
+
+# --- VALIDATOR TERKOMPILASI ---
+Check = Callable[[Any, str, List[str]], None]
+
+
+def _compile(spec) -> Check:
+    """Ubah spesifikasi menjadi pohon closure sekali saja; validasi tinggal memanggilnya."""
+    if isinstance(spec, dict):
+        fields = [(key, _compile(value)) for key, value in spec.items()]
+
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path or 'data'}: harus objek")
+                return
+            for key, check in fields:
+                if key in value:
+                    check(value[key], f"{path}.{key}" if path else key, errors)
+                else:
+                    errors.append(f"Missing required field: {path}.{key}" if path else f"Missing required field: {key}")
+        return check_object
+
+    if isinstance(spec, list):
+        check_item = _compile(spec[0])
+
+        def check_array(value, path, errors):
+            if not isinstance(value, list):
+                errors.append(f"{path}: harus array")
+                return
+            for i, item in enumerate(value):
+                if len(errors) >= MAX_ERRORS:
+                    return
+                check_item(item, f"{path}[{i}]", errors)
+        return check_array
+
+    if isinstance(spec, Enum):
+        allowed = frozenset(spec.values)
+
+        def check_enum(value, path, errors):
+            if value not in allowed:
+                errors.append(f"{path}: harus salah satu dari {', '.join(spec.values)}")
+        return check_enum
+
+    if isinstance(spec, AnyOf):
+        checks = [_compile(s) for s in spec.specs]
+
+        def check_any(value, path, errors):
+            for check in checks:
+                trial: List[str] = []
+                check(value, path, trial)
+                if not trial:
+                    return
+            errors.append(f"{path}: tipe tidak sesuai")
+        return check_any
+
+    if spec is None:
+        def check_null(value, path, errors):
+            if value is not None:
+                errors.append(f"{path}: harus null")
+        return check_null
+
+    if spec is float:
+        def check_number(value, path, errors):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                errors.append(f"{path}: harus angka")
+        return check_number
+
+    if spec is int:
+        def check_int(value, path, errors):
+            if isinstance(value, bool) or not isinstance(value, int):
+                errors.append(f"{path}: harus bilangan bulat")
+        return check_int
+
+    name = _PRIMITIVE_SCHEMAS[spec]
+
+    def check_type(value, path, errors):
+        if not isinstance(value, spec):
+            errors.append(f"{path}: harus {name}")
+    return check_type
+
+
+@lru_cache(maxsize=None)
+def validator(product_type: str) -> Check:
+    return _compile(PRODUCT_SPECS[product_type])
+
+
+def validate_template_data(product_type: str, data: Dict[str, Any]) -> List[str]:
+    """Daftar pelanggaran struktur data produk; kosong berarti valid."""
+    if product_type not in PRODUCT_SPECS:
+        return [f"Unknown product type: {product_type}"]
+    errors: List[str] = []
+    validator(product_type)(data, "", errors)
+    return errors[:MAX_ERRORS]
+
+
+# --- DATA LAMA ---
+def _upgrade(spec, value):
+    if isinstance(spec, dict) and isinstance(value, dict):
+        return {key: _upgrade(spec[key], item) if key in spec else item for key, item in value.items()}
+    if isinstance(spec, list):
+        # Hashtag lama tersimpan sebagai satu teks ("#a #b"), bukan list
+        if spec[0] is str and isinstance(value, str):
+            return [part for part in value.replace(",", " ").split() if part]
+        if isinstance(value, list):
+            return [_upgrade(spec[0], item) for item in value]
+    return value
+
+
+def upgrade_legacy(product_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Salinan data tersimpan dengan bentuk lama yang masih bisa dipakai disamakan ke spesifikasi."""
+    if product_type not in PRODUCT_SPECS:
+        return data
+    return _upgrade(PRODUCT_SPECS[product_type], data)
+
+
+def missing_fields(product_type: str, data: Dict[str, Any]) -> List[str]:
+    """Pemeriksaan longgar (field level teratas saja) untuk data yang disimpan versi sebelumnya.
+
+    Data lama bisa berbeda bentuk di dalamnya (mis. kunci bebas di `monthly_calendar`) tapi tetap
+    bisa dirender, jadi validator strict hanya dipakai untuk respons LLM baru.
+    """
+    if product_type not in PRODUCT_SPECS:
+        return [f"Unknown product type: {product_type}"]
+    if not isinstance(data, dict):
+        return ["data: harus objek"]
+    return [f"Missing required field: {field}" for field in PRODUCT_SPECS[product_type] if field not in data]
+
+
+def required_fields(product_type: str) -> List[str]:
+    return list(PRODUCT_SPECS[product_type])
+
+
+def llm_fields(product_type: str) -> List[str]:
+    """Field level teratas yang harus ada di respons LLM."""
+    return list(llm_spec(product_type))
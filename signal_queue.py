@@ -0,0 +1,157 @@
+# signal_queue.py
+import heapq
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DAY_SECONDS = 86400
+_REMOVED = None
+# Naikkan jika bentuk kunci heap berubah agar state lama dibangun ulang oleh sync()
+_FORMAT = 2
+
+
+class SignalQueue:
+    """Antrian prioritas (heap) berisi signal berstatus 'new', tersimpan di disk.
+
+    Prioritas = skor x bobot tenant + bobot umur x umur (hari). Karena semua signal
+    menua dengan laju yang sama, urutan cukup dihitung dari waktu pembuatan sehingga
+    kunci heap tetap statis dan tidak perlu di-heapify ulang seiring waktu.
+
+    Signal lama tanpa `created_at` mulai menua sejak pertama kali masuk antrian; waktu itu
+    disimpan di entri heap sehingga `priority()` dan urutan heap memakai umur yang sama.
+    """
+
+    def __init__(self, path: Optional[Path] = None, age_weight: float = 0.0,
+                 tenant_weights: Optional[Dict[str, float]] = None):
+        self.path = path
+        self.age_weight = age_weight
+        self.tenant_weights = tenant_weights or {}
+        self._heap: List[list] = []
+        self._entries: Dict[str, list] = {}
+        self._seq = 0
+        if path and path.exists():
+            self._load()
+
+    # --- Persistensi ---
+    def _settings(self) -> Dict:
+        return {"format": _FORMAT, "age_weight": self.age_weight, "tenant_weights": self.tenant_weights}
+
+    def _load(self):
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+        # Bobot berubah -> kunci lama tidak valid, biarkan sync() membangun ulang
+        if state.get("settings") != self._settings():
+            return
+        self._seq = state.get("seq", 0)
+        self._heap = [entry for entry in state.get("heap", []) if entry[2] is not _REMOVED]
+        heapq.heapify(self._heap)
+        self._entries = {entry[2]: entry for entry in self._heap}
+
+    def save(self):
+        if not self.path:
+            return
+        if len(self._heap) > 2 * len(self._entries) + 16:
+            self._compact()
+        state = {"settings": self._settings(), "seq": self._seq, "heap": self._heap}
+        self.path.write_text(json.dumps(state), encoding="utf-8")
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if entry[2] is not _REMOVED]
+        heapq.heapify(self._heap)
+
+    # --- Prioritas ---
+    def priority(self, signal: Dict, now: Optional[float] = None) -> float:
+        """Prioritas efektif signal saat ini (semakin besar semakin didahulukan)."""
+        now = time.time() if now is None else now
+        created = self._created(signal)
+        age_days = max(0.0, (now - (now if created is None else created)) / DAY_SECONDS)
+        return self._base(signal) + self.age_weight * age_days
+
+    def _created(self, signal: Dict) -> Optional[float]:
+        created = signal.get("created_at")
+        if created is None:
+            entry = self._entries.get(signal["id"])
+            created = entry[4] if entry is not None else None
+        return created
+
+    def _base(self, signal: Dict) -> float:
+        weight = self.tenant_weights.get(signal.get("tenant") or "default", 1.0)
+        return float(signal.get("score") or 0) * weight
+
+    def _key(self, signal: Dict, created: float) -> float:
+        # Komponen 'now' sama untuk semua signal, jadi yang tersisa hanya -created.
+        return -(self._base(signal) - self.age_weight * created / DAY_SECONDS)
+
+    # --- Operasi antrian ---
+    def push(self, signal: Dict):
+        """Masukkan atau perbarui prioritas signal (O(log n))."""
+        created = self._created(signal)
+        if created is None:
+            created = time.time()
+        self.remove(signal["id"])
+        self._seq += 1
+        entry = [self._key(signal, created), self._seq, signal["id"], signal.get("score"), created]
+        self._entries[signal["id"]] = entry
+        heapq.heappush(self._heap, entry)
+
+    update = push
+
+    def remove(self, signal_id: str):
+        """Tandai signal sebagai dihapus; entri dibuang saat muncul di puncak heap."""
+        entry = self._entries.pop(signal_id, None)
+        if entry is not None:
+            entry[2] = _REMOVED
+
+    def _prune(self):
+        while self._heap and self._heap[0][2] is _REMOVED:
+            heapq.heappop(self._heap)
+
+    def pop(self) -> Optional[str]:
+        """Ambil ID signal dengan prioritas tertinggi dan keluarkan dari antrian."""
+        self._prune()
+        if not self._heap:
+            return None
+        entry = heapq.heappop(self._heap)
+        del self._entries[entry[2]]
+        return entry[2]
+
+    def peek(self, k: int = 1) -> List[str]:
+        """Lihat k ID teratas tanpa mengubah antrian (O(k log k))."""
+        result = []
+        if not self._heap:
+            return result
+        frontier = [(self._heap[0], 0)]
+        while frontier and len(result) < k:
+            entry, i = heapq.heappop(frontier)
+            if entry[2] is not _REMOVED:
+                result.append(entry[2])
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(self._heap):
+                    heapq.heappush(frontier, (self._heap[child], child))
+        return result
+
+    def sync(self, signals: List[Dict]) -> bool:
+        """Samakan isi antrian dengan signal berstatus 'new'. True jika ada perubahan."""
+        changed = False
+        new_ids = set()
+        for signal in signals:
+            if signal.get("status") != "new":
+                continue
+            new_ids.add(signal["id"])
+            entry = self._entries.get(signal["id"])
+            if entry is None or entry[3] != signal.get("score"):
+                self.push(signal)
+                changed = True
+        for stale_id in [sid for sid in self._entries if sid not in new_ids]:
+            self.remove(stale_id)
+            changed = True
+        return changed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, signal_id: str) -> bool:
+        return signal_id in self._entries
@@ -0,0 +1,197 @@
+# similarity.py
+import re
+import json
+import hashlib
+import random
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Iterable, Set
+
+# Parameter MinHash/LSH: 64 permutasi dibagi 16 band x 4 baris.
+# Dengan konfigurasi ini pasangan dengan Jaccard ~0.5 hampir selalu jadi kandidat.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+REPORT_TERMS = 40
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1337)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+STOPWORDS = {
+    "untuk", "dan", "di", "ke", "dari", "yang", "dengan", "pada", "atau", "the",
+    "for", "of", "and", "to", "in", "a", "an", "ini", "itu", "para", "bagi",
+    "dalam", "oleh", "sebagai", "juga", "akan", "adalah", "serta", "lebih",
+}
+
+# Singkatan yang sering dipakai user saat mengetik topik
+ALIASES = {
+    "ig": "instagram",
+    "insta": "instagram",
+    "tt": "tiktok",
+    "fb": "facebook",
+    "wa": "whatsapp",
+    "yt": "youtube",
+    "sosmed": "sosial media",
+    "medsos": "sosial media",
+    "olshop": "online shop",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalisasi teks menjadi daftar kata bermakna (lowercase, alias, tanpa stopword)."""
+    words = []
+    for raw in re.findall(r"[a-z0-9]+", text.lower()):
+        for word in ALIASES.get(raw, raw).split():
+            if word not in STOPWORDS and len(word) > 1:
+                words.append(word)
+    return words
+
+
+def topic_shingles(topic: str) -> Set[str]:
+    """Shingle topik: kata tunggal + trigram karakter per kata (tahan typo ringan)."""
+    words = tokenize(topic)
+    shingles = set(words)
+    for word in words:
+        padded = f"#{word}#"
+        shingles.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return shingles
+
+
+def report_shingles(report_text: str, limit: int = REPORT_TERMS) -> Set[str]:
+    """Shingle report: kata-kata paling sering muncul yang mewakili isi report."""
+    counts = Counter(tokenize(report_text))
+    return {word for word, _ in counts.most_common(limit)}
+
+
+def _hash64(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def minhash(shingles: Iterable[str]) -> List[int]:
+    """Hitung signature MinHash untuk sekumpulan shingle."""
+    hashes = [_hash64(s) for s in shingles]
+    if not hashes:
+        return [_PRIME] * NUM_PERM
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def estimate_jaccard(sig_a: List[int], sig_b: List[int]) -> float:
+    """Perkiraan Jaccard similarity dari dua signature MinHash."""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def estimate_containment(sig_q: List[int], size_q: int, sig_r: List[int], size_r: int) -> float:
+    """Perkiraan |Q ∩ R| / |Q| berdasarkan Jaccard dan ukuran kedua himpunan."""
+    if size_q == 0:
+        return 0.0
+    j = estimate_jaccard(sig_q, sig_r)
+    intersection = j * (size_q + size_r) / (1 + j)
+    return min(1.0, intersection / size_q)
+
+
+class TopicIndex:
+    """Index MinHash/LSH untuk mencari signal dengan topik yang hampir sama."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.buckets: Dict[tuple, Set[str]] = defaultdict(set)
+        if path and path.exists():
+            try:
+                self.entries = json.loads(path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                self.entries = {}
+            for signal_id, entry in self.entries.items():
+                self._add_to_buckets(signal_id, entry["topic_sig"])
+
+    def _band_keys(self, signature: List[int]):
+        for band in range(BANDS):
+            yield (band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+
+    def _add_to_buckets(self, signal_id: str, signature: List[int]):
+        for key in self._band_keys(signature):
+            self.buckets[key].add(signal_id)
+
+    def _remove_from_buckets(self, signal_id: str, signature: List[int]):
+        for key in self._band_keys(signature):
+            bucket = self.buckets.get(key)
+            if bucket:
+                bucket.discard(signal_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def add(self, signal_id: str, topic: str, report_text: str = ""):
+        """Tambahkan (atau perbarui) satu signal ke index."""
+        if signal_id in self.entries:
+            self._remove_from_buckets(signal_id, self.entries[signal_id]["topic_sig"])
+        topic_set = topic_shingles(topic)
+        report_set = report_shingles(report_text) if report_text else set()
+        entry = {
+            "topic": topic,
+            "topic_sig": minhash(topic_set),
+            "report_sig": minhash(report_set) if report_set else [],
+            "report_size": len(report_set),
+        }
+        self.entries[signal_id] = entry
+        self._add_to_buckets(signal_id, entry["topic_sig"])
+
+    def remove(self, signal_id: str):
+        entry = self.entries.pop(signal_id, None)
+        if entry:
+            self._remove_from_buckets(signal_id, entry["topic_sig"])
+
+    def sync(self, signals: List[Dict]) -> bool:
+        """Index signal yang belum ada di index. Mengembalikan True jika index berubah."""
+        changed = False
+        known_ids = {s["id"] for s in signals}
+        for signal in signals:
+            if signal["id"] in self.entries:
+                continue
+            report_path = Path(signal.get("report_file") or "")
+            report_text = report_path.read_text(encoding="utf-8") if report_path.is_file() else ""
+            self.add(signal["id"], signal["topic"], report_text)
+            changed = True
+        for stale_id in [sid for sid in self.entries if sid not in known_ids]:
+            self.remove(stale_id)
+            changed = True
+        return changed
+
+    def query(self, topic: str, threshold: float, limit: int = 5) -> List[Dict]:
+        """Cari signal yang mirip dengan topik baru, diurutkan dari yang paling mirip."""
+        query_set = topic_shingles(topic)
+        query_sig = minhash(query_set)
+        query_words = set(tokenize(topic))
+        word_sig = minhash(query_words)
+
+        candidates = set()
+        for key in self._band_keys(query_sig):
+            candidates.update(self.buckets.get(key, ()))
+
+        matches = []
+        for signal_id in candidates:
+            entry = self.entries[signal_id]
+            topic_sim = estimate_jaccard(query_sig, entry["topic_sig"])
+            report_sim = 0.0
+            if entry["report_sig"]:
+                report_sim = estimate_containment(word_sig, len(query_words),
+                                                  entry["report_sig"], entry["report_size"])
+            # Report hanya memperkuat kandidat yang topiknya sudah mirip
+            similarity = max(topic_sim, (topic_sim + report_sim) / 2)
+            if similarity >= threshold:
+                matches.append({
+                    "signal_id": signal_id,
+                    "topic": entry["topic"],
+                    "similarity": round(similarity, 3),
+                    "topic_similarity": round(topic_sim, 3),
+                    "report_similarity": round(report_sim, 3),
+                })
+
+        matches.sort(key=lambda m: m["similarity"], reverse=True)
+        return matches[:limit]
+
+    def save(self):
+        if self.path:
+            self.path.write_text(json.dumps(self.entries), encoding="utf-8")
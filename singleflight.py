@@ -0,0 +1,68 @@
+# singleflight.py
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Gabungkan panggilan identik yang sedang berjalan menjadi satu.
+
+    Thread pertama untuk sebuah key menjalankan fungsinya; thread lain dengan key
+    yang sama menunggu dan menerima hasil (salinan) atau exception yang sama.
+    Key dilepas begitu panggilan selesai, jadi ini bukan cache: permintaan
+    berikutnya memanggil ulang.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Jalankan `func` sekali per key yang sedang berjalan. Return (hasil, dibagi?)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Salinan agar penerima tidak saling mengubah dict hasil LLM
+            return copy.deepcopy(call.result), True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        # Setelah key dilepas jumlah penunggu sudah final; aslinya dibiarkan utuh untuk mereka
+        return (copy.deepcopy(call.result) if call.waiters else call.result), False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+def normalize_topic(topic: str) -> str:
+    """Topik yang hanya beda huruf besar/spasi dianggap sama."""
+    return " ".join(topic.lower().split())
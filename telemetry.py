@@ -0,0 +1,275 @@
+# telemetry.py
+"""Telemetri per panggilan LLM: latensi, time-to-first-token, token, retry, dan estimasi biaya.
+
+Durasi render juga dicatat (`timed("render", ...)`) sebagai bahan `planner.py`.
+
+Client OpenAI dibungkus `instrument()` sehingga kode agent tetap memanggil
+`client.chat.completions.create(...)`. Setiap panggilan ditulis sebagai satu baris
+JSON ke `db/telemetry.jsonl` beserta tag dari `tags(...)` (operasi, jenis produk, topik).
+
+    python cli.py telemetry --since 24
+"""
+import contextlib
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import metrics
+import tracing
+
+TELEMETRY_PATH = Path(os.getenv("AUTOPRENEUR_TELEMETRY_PATH", str(Path("db") / "telemetry.jsonl")))
+USD_TO_IDR = float(os.getenv("AUTOPRENEUR_USD_IDR", "16000"))
+MAX_RETRIES = 3
+RETRY_BASE = 1.0
+
+# Harga USD per 1 juta token (input, output)
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+_tags: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("telemetry_tags", default={})
+_write_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def tags(**values) -> Iterator[None]:
+    """Tag yang ikut tercatat pada setiap panggilan LLM di dalam blok ini."""
+    token = _tags.set({**_tags.get(), **values})
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+
+@contextlib.contextmanager
+def timed(operation: str, **values) -> Iterator[None]:
+    """Catat durasi tahap non-LLM (mis. render) ke file telemetri yang sama, untuk dasar perencanaan."""
+    record: Dict[str, Any] = {"ts": time.time(), **_tags.get(), "operation": operation, **values}
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record["wall_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        write_record(record)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Estimasi biaya dalam USD, None jika harga model tidak diketahui."""
+    prices = next((p for name, p in sorted(MODEL_PRICES.items(), key=lambda kv: -len(kv[0]))
+                   if model.startswith(name)), None)
+    if prices is None:
+        return None
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+def write_record(record: Dict[str, Any], path: Optional[Path] = None):
+    path = path or TELEMETRY_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    # Satu write() per baris dengan mode append: aman dipakai bersama beberapa proses worker
+    with _write_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class _Choice:
+    def __init__(self, content: str, finish_reason: Optional[str]):
+        self.message = _Message(content)
+        self.finish_reason = finish_reason
+
+
+class _Response:
+    """Bentuk minimal ChatCompletion yang dipakai agent, disusun dari stream."""
+
+    def __init__(self, model: str, content: str, finish_reason: Optional[str], usage: Any):
+        self.model = model
+        self.choices = [_Choice(content, finish_reason)]
+        self.usage = usage
+
+
+def _retry_reason(error: Exception) -> Optional[str]:
+    """Penyebab error yang layak diulang (label metrik), None jika tidak bisa diulang."""
+    import openai
+    reasons = ((openai.RateLimitError, "rate_limit"), (openai.APITimeoutError, "timeout"),
+               (openai.APIConnectionError, "connection"), (openai.InternalServerError, "server"))
+    return next((reason for error_type, reason in reasons if isinstance(error, error_type)), None)
+
+
+class _Completions:
+    def __init__(self, client):
+        # Retry ditangani di sini agar jumlahnya tercatat
+        self._client = client.with_options(max_retries=0)
+
+    def create(self, **kwargs):
+        kwargs = {**kwargs, "stream": True, "stream_options": {"include_usage": True}}
+        record: Dict[str, Any] = {"ts": time.time(), "model": kwargs.get("model"), **_tags.get()}
+        with tracing.span("llm.call", model=kwargs.get("model")) as span:
+            try:
+                return self._create(kwargs, record)
+            finally:
+                span.set(**{k: record[k] for k in ("ttft_ms", "prompt_tokens", "completion_tokens",
+                                                   "retries", "finish_reason", "cost_idr") if k in record})
+
+    def _create(self, kwargs: Dict[str, Any], record: Dict[str, Any]):
+        started = time.perf_counter()
+        retries = 0
+        try:
+            while True:
+                try:
+                    attempt_started = time.perf_counter()
+                    stream = self._client.chat.completions.create(**kwargs)
+                    response = self._consume(stream, attempt_started, record)
+                    break
+                except Exception as e:
+                    reason = _retry_reason(e)
+                    if reason == "rate_limit":
+                        metrics.LLM_RATE_LIMITED.inc()
+                    if retries >= MAX_RETRIES or reason is None:
+                        raise
+                    retries += 1
+                    metrics.LLM_RETRIES.inc(reason)
+                    time.sleep(RETRY_BASE * (2 ** (retries - 1)) * random.uniform(0.8, 1.2))
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["wall_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            record["retries"] = retries
+            write_record(record)
+            _observe(record)
+        return response
+
+    @staticmethod
+    def _consume(stream, attempt_started: float, record: Dict[str, Any]) -> _Response:
+        parts: List[str] = []
+        finish_reason = None
+        usage = None
+        model = record.get("model")
+        for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            model = chunk.model or model
+            for choice in chunk.choices:
+                if choice.delta and choice.delta.content:
+                    if "ttft_ms" not in record:
+                        record["ttft_ms"] = round((time.perf_counter() - attempt_started) * 1000, 1)
+                    parts.append(choice.delta.content)
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+
+        record["model"] = model
+        record["finish_reason"] = finish_reason
+        if usage is not None:
+            record["prompt_tokens"] = usage.prompt_tokens
+            record["completion_tokens"] = usage.completion_tokens
+            cost = estimate_cost(model or "", usage.prompt_tokens, usage.completion_tokens)
+            if cost is not None:
+                record["cost_usd"] = round(cost, 6)
+                record["cost_idr"] = round(cost * USD_TO_IDR, 2)
+        return _Response(model, "".join(parts), finish_reason, usage)
+
+
+def _observe(record: Dict[str, Any]):
+    operation = record.get("operation", "-")
+    if "error" in record:
+        outcome = "error"
+    elif record.get("finish_reason") == "length":
+        outcome = "truncated"
+    else:
+        outcome = "ok"
+    metrics.LLM_REQUESTS.inc(operation, outcome)
+    metrics.LLM_SECONDS.observe(record["wall_ms"] / 1000, operation)
+    if "prompt_tokens" in record:
+        metrics.LLM_TOKENS.inc("prompt", amount=record["prompt_tokens"])
+        metrics.LLM_TOKENS.inc("completion", amount=record["completion_tokens"])
+
+
+class _Chat:
+    def __init__(self, client):
+        self.completions = _Completions(client)
+
+
+class InstrumentedClient:
+    """Pembungkus client OpenAI yang mencatat telemetri `chat.completions.create`."""
+
+    def __init__(self, client):
+        self._client = client
+        self.chat = _Chat(client)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def instrument(client) -> InstrumentedClient:
+    return InstrumentedClient(client)
+
+
+# --- RINGKASAN ---
+def load_records(path: Optional[Path] = None, since: Optional[float] = None) -> List[Dict[str, Any]]:
+    path = path or TELEMETRY_PATH
+    if not path.exists():
+        return []
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # baris terakhir mungkin sedang ditulis
+            if since is None or record.get("ts", 0) >= since:
+                records.append(record)
+    return records
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Persentil nearest-rank; None untuk daftar kosong."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Statistik per (operasi, jenis produk), diurutkan dari total biaya terbesar."""
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for record in records:
+        key = (record.get("operation", "-"), record.get("product_type") or "-")
+        groups.setdefault(key, []).append(record)
+
+    rows = []
+    for (operation, product_type), items in groups.items():
+        wall = [r["wall_ms"] for r in items if "wall_ms" in r]
+        ttft = [r["ttft_ms"] for r in items if "ttft_ms" in r]
+        completion = [r.get("completion_tokens", 0) for r in items]
+        rows.append({
+            "operation": operation,
+            "product_type": product_type,
+            "calls": len(items),
+            "errors": sum(1 for r in items if "error" in r),
+            "retries": sum(r.get("retries", 0) for r in items),
+            "truncated": sum(1 for r in items if r.get("finish_reason") == "length"),
+            "wall_p50_ms": percentile(wall, 50),
+            "wall_p90_ms": percentile(wall, 90),
+            "wall_p99_ms": percentile(wall, 99),
+            "ttft_p50_ms": percentile(ttft, 50),
+            "prompt_tokens": sum(r.get("prompt_tokens", 0) for r in items),
+            "completion_tokens": sum(completion),
+            "completion_tokens_avg": round(sum(completion) / len(items), 1),
+            "cost_usd": round(sum(r.get("cost_usd", 0) for r in items), 6),
+            "cost_idr": round(sum(r.get("cost_idr", 0) for r in items), 2),
+        })
+    return sorted(rows, key=lambda r: -r["cost_usd"])
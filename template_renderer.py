@@ -1,25 +1,73 @@
 # template_renderer.py
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from weasyprint import HTML
 from pathlib import Path
 import json
 from typing import Dict, Any, List
 
+import metrics
+import scheduler
+import schemas
+import telemetry
+import tracing
+
 class TemplateRenderer:
     """Centralized template rendering system for all product types."""
     
+    SUITES = {
+        "umkm_productivity": ["content_calendar", "caption_bank", "invoice_macro"],
+        "shopee_toolkit": ["keyword_tracker", "hashtag_clusterer", "copy_swipes"],
+        "canva_assets": ["batik_patterns", "brand_kit", "capcut_templates"],
+        "finance_pack": ["pajak_calculator", "cash_flow", "sop_templates"],
+        "seasonal": ["ramadan_calendar", "wedding_planner", "yearend_planner"]
+    }
+    
+    TEMPLATES = {
+        # UMKM Productivity Suite
+        "content_calendar": "umkm_productivity/content_calendar.html",
+        "caption_bank": "umkm_productivity/caption_bank.html",
+        "invoice_macro": "umkm_productivity/invoice_macro.html",
+        
+        # Shopee Toolkit
+        "keyword_tracker": "shopee_toolkit/keyword_tracker.html",
+        "hashtag_clusterer": "shopee_toolkit/hashtag_clusterer.html",
+        "copy_swipes": "shopee_toolkit/copy_swipes.html",
+        
+        # Canva Assets
+        "batik_patterns": "canva_assets/batik_patterns.html",
+        "brand_kit": "canva_assets/brand_kit.html",
+        "capcut_templates": "canva_assets/capcut_templates.html",
+        
+        # Finance Pack
+        "pajak_calculator": "finance_pack/pajak_calculator.html",
+        "cash_flow": "finance_pack/cash_flow.html",
+        "sop_templates": "finance_pack/sop_templates.html",
+        
+        # Seasonal
+        "ramadan_calendar": "seasonal/ramadan_calendar.html",
+        "wedding_planner": "seasonal/wedding_planner.html",
+        "yearend_planner": "seasonal/yearend_planner.html",
+    }
+    
     def __init__(self, template_dir: str = "templates"):
-        self.env = Environment(
-            loader=FileSystemLoader(template_dir),
-            autoescape=select_autoescape(["html"]),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
-        
-        # Register custom filters
-        self.env.filters['number_format'] = self.number_format
-        self.env.filters['currency_format'] = self.currency_format
+        self.template_dir = template_dir
+        self._env = None
+
+    @property
+    def env(self):
+        """Environment Jinja2, dibuat saat render pertama (validasi & SUITES tidak butuh jinja2)."""
+        if self._env is None:
+            from jinja2 import Environment, FileSystemLoader, select_autoescape
+            self._env = Environment(
+                loader=FileSystemLoader(self.template_dir),
+                autoescape=select_autoescape(["html"]),
+                trim_blocks=True,
+                lstrip_blocks=True
+            )
+            
+            # Register custom filters
+            self._env.filters['number_format'] = self.number_format
+            self._env.filters['currency_format'] = self.currency_format
+        return self._env
         
     def number_format(self, value: float) -> str:
         """Format numbers with thousand separators."""
@@ -35,66 +83,46 @@ class TemplateRenderer:
         except:
             return f"Rp {value}"
     
+    @tracing.traced("render.product", "product_type")
     def render_product(self, product_type: str, data: Dict[str, Any], output_folder: Path) -> Dict[str, Path]:
         """Render product based on type and return paths to generated files."""
         
-        template_map = {
-            # UMKM Productivity Suite
-            "content_calendar": "umkm_productivity/content_calendar.html",
-            "caption_bank": "umkm_productivity/caption_bank.html",
-            "invoice_macro": "umkm_productivity/invoice_macro.html",
+        if product_type not in self.TEMPLATES:
+            raise ValueError(f"No template found for product type: {product_type}")
+        
+        with scheduler.slot("render"), metrics.RENDER_SECONDS.time(product_type), \
+                telemetry.timed("render", product_type=product_type):
+            # Get template
+            template = self.env.get_template(self.TEMPLATES[product_type])
             
-            # Shopee Toolkit
-            "keyword_tracker": "shopee_toolkit/keyword_tracker.html",
-            "hashtag_clusterer": "shopee_toolkit/hashtag_clusterer.html",
-            "copy_swipes": "shopee_toolkit/copy_swipes.html",
+            # Render HTML
+            with tracing.span("render.jinja", template=product_type):
+                html_content = template.render(**data)
             
-            # Canva Assets
-            "batik_patterns": "canva_assets/batik_patterns.html",
-            "brand_kit": "canva_assets/brand_kit.html",
-            "capcut_templates": "canva_assets/capcut_templates.html",
+            # Create output paths
+            output_folder.mkdir(parents=True, exist_ok=True)
+            pdf_path = output_folder / f"{product_type}.pdf"
+            html_path = output_folder / f"{product_type}.html"
+            json_path = output_folder / f"{product_type}_data.json"
             
-            # Finance Pack
-            "pajak_calculator": "finance_pack/pajak_calculator.html",
-            "cash_flow": "finance_pack/cash_flow.html",
-            "sop_templates": "finance_pack/sop_templates.html",
+            # Generate PDF
+            try:
+                with tracing.span("render.weasyprint", template=product_type):
+                    # WeasyPrint (Pango, cairo, fonttools) baru dimuat saat PDF pertama dibuat
+                    from weasyprint import HTML
+                    HTML(string=html_content).write_pdf(pdf_path)
+                print(f"✅ PDF generated: {pdf_path}")
+            except Exception as e:
+                print(f"⚠️ PDF generation failed: {e}")
+                pdf_path = None
             
-            # Seasonal
-            "ramadan_calendar": "seasonal/ramadan_calendar.html",
-            "wedding_planner": "seasonal/wedding_planner.html",
-            "yearend_planner": "seasonal/yearend_planner.html",
-        }
-        
-        if product_type not in template_map:
-            raise ValueError(f"No template found for product type: {product_type}")
-        
-        # Get template
-        template = self.env.get_template(template_map[product_type])
-        
-        # Render HTML
-        html_content = template.render(**data)
-        
-        # Create output paths
-        output_folder.mkdir(parents=True, exist_ok=True)
-        pdf_path = output_folder / f"{product_type}.pdf"
-        html_path = output_folder / f"{product_type}.html"
-        json_path = output_folder / f"{product_type}_data.json"
-        
-        # Generate PDF
-        try:
-            HTML(string=html_content).write_pdf(pdf_path)
-            print(f"✅ PDF generated: {pdf_path}")
-        except Exception as e:
-            print(f"⚠️ PDF generation failed: {e}")
-            pdf_path = None
-        
-        # Save HTML for preview
-        html_path.write_text(html_content, encoding="utf-8")
-        print(f"✅ HTML saved: {html_path}")
-        
-        # Save JSON data
-        json_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-        print(f"✅ JSON data saved: {json_path}")
+            # Save HTML for preview
+            html_path.write_text(html_content, encoding="utf-8")
+            print(f"✅ HTML saved: {html_path}")
+            
+            # Save JSON data
+            json_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+            print(f"✅ JSON data saved: {json_path}")
         
         return {
             "pdf": pdf_path,
@@ -102,16 +130,40 @@ class TemplateRenderer:
             "json": json_path
         }
     
-    def render_suite(self, suite_type: str, suite_data: Dict[str, Dict[str, Any]], output_folder: Path) -> Dict[str, Dict[str, Path]]:
-        """Render complete product suite."""
+    def rendered_outputs(self, product_type: str, data: Dict[str, Any], output_folder: Path):
+        """Return existing output paths if a previous render of the same data is complete."""
+        
+        pdf_path = output_folder / f"{product_type}.pdf"
+        html_path = output_folder / f"{product_type}.html"
+        json_path = output_folder / f"{product_type}_data.json"
+        for path in (pdf_path, html_path, json_path):
+            if not path.exists() or path.stat().st_size == 0:
+                return None
+        try:
+            if json.loads(json_path.read_text(encoding="utf-8")) != data:
+                return None
+        except json.JSONDecodeError:
+            return None
+        return {"pdf": pdf_path, "html": html_path, "json": json_path}
+    
+    def render_suite(self, suite_type: str, suite_data: Dict[str, Dict[str, Any]], output_folder: Path,
+                     resume: bool = False) -> Dict[str, Dict[str, Path]]:
+        """Render complete product suite. With resume=True, products already rendered are skipped."""
         
         suite_results = {}
         suite_folder = output_folder / suite_type
         suite_folder.mkdir(parents=True, exist_ok=True)
         
         for product_type, product_data in suite_data.items():
-            print(f"\n📄 Rendering {product_type}...")
             product_folder = suite_folder / product_type
+            if resume:
+                existing = self.rendered_outputs(product_type, product_data, product_folder)
+                if existing:
+                    print(f"\n♻️  {product_type} sudah dirender, dilewati.")
+                    suite_results[product_type] = existing
+                    continue
+            
+            print(f"\n📄 Rendering {product_type}...")
             
             try:
                 files = self.render_product(product_type, product_data, product_folder)
@@ -137,41 +189,9 @@ class TemplateRenderer:
     def get_available_templates(self) -> Dict[str, List[str]]:
         """Get list of available templates organized by suite."""
         
-        return {
-            "umkm_productivity": ["content_calendar", "caption_bank", "invoice_macro"],
-            "shopee_toolkit": ["keyword_tracker", "hashtag_clusterer", "copy_swipes"],
-            "canva_assets": ["batik_patterns", "brand_kit", "capcut_templates"],
-            "finance_pack": ["pajak_calculator", "cash_flow", "sop_templates"],
-            "seasonal": ["ramadan_calendar", "wedding_planner", "yearend_planner"]
-        }
+        return {suite: list(products) for suite, products in self.SUITES.items()}
     
     def validate_template_data(self, product_type: str, data: Dict[str, Any]) -> List[str]:
-        """Validate required fields for each template type."""
-        
-        required_fields = {
-            "content_calendar": ["name", "description", "month", "year", "calendar_weeks"],
-            "caption_bank": ["name", "description", "captions"],
-            "invoice_macro": ["name", "description", "invoices"],
-            "keyword_tracker": ["name", "description", "report_date", "shop_name", "keywords", "recommendations"],
-            "hashtag_clusterer": ["name", "description", "clusters", "usage_guide", "monthly_calendar"],
-            "copy_swipes": ["name", "description", "categories", "swipe_sections", "usage_tips"],
-            "batik_patterns": ["name", "description", "patterns", "usage_examples", "license_terms"],
-            "brand_kit": ["name", "description", "logos", "colors", "fonts", "templates", "guidelines"],
-            "capcut_templates": ["name", "description", "categories", "templates", "tutorial_steps"],
-            "pajak_calculator": ["name", "description", "sample_data", "tax_rules", "tax_tips", "tax_deadlines"],
-            "cash_flow": ["name", "description", "summary", "transactions", "income_categories", "expense_categories", "projections"],
-            "sop_templates": ["name", "description", "sop_categories", "sop_documents", "version", "last_updated"],
-            "ramadan_calendar": ["name", "description", "location", "current_date", "prayer_times", "calendar_days", "content_categories", "popular_hashtags", "special_days"],
-            "wedding_planner": ["name", "description", "couple_names", "wedding_date", "total_budget", "budget_items", "timeline", "vendors", "guest_stats", "guest_list", "todo_columns", "important_notes"],
-            "yearend_planner": ["name", "description", "year", "achievements", "goal_categories", "monthly_breakdown", "habits", "visions", "reflection_prompts"]
-        }
-        
-        if product_type not in required_fields:
-            return [f"Unknown product type: {product_type}"]
-        
-        missing_fields = []
-        for field in required_fields[product_type]:
-            if field not in data:
-                missing_fields.append(f"Missing required field: {field}")
+        """Validate template data against the product schema (see schemas.py)."""
         
-        return missing_fields
\ No newline at end of file
+        return schemas.validate_template_data(product_type, data)
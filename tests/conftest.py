@@ -0,0 +1,6 @@
+# tests/conftest.py
+"""Modul Autopreneur ada di root repo (bukan package), jadi root dimasukkan ke sys.path."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,51 @@
+# tests/test_calendar_scaffold.py
+from datetime import date
+
+import pytest
+
+from calendar_scaffold import (CALENDAR_WEEKS, PLANNER_MONTHS, build_content_calendar,
+                               build_yearend_planner, slot_errors, yearend_slot_errors)
+
+
+def months(n):
+    return [{"focus": f"Fokus {i}", "tasks": [f"Tugas {i}"]} for i in range(n)]
+
+
+def weeks(n, days=7):
+    return [{"theme": "Tema", "hashtags": ["#umkm"],
+             "days": [{"content_type": "Educational", "idea": "Ide"}] * days} for _ in range(n)]
+
+
+def test_yearend_labels_january_to_december_of_plan_year():
+    data = build_yearend_planner({"monthly_breakdown": months(PLANNER_MONTHS)}, today=date(2026, 10, 19))
+    assert data["year"] == 2026
+    names = [month["name"] for month in data["monthly_breakdown"]]
+    assert names[0] == "Januari 2027" and names[-1] == "Desember 2027"
+    assert data["monthly_breakdown"][11]["focus"] == "Fokus 11"
+
+
+@pytest.mark.parametrize("count", [0, 11, 13])
+def test_yearend_wrong_month_count_is_slot_error(count):
+    data = {"monthly_breakdown": months(count)}
+    assert yearend_slot_errors(data) == [f"monthly_breakdown: harus 12 bulan, ada {count}"]
+    with pytest.raises(ValueError, match="Slot planner tidak lengkap"):
+        build_yearend_planner(data, today=date(2026, 10, 19))
+
+
+def test_yearend_missing_breakdown_left_to_schema_validation():
+    assert yearend_slot_errors({}) == []
+    assert build_yearend_planner({}, today=date(2026, 3, 1)) == {"year": 2025}
+
+
+def test_content_calendar_short_weeks_and_days():
+    data = {"weeks": weeks(CALENDAR_WEEKS - 1) + weeks(1, days=5)}
+    assert slot_errors(data) == ["weeks[3].days: harus 7 hari, hanya 5"]
+    assert slot_errors({"weeks": weeks(2)}) == ["weeks: harus 4 minggu, hanya 2"]
+    with pytest.raises(ValueError, match="Slot kalender tidak lengkap"):
+        build_content_calendar(data, start=date(2026, 10, 19))
+
+
+def test_content_calendar_fills_dates():
+    data = build_content_calendar({"weeks": weeks(CALENDAR_WEEKS)}, start=date(2026, 10, 19))
+    assert data["month"] == "November" and data["year"] == 2026
+    assert data["calendar_weeks"][0]["days"][0]["date"] == "Senin, 19 Okt"
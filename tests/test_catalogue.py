@@ -0,0 +1,90 @@
+# tests/test_catalogue.py
+import json
+
+import pytest
+
+from catalogue import ProductCatalogue
+
+
+def product(i, **fields):
+    return {"id": f"prod_{i:02d}", "name": f"Produk {i:02d}", "product_type": "caption_bank",
+            "suite": "umkm_productivity", "created_at": 1000.0 + i, **fields}
+
+
+def write_products(path, products):
+    path.write_text(json.dumps(products, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+@pytest.fixture
+def db(tmp_path):
+    return tmp_path / "products.json"
+
+
+def all_pages(catalogue, page_size, **filters):
+    ids, cursor = [], None
+    while True:
+        page = catalogue.page(cursor, page_size, **filters)
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_pages_cover_every_product_once(db, tmp_path):
+    write_products(db, [product(i) for i in range(7)])
+    catalogue = ProductCatalogue(db, tmp_path / "index.json")
+    assert all_pages(catalogue, 3) == [f"prod_{i:02d}" for i in reversed(range(7))]
+    assert all_pages(catalogue, 3, sort="terlama") == [f"prod_{i:02d}" for i in range(7)]
+
+
+def test_cursor_is_stable_when_newer_products_arrive(db, tmp_path):
+    write_products(db, [product(i) for i in range(6)])
+    catalogue = ProductCatalogue(db, tmp_path / "index.json")
+    first = catalogue.page(None, 3)
+    assert [p["id"] for p in first["items"]] == ["prod_05", "prod_04", "prod_03"]
+
+    # Produk baru (lebih baru) tidak menggeser halaman berikutnya seperti pada offset
+    write_products(db, [product(i) for i in range(6)] + [product(9)])
+    second = catalogue.page(first["next_cursor"], 3)
+    assert [p["id"] for p in second["items"]] == ["prod_02", "prod_01", "prod_00"]
+    assert second["next_cursor"] is None
+
+
+def test_name_sort_breaks_ties_by_id(db, tmp_path):
+    write_products(db, [product(i, name="Sama") for i in range(5)] + [product(9, name="awal")])
+    catalogue = ProductCatalogue(db, tmp_path / "index.json")
+    assert all_pages(catalogue, 2, sort="nama") == ["prod_09", "prod_00", "prod_01", "prod_02",
+                                                     "prod_03", "prod_04"]
+
+
+def test_filters_and_legacy_products(db, tmp_path):
+    legacy = {"id": "old", "name": "Lama", "created_at": 1.0}
+    write_products(db, [product(0), product(1, product_type="invoice_macro"), legacy])
+    catalogue = ProductCatalogue(db, tmp_path / "index.json")
+    page = catalogue.page(product_type="caption_bank")
+    assert [p["id"] for p in page["items"]] == ["prod_00", "old"]
+    assert page["items"][1]["suite"] == "umkm_productivity"
+    assert catalogue.product_types() == ["caption_bank", "invoice_macro"]
+
+
+def test_index_is_reused_until_products_change(db, tmp_path):
+    index_path = tmp_path / "index.json"
+    write_products(db, [product(0), product(1)])
+    ProductCatalogue(db, index_path).refresh()
+    stored = json.loads(index_path.read_text(encoding="utf-8"))
+    assert [row[0] for row in stored["rows"]] == ["prod_00", "prod_01"]
+
+    # Record dibaca dari offset index, jadi index yang masih berlaku tidak dibangun ulang
+    catalogue = ProductCatalogue(db, index_path)
+    catalogue._build_rows = lambda: pytest.fail("index dibangun ulang")
+    assert catalogue.page()["total"] == 2
+
+
+def test_corrupt_products_file_is_not_indexed(db, tmp_path, capsys):
+    index_path = tmp_path / "index.json"
+    text = json.dumps([product(0), product(1)], indent=2)
+    db.write_text(text[:text.rfind("{")] + "{\"id\": ", encoding="utf-8")
+    catalogue = ProductCatalogue(db, index_path)
+    assert [p["id"] for p in catalogue.page()["items"]] == ["prod_00"]
+    assert not index_path.exists()
+    assert "korup" in capsys.readouterr().out
@@ -0,0 +1,65 @@
+# tests/test_checkpoint.py
+import os
+
+import checkpoint
+from checkpoint import SuiteCheckpoint
+
+
+def create(root, run_id="run_1", validator=None):
+    return SuiteCheckpoint.create(root, "umkm_productivity", "kopi susu", "sig_1", "prod_1",
+                                  run_id=run_id, validator=validator)
+
+
+def test_resume_keeps_saved_products(tmp_path):
+    run = create(tmp_path)
+    run.save("caption_bank", {"name": "Caption"})
+    run.save("content_calendar", {"name": "Kalender"})
+
+    resumed = SuiteCheckpoint.open(tmp_path, "run_1")
+    assert resumed.meta["product_id"] == "prod_1"
+    assert resumed.completed_products() == ["caption_bank", "content_calendar"]
+    assert resumed.load("caption_bank") == {"name": "Caption"}
+    assert resumed.load("invoice_macro") is None
+    assert SuiteCheckpoint.open(tmp_path, "run_missing") is None
+
+
+def test_corrupt_or_invalid_data_is_regenerated(tmp_path):
+    run = create(tmp_path, validator=lambda product_type, data: [] if "name" in data else ["no name"])
+    run.save("caption_bank", {"name": "ok"})
+    run.save("content_calendar", {"title": "tanpa name"})
+    (run.data_dir / "invoice_macro.json").write_text('{"name": "terpo', encoding="utf-8")
+    assert run.completed_products() == ["caption_bank"]
+
+
+def test_list_incomplete_skips_complete_and_active_runs(tmp_path, monkeypatch):
+    done = create(tmp_path, "run_done")
+    done.mark("complete")
+    stale = create(tmp_path, "run_stale")
+    stale.mark("running", owner={"host": checkpoint.socket.gethostname(), "pid": 999999})
+    active = create(tmp_path, "run_active")
+    active.claim()
+    failed = create(tmp_path, "run_failed")
+    failed.mark("failed", error="boom")
+    monkeypatch.setattr(checkpoint, "_pid_alive", lambda pid: pid == os.getpid())
+
+    ids = [r.run_id for r in SuiteCheckpoint.list_incomplete(tmp_path)]
+    assert ids == ["run_stale", "run_failed"]
+    ids = [r.run_id for r in SuiteCheckpoint.list_incomplete(tmp_path, include_active=True)]
+    assert ids == ["run_stale", "run_active", "run_failed"]
+
+
+def test_claim_records_owner(tmp_path):
+    run = create(tmp_path)
+    assert not run.is_active()  # run lama tanpa pemilik dianggap terhenti
+    run.claim()
+    reopened = SuiteCheckpoint.open(tmp_path, "run_1")
+    assert reopened.meta["owner"]["pid"] == os.getpid()
+    assert reopened.is_active()
+    reopened.mark("complete")
+    assert not reopened.is_active()
+
+
+def test_owner_on_other_host_counts_as_active(tmp_path):
+    run = create(tmp_path)
+    run.mark("running", owner={"host": "host-lain", "pid": 1})
+    assert run.is_active()
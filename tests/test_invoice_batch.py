@@ -0,0 +1,129 @@
+# tests/test_invoice_batch.py
+from concurrent.futures import Future
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+import invoice_batch
+from invoice_batch import InvoiceError, build_invoice, invoice_filename, parse_amount
+
+HEADER = "number,client_name,description,quantity,price\n"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Rp 85.000", Decimal("85000")),
+    ("15.000,50", Decimal("15000.50")),
+    ("15,5", Decimal("15.5")),
+    ("15000.50", Decimal("15000.50")),
+    ("1,250,000", Decimal("1250000")),
+    ("15000", Decimal("15000")),
+])
+def test_parse_amount(text, expected):
+    assert parse_amount(text) == expected
+
+
+def test_parse_amount_rejects_garbage():
+    with pytest.raises(InvoiceError):
+        parse_amount("gratis")
+
+
+def test_build_invoice_totals_with_ppn():
+    rows = [
+        {"client_name": "Budi", "description": "Kopi Susu 1L", "quantity": "2", "price": "Rp 85.000"},
+        {"client_name": "Budi", "description": "Gula Aren", "quantity": "3", "price": "12.345,67"},
+    ]
+    invoice = build_invoice("INV/1", rows, {}, today=date(2026, 10, 1))
+    assert [item["total"] for item in invoice["items"]] == [170000.0, 37037.01]
+    assert invoice["subtotal"] == 207037.01
+    # 11% dari 207.037,01 = 22.774,0711 → dibulatkan ke sen
+    assert invoice["tax"] == 22774.07
+    assert invoice["total"] == 229811.08
+    assert invoice["date"] == "1 Oktober 2026"
+    assert invoice["due_date"] == "15 Oktober 2026"
+
+
+def test_invoice_filename_is_injective():
+    assert invoice_filename("INV-1") == "INV-1.pdf"
+    assert invoice_filename("INV/1") != invoice_filename("INV-1")
+    assert invoice_filename("INV/1") != invoice_filename("INV 1")
+    assert invoice_filename("INV/1").startswith("INV-1-")
+
+
+class InlinePool:
+    """Pengganti ProcessPoolExecutor: render dijalankan langsung di proses test."""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    calls = []
+
+    def fake_render(invoice, pdf_path, name):
+        calls.append(invoice["number"])
+        with open(pdf_path, "w", encoding="utf-8") as f:
+            f.write(invoice["date"])
+        return 0.0
+
+    monkeypatch.setattr("concurrent.futures.ProcessPoolExecutor", InlinePool)
+    monkeypatch.setattr(invoice_batch, "render_invoice", fake_render)
+    return calls
+
+
+def test_rerun_skips_finished_invoices_on_another_day(tmp_path, rendered):
+    csv_path = tmp_path / "pesanan.csv"
+    csv_path.write_text(HEADER + "INV-1,Budi,Kopi,1,10.000\nINV-2,Sari,Teh,2,5.000\n", encoding="utf-8")
+    out_dir = tmp_path / "out"
+
+    first = invoice_batch.run(csv_path, out_dir, {}, workers=1, today=date(2026, 10, 1))
+    assert (first["rendered"], first["skipped"]) == (2, 0)
+
+    # Tanggal terbit diambil dari progress.jsonl, bukan hari ini
+    second = invoice_batch.run(csv_path, out_dir, {}, workers=1, today=date(2026, 10, 2))
+    assert (second["rendered"], second["skipped"]) == (0, 2)
+
+    csv_path.write_text(HEADER + "INV-1,Budi,Kopi,1,10.000\nINV-2,Sari,Teh,3,5.000\n", encoding="utf-8")
+    third = invoice_batch.run(csv_path, out_dir, {}, workers=1)
+    assert (third["rendered"], third["skipped"]) == (1, 1)
+    assert rendered == ["INV-1", "INV-2", "INV-2"]
+    assert (out_dir / "INV-2.pdf").read_text(encoding="utf-8") == "1 Oktober 2026"
+
+
+def test_restart_renders_everything_again(tmp_path, rendered):
+    csv_path = tmp_path / "pesanan.csv"
+    csv_path.write_text(HEADER + "INV-1,Budi,Kopi,1,10.000\n", encoding="utf-8")
+    out_dir = tmp_path / "out"
+    invoice_batch.run(csv_path, out_dir, {}, workers=1, today=date(2026, 10, 1))
+    summary = invoice_batch.run(csv_path, out_dir, {}, workers=1, restart=True, today=date(2026, 10, 2))
+    assert summary["rendered"] == 1
+    assert (out_dir / "INV-1.pdf").read_text(encoding="utf-8") == "2 Oktober 2026"
+
+
+def test_bad_rows_fail_only_their_invoice(tmp_path, rendered):
+    csv_path = tmp_path / "pesanan.csv"
+    csv_path.write_text(HEADER + "INV-1,Budi,Kopi,1,10.000\nINV-2,Sari,Teh,dua,5.000\n", encoding="utf-8")
+    summary = invoice_batch.run(csv_path, tmp_path / "out", {}, workers=1)
+    assert (summary["rendered"], summary["failed"]) == (1, 1)
+    assert "INV-2" in summary["errors"]
+
+
+def test_file_name_clash_fails_second_invoice(tmp_path, rendered):
+    csv_path = tmp_path / "pesanan.csv"
+    csv_path.write_text(HEADER + "INV-1,Budi,Kopi,1,10.000\ninv-1,Sari,Teh,1,5.000\n", encoding="utf-8")
+    summary = invoice_batch.run(csv_path, tmp_path / "out", {}, workers=1)
+    assert (summary["rendered"], summary["failed"]) == (1, 1)
+    assert rendered == ["INV-1"]
+    assert "INV-1" in summary["errors"]["inv-1"]
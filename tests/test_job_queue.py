@@ -0,0 +1,92 @@
+# tests/test_job_queue.py
+import pytest
+
+import job_queue
+from job_queue import BACKOFF_BASE, BACKOFF_MAX, JobQueue, backoff_delay
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(tmp_path / "jobs.sqlite3")
+    yield q
+    q.close()
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(job_queue.random, "uniform", lambda low, high: 1.0)
+
+
+def test_backoff_is_exponential_and_capped(no_jitter):
+    assert [backoff_delay(n) for n in (1, 2, 3)] == [BACKOFF_BASE, 2 * BACKOFF_BASE, 4 * BACKOFF_BASE]
+    assert backoff_delay(30) == BACKOFF_MAX
+
+
+def test_backoff_jitter_stays_within_twenty_percent():
+    for _ in range(50):
+        assert 0.8 * BACKOFF_BASE <= backoff_delay(1) <= 1.2 * BACKOFF_BASE
+
+
+def test_claim_takes_highest_priority_and_leases_it(queue):
+    low = queue.submit("scan", {"topic": "a"})
+    high = queue.submit("scan", {"topic": "b"}, priority=5)
+    job = queue.claim("w1", lease_seconds=60)
+    assert (job["id"], job["status"], job["attempts"]) == (high, "running", 1)
+    assert queue.claim("w2", lease_seconds=60)["id"] == low
+    assert queue.claim("w3", lease_seconds=60) is None
+
+
+def test_unknown_kind_is_rejected(queue):
+    with pytest.raises(ValueError):
+        queue.submit("mine_bitcoin", {})
+
+
+def test_expired_lease_is_requeued_with_backoff(queue, monkeypatch):
+    job_id = queue.submit("scan", {"topic": "a"})
+    queue.claim("crashed", lease_seconds=-1)
+    monkeypatch.setattr(job_queue, "backoff_delay", lambda attempts: 0.0)
+
+    job = queue.claim("w2", lease_seconds=60)
+    assert (job["id"], job["attempts"]) == (job_id, 2)
+    # Worker lama tidak bisa lagi memperpanjang atau menyelesaikan job
+    assert not queue.heartbeat(job_id, "crashed", 60)
+    assert not queue.complete(job_id, "crashed", {})
+    assert queue.complete(job_id, "w2", {"ok": True})
+    assert queue.get(job_id)["result"] == {"ok": True}
+
+
+def test_expired_lease_waits_for_backoff(queue):
+    job_id = queue.submit("scan", {"topic": "a"})
+    queue.claim("crashed", lease_seconds=-1)
+    assert queue.claim("w2", lease_seconds=60) is None
+    job = queue.get(job_id)
+    assert (job["status"], job["last_error"]) == ("queued", "lease expired")
+
+
+def test_expired_lease_on_last_attempt_goes_dead(queue):
+    job_id = queue.submit("scan", {"topic": "a"}, max_attempts=1)
+    queue.claim("crashed", lease_seconds=-1)
+    assert queue.claim("w2", lease_seconds=60) is None
+    assert queue.get(job_id)["status"] == "dead"
+    assert queue.retry_dead(job_id) == 1
+    assert queue.claim("w2", lease_seconds=60)["id"] == job_id
+
+
+def test_fail_retries_then_dead_letters(queue, monkeypatch):
+    monkeypatch.setattr(job_queue, "backoff_delay", lambda attempts: 0.0)
+    job_id = queue.submit("scan", {"topic": "a"}, max_attempts=2)
+    queue.claim("w1", 60)
+    assert queue.fail(job_id, "w1", "boom") == "queued"
+    queue.claim("w1", 60)
+    assert queue.fail(job_id, "w1", "boom") == "dead"
+    assert queue.fail(job_id, "w1", "boom") == "lost"
+    assert queue.stats() == {"dead": 1}
+
+
+def test_release_does_not_count_an_attempt(queue):
+    job_id = queue.submit("scan", {"topic": "a"})
+    queue.claim("w1", 60)
+    queue.release(job_id, "w1")
+    job = queue.get(job_id)
+    assert (job["status"], job["attempts"]) == ("queued", 0)
+    assert queue.claim("w2", 60)["attempts"] == 1
@@ -0,0 +1,56 @@
+# tests/test_json_repair.py
+import pytest
+
+from json_repair import JsonRepairError, loads, repair
+
+
+def test_valid_json_takes_fast_path():
+    result = loads('{"a": [1, 2]}')
+    assert result.value == {"a": [1, 2]}
+    assert result.complete and not result.repaired
+
+
+def test_truncated_string_drops_last_element():
+    result = loads('{"name": "Bank", "captions": [{"day": 1, "text": "a"}, {"day": 2, "text": "terpo')
+    assert result.value == {"name": "Bank", "captions": [{"day": 1, "text": "a"}]}
+    assert result.truncated == ["captions[1].text", "captions[1]", "captions", ""]
+    assert result.truncated_sections() == ["captions"]
+    assert not result.complete
+
+
+def test_truncated_number_and_key_without_value():
+    assert loads('{"a": "x", "b": 12').value == {"a": "x"}
+    result = loads('{"a": "x", "b":')
+    assert result.value == {"a": "x"}
+    assert result.truncated_sections() == ["b"]
+
+
+def test_truncated_top_level_array():
+    result = loads("[1, 2")
+    assert result.value == [1]
+    assert result.truncated_sections() == []
+    assert not result.complete
+
+
+def test_code_fence_and_trailing_commas():
+    result = loads('```json\n{"a": [1, 2,], "b": 3,}\n```')
+    assert result.value == {"a": [1, 2], "b": 3}
+    assert result.complete and result.repaired
+
+
+def test_missing_comma_and_leading_prose():
+    result = loads('Berikut datanya: {"a": 1 "b": 2}')
+    assert result.value == {"a": 1, "b": 2}
+    assert "teks sebelum JSON diabaikan" in result.repairs
+
+
+@pytest.mark.parametrize("text", ["", None, "tidak ada json"])
+def test_unsalvageable_text_raises(text):
+    with pytest.raises(JsonRepairError):
+        loads(text)
+
+
+def test_repair_of_only_opening_brace():
+    result = repair("{")
+    assert result.value == {}
+    assert not result.complete
@@ -0,0 +1,45 @@
+# tests/test_metrics.py
+import pytest
+
+from metrics import Counter, Gauge, Histogram, Registry, _Metric
+
+
+def test_base_metric_is_abstract():
+    with pytest.raises(TypeError):
+        _Metric("x", "x")
+
+
+def test_exposition_format():
+    registry = Registry()
+    jobs = registry.register(Counter("jobs_total", "Job selesai.", ["kind", "status"]))
+    depth = registry.register(Gauge("queue_depth", "Antrian."))
+    seconds = registry.register(Histogram("render_seconds", "Durasi render.", buckets=(1.0, 5.0)))
+    jobs.inc("scan", "done")
+    jobs.inc("scan", "done", amount=2)
+    depth.set_function(lambda: 7)
+    seconds.observe(0.5)
+    seconds.observe(3.0)
+    assert registry.expose().splitlines() == [
+        "# HELP jobs_total Job selesai.",
+        "# TYPE jobs_total counter",
+        'jobs_total{kind="scan",status="done"} 3',
+        "# HELP queue_depth Antrian.",
+        "# TYPE queue_depth gauge",
+        "queue_depth 7",
+        "# HELP render_seconds Durasi render.",
+        "# TYPE render_seconds histogram",
+        'render_seconds_bucket{le="1"} 1',
+        'render_seconds_bucket{le="5"} 2',
+        'render_seconds_bucket{le="+Inf"} 2',
+        "render_seconds_sum 3.5",
+        "render_seconds_count 2",
+    ]
+
+
+def test_label_count_and_duplicate_names_are_checked():
+    registry = Registry()
+    jobs = registry.counter("jobs_total", "Job selesai.", ["kind"])
+    with pytest.raises(ValueError):
+        jobs.inc()
+    with pytest.raises(ValueError):
+        registry.counter("jobs_total", "lagi")
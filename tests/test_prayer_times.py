@@ -0,0 +1,91 @@
+# tests/test_prayer_times.py
+import io
+from datetime import date
+
+import pytest
+
+import prayer_times
+from prayer_times import CITIES, PRAYERS, fill_ramadan_calendar, format_time, schedule
+
+
+@pytest.fixture(autouse=True)
+def default_ihtiyath(monkeypatch):
+    monkeypatch.setattr(prayer_times, "IHTIYATH_MINUTES", 2)
+
+
+def minutes(hhmm):
+    hours, mins = map(int, hhmm.split(":"))
+    return hours * 60 + mins
+
+
+def test_jakarta_first_of_ramadan_1446():
+    row = schedule([CITIES["jakarta"]], date(2025, 3, 1), days=1)["Jakarta"][0]
+    assert row == {"ramadan": 1, "date": "2025-03-01", "Imsak": "04:33", "Subuh": "04:43",
+                   "Terbit": "05:56", "Dzuhur": "12:07", "Ashar": "15:11", "Maghrib": "18:14",
+                   "Isya": "19:24"}
+
+
+def test_times_are_ordered_and_imsak_precedes_subuh():
+    table = schedule([CITIES["jakarta"], CITIES["makassar"], CITIES["jayapura"]], date(2025, 3, 1))
+    for rows in table.values():
+        assert len(rows) == 30
+        for row in rows:
+            times = [minutes(row[name]) for name in PRAYERS]
+            assert times == sorted(times)
+            assert minutes(row["Subuh"]) - minutes(row["Imsak"]) == 10
+
+
+def test_zone_offsets_follow_longitude():
+    day = date(2025, 3, 1)
+    table = schedule([CITIES["jakarta"], CITIES["makassar"], CITIES["jayapura"]], day, days=1)
+    dzuhur = {city: minutes(rows[0]["Dzuhur"]) for city, rows in table.items()}
+    # Transit lokal semua kota sekitar tengah hari waktu setempat
+    assert all(11 * 60 + 30 <= value <= 12 * 60 + 30 for value in dzuhur.values())
+    assert prayer_times.timezone_for(106.8) == 7
+    assert prayer_times.timezone_for(119.4) == 8
+    assert prayer_times.timezone_for(140.7) == 9
+
+
+def test_format_time_rounds_towards_safety():
+    # 12:00:30 → Dzuhur dibulatkan ke atas + ihtiyath, Terbit dibulatkan ke bawah - ihtiyath
+    hours = 12 + 0.5 / 60
+    assert format_time(hours, "Dzuhur") == "12:03"
+    assert format_time(hours, "Terbit") == "11:58"
+    assert format_time(12.0, "Dzuhur") == "12:02"
+
+
+def test_hijri_round_trip():
+    assert prayer_times.hijri_to_date(1446, 9, 1) == date(2025, 3, 1)
+    assert prayer_times.to_hijri(date(2025, 3, 1)) == (1446, 9, 1)
+    for ordinal in range(date(2024, 1, 1).toordinal(), date(2027, 1, 1).toordinal(), 17):
+        day = date.fromordinal(ordinal)
+        assert prayer_times.hijri_to_date(*prayer_times.to_hijri(day)) == day
+
+
+def test_ramadan_start_is_current_or_next(monkeypatch):
+    monkeypatch.setattr(prayer_times, "RAMADAN_START", None)
+    assert prayer_times.ramadan_start(date(2025, 1, 10)) == date(2025, 3, 1)
+    assert prayer_times.ramadan_start(date(2025, 3, 20)) == date(2025, 3, 1)
+    assert prayer_times.ramadan_start(date(2025, 4, 5)) == date(2026, 2, 18)
+
+
+def test_fill_ramadan_calendar_marks_today():
+    data = fill_ramadan_calendar({"location": "bandung", "ideas": ["x"]}, start=date(2025, 3, 1),
+                                 today=date(2025, 3, 5))
+    assert data["location"] == "Bandung"
+    assert data["ideas"] == ["x"]
+    assert data["current_date"] == "Rabu, 5 Maret 2025"
+    assert (data["hijri_month"], data["hijri_year"]) == ("Ramadan", 1446)
+    assert [d["number"] for d in data["calendar_days"] if d["is_today"]] == [5]
+    assert data["calendar_days"][0]["event"] == "Awal Ramadan"
+    today = {p["name"]: p["time"] for p in data["prayer_times"]}
+    assert today["Maghrib"] == data["imsakiyah"][4]["Maghrib"]
+
+
+def test_write_csv_one_row_per_city_per_day():
+    out = io.StringIO()
+    table = schedule([CITIES["jakarta"], CITIES["medan"]], date(2025, 3, 1), days=2)
+    assert prayer_times.write_csv(table, out) == 4
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "city,ramadan,date," + ",".join(PRAYERS)
+    assert lines[1] == "Jakarta,1,2025-03-01,04:33,04:43,05:56,12:07,15:11,18:14,19:24"
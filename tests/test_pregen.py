@@ -0,0 +1,26 @@
+# tests/test_pregen.py
+import io
+import sys
+import threading
+
+import pregen
+
+
+def test_background_thread_output_goes_to_its_own_stream(monkeypatch):
+    terminal, log = io.StringIO(), io.StringIO()
+    monkeypatch.setattr(sys, "stdout", terminal)
+
+    def background():
+        pregen._route_thread_output(log)
+        print("⚡ dari thread latar")
+        sys.stdout.unroute()
+        print("setelah unroute")
+
+    thread = threading.Thread(target=background)
+    thread.start()
+    thread.join()
+    print("menu utama")
+
+    assert log.getvalue() == "⚡ dari thread latar\n"
+    assert terminal.getvalue() == "setelah unroute\nmenu utama\n"
+    assert sys.stdout.encoding == terminal.encoding
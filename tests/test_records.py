@@ -0,0 +1,57 @@
+# tests/test_records.py
+import json
+
+import pytest
+
+from records import ProductRecord, RecordError, SignalRecord, load_records, record_to_json
+
+
+def write(path, values):
+    path.write_text(json.dumps(values, indent=2), encoding="utf-8")
+
+
+def test_records_behave_like_dicts():
+    record = SignalRecord.from_dict({"id": "s1", "topic": "kopi", "score": "80", "forked_from": "s0"})
+    assert record["score"] == 80 and record.status == "new"
+    assert record.get("forked_from") == "s0" and "report_file" not in record
+    assert record == {"id": "s1", "topic": "kopi", "score": 80, "status": "new", "forked_from": "s0"}
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(KeyError):
+        record["report_file"]
+
+
+def test_copy_does_not_share_extra():
+    record = SignalRecord.from_dict({"id": "s1", "topic": "kopi", "forked_from": "s0"})
+    clone = record.copy()
+    clone["forked_from"] = "s9"
+    clone["status"] = "generated"
+    assert record.get("forked_from") == "s0" and record.status == "new"
+
+
+@pytest.mark.parametrize("data", [{"topic": "kopi"}, {"id": "s1", "topic": "kopi", "score": "tinggi"}, "s1"])
+def test_from_dict_rejects_invalid_signals(data):
+    with pytest.raises(RecordError):
+        SignalRecord.from_dict(data)
+
+
+def test_load_records_returns_one_record_type(tmp_path, capsys):
+    path = tmp_path / "signals.json"
+    write(path, [{"id": "s1", "topic": "kopi", "score": 80},
+                 {"id": "s2", "score": 50},
+                 "bukan objek"])
+    records = load_records(path, SignalRecord)
+    assert [type(r) for r in records] == [SignalRecord, SignalRecord]
+    # Record tidak valid tetap dimuat apa adanya agar tidak hilang saat disimpan ulang
+    assert records[1] == {"id": "s2", "score": 50}
+    out = capsys.readouterr().out
+    assert "1 record" in out and "1 elemen" in out
+
+
+def test_round_trip_through_json(tmp_path):
+    path = tmp_path / "products.json"
+    product = {"id": "p1", "signal_id": None, "name": "Bank", "product_type": "caption_bank",
+               "files": ["a.pdf"], "job_id": "job_1"}
+    write(path, [product])
+    records = load_records(path, ProductRecord)
+    text = json.dumps(records, default=record_to_json)
+    assert json.loads(text) == [{k: v for k, v in product.items() if v is not None}]
@@ -0,0 +1,121 @@
+# tests/test_scheduler.py
+import threading
+
+from scheduler import FairQueue, Scheduler, env_json
+
+
+def drain(queue, eligible=None):
+    items = []
+    while True:
+        item = queue.pop(eligible)
+        if item is None:
+            return items
+        items.append(item)
+
+
+def test_weighted_tenants_share_in_proportion():
+    queue = FairQueue({"a": 2.0, "b": 1.0})
+    for i in range(6):
+        queue.push(f"a{i}", "a")
+        queue.push(f"b{i}", "b")
+    first = drain(queue)[:6]
+    assert sum(item.startswith("a") for item in first) == 4
+
+
+def test_each_tenant_keeps_fifo_order():
+    queue = FairQueue({})
+    for i in range(3):
+        queue.push(("a", i), "a")
+        queue.push(("b", i), "b")
+    items = drain(queue)
+    assert [i for t, i in items if t == "a"] == [0, 1, 2]
+    assert [i for t, i in items if t == "b"] == [0, 1, 2]
+    assert len(queue) == 0
+
+
+def test_interactive_before_batch():
+    queue = FairQueue({})
+    queue.push("batch", "a", "batch")
+    queue.push("interactive", "b", "interactive")
+    assert drain(queue) == ["interactive", "batch"]
+
+
+def test_late_tenant_gets_no_burst_credit():
+    queue = FairQueue({})
+    for i in range(10):
+        queue.push(f"a{i}", "a")
+    assert [queue.pop() for _ in range(5)] == [f"a{i}" for i in range(5)]
+    for i in range(3):
+        queue.push(f"b{i}", "b")
+    # Tag awal b dimulai dari waktu virtual saat ini, jadi b bergantian dengan a, bukan menyalip semuanya
+    assert drain(queue)[:4] == ["b0", "a5", "b1", "a6"]
+
+
+def test_higher_cost_delays_tenant():
+    queue = FairQueue({})
+    queue.push("big0", "a", cost=3.0)
+    queue.push("big1", "a", cost=3.0)
+    for i in range(3):
+        queue.push(f"small{i}", "b")
+    assert drain(queue) == ["big0", "small0", "small1", "small2", "big1"]
+
+
+def test_ineligible_tenants_are_skipped_and_remove():
+    queue = FairQueue({})
+    queue.push("a0", "a")
+    queue.push("b0", "b")
+    assert queue.pop(lambda tenant, priority: tenant != "a") == "b0"
+    assert queue.pop(lambda tenant, priority: tenant != "a") is None
+    assert queue.remove("a0") and not queue.remove("a0")
+    assert len(queue) == 0
+
+
+def acquire_in_thread(scheduler, tenant, priority="batch"):
+    granted = threading.Event()
+    holder = {}
+
+    def run():
+        holder["waiter"] = scheduler.acquire("llm", tenant, priority)
+        granted.set()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return granted, holder
+
+
+def test_quota_limits_running_slots_per_tenant():
+    scheduler = Scheduler(capacity={"llm": 2}, reserved={}, quotas={"a": {"llm": 1}}, weights={})
+    first = scheduler.acquire("llm", "a")
+    granted, holder = acquire_in_thread(scheduler, "a")
+    assert not granted.wait(0.1)
+    # Slot kedua tetap bisa dipakai tenant lain
+    other = scheduler.acquire("llm", "b")
+    assert scheduler.stats()["a"]["llm"]["waiting"] == 1
+
+    scheduler.release(first)
+    assert granted.wait(1)
+    scheduler.release(holder["waiter"])
+    scheduler.release(other)
+    assert scheduler.idle("llm")
+
+
+def test_reserved_slot_only_for_interactive():
+    scheduler = Scheduler(capacity={"llm": 2}, reserved={"llm": 1}, quotas={}, weights={})
+    batch = scheduler.acquire("llm", "a", "batch")
+    granted, holder = acquire_in_thread(scheduler, "b", "batch")
+    assert not granted.wait(0.1)
+    interactive = scheduler.acquire("llm", "c", "interactive")
+
+    scheduler.release(interactive)
+    assert not granted.wait(0.1)
+    scheduler.release(batch)
+    assert granted.wait(1)
+    scheduler.release(holder["waiter"])
+
+
+def test_env_json_warns_on_bad_input(monkeypatch, capsys):
+    monkeypatch.setenv("AUTOPRENEUR_TEST_JSON", '{"a": 2}')
+    assert env_json("AUTOPRENEUR_TEST_JSON") == {"a": 2}
+    monkeypatch.setenv("AUTOPRENEUR_TEST_JSON", "{a: 2")
+    assert env_json("AUTOPRENEUR_TEST_JSON") == {}
+    assert "AUTOPRENEUR_TEST_JSON" in capsys.readouterr().err
@@ -0,0 +1,87 @@
+# tests/test_schemas.py
+import pytest
+
+import schemas
+from schemas import MAX_ERRORS, missing_fields, upgrade_legacy, validate_template_data
+
+CAPTIONS = {"name": "Bank", "description": "30 caption",
+            "captions": [{"day": 1, "text": "Halo", "hashtags": ["#kopi"]}]}
+
+
+def test_valid_data_has_no_errors():
+    assert validate_template_data("caption_bank", CAPTIONS) == []
+
+
+def test_wrong_types_are_reported_with_path():
+    data = {**CAPTIONS, "captions": [{"day": True, "text": 1, "hashtags": "#kopi"}]}
+    assert validate_template_data("caption_bank", data) == [
+        "captions[0].day: harus bilangan bulat",
+        "captions[0].text: harus string",
+        "captions[0].hashtags: harus array",
+    ]
+
+
+def test_missing_fields_and_enum():
+    errors = validate_template_data("content_calendar", {
+        "name": "Kalender", "description": "", "month": "Oktober", "year": 2026,
+        "calendar_weeks": [{"week_number": 1, "theme": "Kopi", "hashtags": [],
+                            "days": [{"date": "1", "content_type": "Meme", "idea": "x"}]}],
+    })
+    assert errors == [
+        "calendar_weeks[0].days[0].content_type: harus salah satu dari "
+        "Educational, Promotional, Engagement, Behind the Scene",
+        "Missing required field: calendar_weeks[0].days[0].best_time",
+    ]
+
+
+def test_int_is_a_valid_number_but_bool_is_not():
+    invoice = validate_template_data("invoice_macro", {"name": "", "description": "", "invoices": [{
+        "company_name": "", "company_address": "", "company_phone": "", "number": "1", "date": "",
+        "due_date": "", "client_name": "", "client_address": "", "client_phone": "", "bank_name": "",
+        "account_number": "", "account_name": "", "notes": "",
+        "items": [{"description": "Kopi", "quantity": 2, "price": 10000, "total": 20000.0}],
+        "subtotal": 20000, "tax": False, "total": 22200.0,
+    }]})
+    assert invoice == ["invoices[0].tax: harus angka"]
+
+
+def test_errors_are_capped():
+    data = {**CAPTIONS, "captions": [{"day": "x", "text": 1, "hashtags": []}] * 50}
+    assert len(validate_template_data("caption_bank", data)) == MAX_ERRORS
+
+
+def test_unknown_product_type():
+    assert validate_template_data("nope", {}) == ["Unknown product type: nope"]
+
+
+@pytest.mark.parametrize("product_type", schemas.PRODUCT_TYPES)
+def test_response_format_is_strict(product_type):
+    def walk(schema):
+        if schema.get("type") == "object":
+            assert schema["additionalProperties"] is False
+            assert sorted(schema["required"]) == sorted(schema["properties"])
+            for child in schema["properties"].values():
+                walk(child)
+        elif schema.get("type") == "array":
+            walk(schema["items"])
+        for option in schema.get("anyOf", []):
+            walk(option)
+
+    response_format = schemas.response_format(product_type)
+    assert response_format["json_schema"]["strict"] is True
+    walk(response_format["json_schema"]["schema"])
+
+
+def test_legacy_data_is_upgraded_for_rerender():
+    legacy = {"name": "Bank", "description": "",
+              "captions": [{"day": 1, "text": "Halo", "hashtags": "#kopi, #susu"}]}
+    upgraded = upgrade_legacy("caption_bank", legacy)
+    assert upgraded["captions"][0]["hashtags"] == ["#kopi", "#susu"]
+    assert legacy["captions"][0]["hashtags"] == "#kopi, #susu"
+    assert validate_template_data("caption_bank", upgraded) == []
+
+
+def test_missing_fields_only_checks_top_level():
+    assert missing_fields("caption_bank", {"name": "", "description": "", "captions": [{"x": 1}]}) == []
+    assert missing_fields("caption_bank", {"name": ""}) == [
+        "Missing required field: description", "Missing required field: captions"]
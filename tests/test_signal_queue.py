@@ -0,0 +1,101 @@
+# tests/test_signal_queue.py
+from signal_queue import DAY_SECONDS, SignalQueue
+
+
+def signal(signal_id, score, created_at=0.0, tenant=None, status="new"):
+    return {"id": signal_id, "score": score, "created_at": created_at, "tenant": tenant, "status": status}
+
+
+def test_pop_returns_highest_score_first():
+    queue = SignalQueue()
+    for s in (signal("a", 3), signal("b", 9), signal("c", 5)):
+        queue.push(s)
+    assert [queue.pop(), queue.pop(), queue.pop(), queue.pop()] == ["b", "c", "a", None]
+
+
+def test_removed_entries_are_skipped_lazily():
+    queue = SignalQueue()
+    for s in (signal("a", 3), signal("b", 9), signal("c", 5)):
+        queue.push(s)
+    queue.remove("b")
+    # Entri dihapus masih ada di heap sampai muncul di puncak
+    assert len(queue._heap) == 3
+    assert len(queue) == 2 and "b" not in queue
+    assert queue.peek(3) == ["c", "a"]
+    assert queue.pop() == "c"
+    assert len(queue._heap) == 1
+
+
+def test_push_again_updates_priority():
+    queue = SignalQueue()
+    queue.push(signal("a", 3))
+    queue.push(signal("b", 5))
+    queue.update(signal("a", 8))
+    assert len(queue) == 2
+    assert queue.peek(2) == ["a", "b"]
+    assert queue.pop() == "a" and queue.pop() == "b" and queue.pop() is None
+
+
+def test_age_weight_and_tenant_weight():
+    queue = SignalQueue(age_weight=1.0, tenant_weights={"vip": 3.0})
+    old = signal("old", 5, created_at=0.0)
+    new = signal("new", 5, created_at=2 * DAY_SECONDS)
+    vip = signal("vip", 5, created_at=2 * DAY_SECONDS, tenant="vip")
+    for s in (old, new, vip):
+        queue.push(s)
+    now = 3 * DAY_SECONDS
+    assert queue.priority(old, now) == 8.0
+    assert queue.priority(vip, now) == 16.0
+    assert queue.peek(3) == ["vip", "old", "new"]
+
+
+def test_sync_keeps_only_new_signals():
+    queue = SignalQueue()
+    assert queue.sync([signal("a", 3), signal("b", 9, status="used")])
+    assert not queue.sync([signal("a", 3), signal("b", 9, status="used")])
+    assert queue.sync([signal("a", 4)])
+    assert queue.peek(5) == ["a"]
+    assert queue.sync([])
+    assert queue.pop() is None
+
+
+def test_save_and_load_drop_removed_entries(tmp_path):
+    path = tmp_path / "queue.json"
+    queue = SignalQueue(path)
+    for s in (signal("a", 3), signal("b", 9), signal("c", 5)):
+        queue.push(s)
+    queue.remove("b")
+    queue.save()
+
+    reloaded = SignalQueue(path)
+    assert len(reloaded._heap) == 2
+    assert reloaded.peek(3) == ["c", "a"]
+
+    # Bobot berbeda: state lama diabaikan agar sync() membangun ulang
+    assert len(SignalQueue(path, age_weight=1.0)) == 0
+
+
+def test_legacy_signal_without_created_at_gets_no_age_bonus(monkeypatch):
+    monkeypatch.setattr("signal_queue.time.time", lambda: 100 * DAY_SECONDS)
+    queue = SignalQueue(age_weight=1.0)
+    legacy = {"id": "legacy", "score": 10, "status": "new"}
+    fresh = signal("fresh", 95, created_at=100 * DAY_SECONDS)
+    queue.sync([legacy, fresh])
+    assert queue.priority(legacy) == 10.0
+    assert queue.pop() == "fresh"
+
+    # Setelah masuk antrian, signal lama menua dengan laju yang sama seperti signal lain
+    now = 105 * DAY_SECONDS
+    queue.push(fresh)
+    assert queue.priority(legacy, now) == 15.0
+    assert queue.peek(2) == ["fresh", "legacy"]
+
+
+def test_legacy_age_survives_save_and_load(tmp_path, monkeypatch):
+    monkeypatch.setattr("signal_queue.time.time", lambda: 100 * DAY_SECONDS)
+    path = tmp_path / "queue.json"
+    queue = SignalQueue(path, age_weight=1.0)
+    queue.push({"id": "legacy", "score": 10, "created_at": None})
+    queue.save()
+    reloaded = SignalQueue(path, age_weight=1.0)
+    assert reloaded.priority({"id": "legacy", "score": 10}, 102 * DAY_SECONDS) == 12.0
@@ -0,0 +1,53 @@
+# tests/test_similarity.py
+import pytest
+
+from similarity import TopicIndex, estimate_containment, estimate_jaccard, minhash, tokenize
+
+
+def test_tokenize_expands_aliases_and_drops_stopwords():
+    assert tokenize("Tips jualan di IG dan TT") == ["tips", "jualan", "instagram", "tiktok"]
+
+
+def test_identical_sets_have_full_similarity():
+    shingles = {"kopi", "susu", "aren"}
+    assert estimate_jaccard(minhash(shingles), minhash(set(shingles))) == 1.0
+
+
+def test_empty_signature_is_never_similar():
+    assert estimate_jaccard([], minhash({"kopi"})) == 0.0
+
+
+@pytest.mark.parametrize("overlap, expected", [(50, 1 / 3), (80, 80 / 120)])
+def test_jaccard_estimate_is_close_to_exact(overlap, expected):
+    a = {f"w{i}" for i in range(100)}
+    b = {f"w{i}" for i in range(100 - overlap, 200 - overlap)}
+    assert estimate_jaccard(minhash(a), minhash(b)) == pytest.approx(expected, abs=0.15)
+
+
+def test_containment_of_subset_is_high():
+    query = {f"w{i}" for i in range(10)}
+    report = {f"w{i}" for i in range(40)}
+    assert estimate_containment(minhash(query), len(query), minhash(report), len(report)) > 0.7
+    assert estimate_containment(minhash(set()), 0, minhash(report), len(report)) == 0.0
+
+
+def test_topic_index_finds_near_duplicates_only():
+    index = TopicIndex()
+    index.add("kopi", "kopi susu gula aren")
+    index.add("sepatu", "sepatu lari murah")
+    matches = index.query("kopi susu gula aren kekinian", threshold=0.5)
+    assert [m["signal_id"] for m in matches] == ["kopi"]
+
+
+def test_topic_index_sync_adds_and_removes(tmp_path):
+    path = tmp_path / "topics.json"
+    index = TopicIndex(path)
+    assert index.sync([{"id": "a", "topic": "kopi susu"}, {"id": "b", "topic": "teh tarik"}])
+    assert not index.sync([{"id": "a", "topic": "kopi susu"}, {"id": "b", "topic": "teh tarik"}])
+    assert index.sync([{"id": "a", "topic": "kopi susu"}])
+    index.save()
+
+    reloaded = TopicIndex(path)
+    assert set(reloaded.entries) == {"a"}
+    assert reloaded.query("teh tarik", threshold=0.3) == []
+    assert reloaded.query("kopi susu", threshold=0.9)[0]["signal_id"] == "a"
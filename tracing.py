@@ -0,0 +1,216 @@
+# tracing.py
+"""Tracing bertingkat untuk pipeline scan → generate → render → save.
+
+Aktifkan dengan `AUTOPRENEUR_TRACE=1` (atau `python cli.py --trace ...`). Setiap proses
+menulis file `db/traces/trace-<waktu>-<pid>.json` dalam format Chrome Trace Event,
+yang bisa dibuka di chrome://tracing, https://ui.perfetto.dev, atau speedscope.
+
+    with tracing.span("render", product_type="caption_bank"):
+        ...
+
+`AUTOPRENEUR_PROFILE_RENDER=1` menambahkan profiler sampling pada tahap render;
+stack yang terkumpul ditulis sebagai file `.folded` (format flamegraph) di folder yang sama.
+"""
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+TRACE_DIR = Path("db") / "traces"
+PROFILE_INTERVAL = 0.005
+
+_enabled = os.getenv("AUTOPRENEUR_TRACE", "").lower() not in ("", "0", "false", "no")
+_profile_render = os.getenv("AUTOPRENEUR_PROFILE_RENDER", "").lower() not in ("", "0", "false", "no")
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("trace_span", default=None)
+_lock = threading.Lock()
+_buffer: List[Dict[str, Any]] = []
+_trace_path: Optional[Path] = None
+
+
+def enable(profile_render: bool = False):
+    """Aktifkan tracing untuk proses ini dan proses anak yang dibuat setelahnya."""
+    global _enabled, _profile_render
+    _enabled = True
+    _profile_render = _profile_render or profile_render
+    os.environ["AUTOPRENEUR_TRACE"] = "1"
+    if profile_render:
+        os.environ["AUTOPRENEUR_PROFILE_RENDER"] = "1"
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def trace_path() -> Path:
+    global _trace_path
+    if _trace_path is None:
+        _trace_path = TRACE_DIR / f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json"
+    return _trace_path
+
+
+class Span:
+    __slots__ = ("name", "attrs", "start", "parent")
+
+    def __init__(self, name: str, attrs: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.start = time.time()
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class _NoopSpan:
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+@contextlib.contextmanager
+def span(name: str, **attrs) -> Iterator[Any]:
+    """Catat satu tahap sebagai span; span di dalamnya menjadi anak span ini."""
+    if not _enabled:
+        yield _NOOP
+        return
+    current = Span(name, attrs, _current.get())
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.attrs["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        end = time.time()
+        _record({
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": round(current.start * 1_000_000),
+            "dur": round((end - current.start) * 1_000_000),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {k: v if isinstance(v, (str, int, float, bool)) or v is None else str(v)
+                     for k, v in current.attrs.items()},
+        })
+        # Span akar selesai: tulis ke disk (proses pool tidak menjalankan atexit)
+        if current.parent is None:
+            flush()
+
+
+def traced(name: Optional[str] = None, *params: str):
+    """Dekorator: bungkus seluruh fungsi dalam satu span, argumen `params` jadi atribut span."""
+    def decorate(func: Callable):
+        span_name = name or func.__qualname__
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            attrs = {}
+            if params:
+                bound = signature.bind_partial(*args, **kwargs).arguments
+                attrs = {p: bound[p] for p in params if p in bound}
+            with span(span_name, **attrs):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _record(event: Dict[str, Any]):
+    with _lock:
+        _buffer.append(event)
+
+
+def flush():
+    """Tambahkan event yang tertampung ke file trace proses ini.
+
+    Format array JSON tanpa `]` penutup memang diizinkan oleh spesifikasi Trace Event,
+    sehingga file bisa terus di-append dan tetap terbaca walau proses mati mendadak.
+    """
+    with _lock:
+        if not _buffer:
+            return
+        events = list(_buffer)
+        _buffer.clear()
+        path = trace_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not path.exists()
+        with open(path, "a", encoding="utf-8") as f:
+            if new_file:
+                f.write("[\n")
+                f.write(json.dumps({"name": "process_name", "ph": "M", "pid": os.getpid(),
+                                    "args": {"name": " ".join(sys.argv[:2]) or "python"}}) + ",\n")
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False, default=str) + ",\n")
+
+
+# --- PROFILER SAMPLING ---
+class SamplingProfiler:
+    """Ambil stack thread target setiap `interval` detik dan hitung stack yang sama."""
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="trace-profiler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def hottest(self, limit: int = 5) -> List[str]:
+        """Fungsi paling atas (leaf) yang paling sering muncul."""
+        leaves: Counter = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return [f"{name} x{count}" for name, count in leaves.most_common(limit)]
+
+    def write_folded(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for stack, count in self.samples.items():
+                f.write(f"{stack} {count}\n")
+
+
+@contextlib.contextmanager
+def profile(name: str, **attrs) -> Iterator[Any]:
+    """Span yang (jika AUTOPRENEUR_PROFILE_RENDER aktif) juga diprofil dengan sampling."""
+    with span(name, **attrs) as current:
+        if not (_enabled and _profile_render):
+            yield current
+            return
+        with SamplingProfiler(threading.get_ident()) as profiler:
+            yield current
+        folded = trace_path().with_suffix(".folded")
+        profiler.write_folded(folded)
+        current.set(samples=sum(profiler.samples.values()), hot=" | ".join(profiler.hottest()),
+                    folded=str(folded))
@@ -0,0 +1,215 @@
+# worker.py
+"""Daemon generator: pool proses worker yang mengambil job dari JobQueue.
+
+    python worker.py --workers 4
+"""
+import argparse
+import multiprocessing as mp
+import os
+import signal
+import socket
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import metrics
+from job_queue import JobQueue
+
+JOBS_DB_PATH = Path("db") / "jobs.sqlite3"
+LEASE_SECONDS = 120.0
+POLL_INTERVAL = 2.0
+
+
+class LeaseLost(Exception):
+    """Lease job diambil alih worker lain (mis. heartbeat terlambat)."""
+
+
+class WorkerStopped(BaseException):
+    """Sinyal berhenti kedua: worker keluar tanpa menunggu job berjalan selesai."""
+
+
+def find_job_product(app, job_id: str) -> Optional[Dict]:
+    """Produk yang sudah tersimpan oleh percobaan sebelumnya dari job yang sama."""
+    for product in app.products_repo.all():
+        if product.get('job_id') == job_id:
+            return product
+    return None
+
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Eksekusi satu job memakai operasi inti di main.py."""
+    import main as app
+
+    kind, payload = job["kind"], job["payload"]
+
+    if kind == "scan":
+        topic = payload["topic"]
+        on_duplicate = payload.get("on_duplicate", "reuse")
+        if on_duplicate != "scan":
+            matches = app.find_duplicates(topic)
+            if matches:
+                source = app.signals_repo.get(matches[0]['signal_id'])
+                if on_duplicate == "reuse":
+                    return {"action": "reused", "signal_id": source['id']}
+                return {"action": "forked", "signal_id": app.fork_signal(topic, source)['id']}
+        return {"action": "scanned", "signal_id": app.scan_topic(topic)['id']}
+
+    if kind in ("generate_product", "generate_suite"):
+        # Idempoten: percobaan ulang setelah crash tidak membuat produk ganda
+        existing = find_job_product(app, job["id"])
+        if existing:
+            return {"product_id": existing['id'], "resumed": True}
+        target = app.signals_repo.get(payload["signal_id"])
+        if target is None:
+            raise ValueError(f"Signal tidak ditemukan: {payload['signal_id']}")
+        if kind == "generate_suite":
+            # run_id = job_id agar retry melanjutkan checkpoint yang sama
+            product = app.generate_suite(target, payload["suite"], extra={"job_id": job["id"]},
+                                         run_id=job["id"])
+        else:
+            product = app.generate_product(target, payload.get("product_type", "caption_bank"),
+                                           extra={"job_id": job["id"]})
+        return {"product_id": product['id']}
+
+    if kind == "render":
+        product = app.products_repo.get(payload["product_id"])
+        if product is None:
+            raise ValueError(f"Produk tidak ditemukan: {payload['product_id']}")
+        return {"files": app.rerender_product(product)}
+
+    raise ValueError(f"Unknown job kind: {kind}")
+
+
+def worker_loop(worker_id: str, db_path: str, stop_event, lease_seconds: float, poll_interval: float,
+                metrics_name: str = "worker", force_event=None):
+    """Loop satu proses worker: klaim job, jalankan sambil mengirim heartbeat, catat hasil."""
+    import main as app
+
+    # Ctrl+C ditangani proses induk; SIGTERM biasa menyelesaikan job berjalan lalu berhenti,
+    # SIGTERM setelah induk memaksa berhenti menghentikan job dan mengembalikannya ke antrian
+    def on_sigterm(signum, frame):
+        stop_event.set()
+        if force_event is not None and force_event.is_set():
+            raise WorkerStopped()
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, on_sigterm)
+    app.ensure_setup()
+    queue = JobQueue(Path(db_path))
+    # Tiap proses punya registry sendiri, jadi ditulis ke textfile masing-masing
+    exporter = metrics.TextfileExporter(metrics_name).start()
+    try:
+        _work(queue, worker_id, db_path, stop_event, lease_seconds, poll_interval)
+    except WorkerStopped:
+        pass
+    finally:
+        queue.close()
+        exporter.stop()
+
+
+def _work(queue: JobQueue, worker_id: str, db_path: str, stop_event, lease_seconds: float,
+          poll_interval: float):
+    while not stop_event.is_set():
+        job = queue.claim(worker_id, lease_seconds)
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+        if stop_event.is_set():
+            # Berhenti diminta tepat setelah klaim: job belum mulai, kembalikan tanpa menghitung percobaan
+            queue.release(job["id"], worker_id)
+            break
+
+        print(f"🔧 [{worker_id}] {job['id']} {job['kind']} (percobaan {job['attempts']}/{job['max_attempts']})")
+        done = threading.Event()
+        lost = threading.Event()
+
+        def beat():
+            # Koneksi SQLite terpisah karena koneksi tidak boleh dipakai lintas thread
+            hb_queue = JobQueue(Path(db_path))
+            try:
+                while not done.wait(lease_seconds / 3):
+                    if not hb_queue.heartbeat(job["id"], worker_id, lease_seconds):
+                        lost.set()
+                        return
+            finally:
+                hb_queue.close()
+
+        heartbeat = threading.Thread(target=beat, daemon=True)
+        heartbeat.start()
+        try:
+            result = run_job(job)
+            if lost.is_set():
+                raise LeaseLost(job["id"])
+            queue.complete(job["id"], worker_id, result)
+            metrics.JOBS_PROCESSED.inc(job["kind"], "done")
+            print(f"✅ [{worker_id}] {job['id']} selesai")
+        except LeaseLost:
+            metrics.JOBS_PROCESSED.inc(job["kind"], "lease_lost")
+            print(f"⚠️ [{worker_id}] {job['id']} lease hilang, hasil diabaikan")
+        except WorkerStopped:
+            # Job idempoten (checkpoint/job_id), jadi aman diulang worker lain tanpa menunggu lease habis
+            queue.release(job["id"], worker_id)
+            metrics.JOBS_PROCESSED.inc(job["kind"], "released")
+            print(f"🛑 [{worker_id}] {job['id']} dihentikan paksa, dikembalikan ke antrian")
+            raise
+        except Exception as e:
+            status = queue.fail(job["id"], worker_id, f"{e}\n{traceback.format_exc(limit=5)}")
+            metrics.JOBS_PROCESSED.inc(job["kind"], "failed")
+            print(f"❌ [{worker_id}] {job['id']} gagal ({status}): {e}")
+        finally:
+            done.set()
+            heartbeat.join()
+
+
+def run_daemon(workers: int, db_path: Path = JOBS_DB_PATH, lease_seconds: float = LEASE_SECONDS,
+               poll_interval: float = POLL_INTERVAL) -> int:
+    """Jalankan pool worker sampai SIGINT/SIGTERM, lalu tunggu job berjalan selesai."""
+    JobQueue(db_path).close()  # pastikan skema ada sebelum worker start
+    stop_event = mp.Event()
+    force_event = mp.Event()
+    processes = [
+        mp.Process(target=worker_loop, name=f"worker-{i}",
+                   args=(f"{socket.gethostname()}-{os.getpid()}-{i}", str(db_path),
+                         stop_event, lease_seconds, poll_interval, f"worker_{i}", force_event))
+        for i in range(workers)
+    ]
+
+    def shutdown(signum, frame):
+        if not stop_event.is_set():
+            print("\n🛑 Berhenti setelah job yang sedang berjalan selesai... (Ctrl+C lagi untuk paksa)")
+            stop_event.set()
+        else:
+            force_event.set()
+            for p in processes:
+                p.terminate()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    print(f"🚀 Menjalankan {workers} worker (DB job: {db_path})")
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    print("👋 Semua worker berhenti.")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Autopreneur generation daemon")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--db", type=Path, default=JOBS_DB_PATH)
+    parser.add_argument("--lease", type=float, default=LEASE_SECONDS, help="Durasi lease job (detik)")
+    parser.add_argument("--poll", type=float, default=POLL_INTERVAL, help="Interval cek job baru (detik)")
+    args = parser.parse_args(argv)
+
+    if not os.getenv("OPENAI_API_KEY"):
+        print("❌ ERROR: OpenAI API Key tidak ditemukan (OPENAI_API_KEY).", file=sys.stderr)
+        return 3
+    return run_daemon(args.workers, args.db, args.lease, args.poll)
+
+
+if __name__ == "__main__":
+    sys.exit(main())